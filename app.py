@@ -7,6 +7,15 @@ PCComponentes - Product Discovery Tool
 
 import streamlit as st
 import html
+import logging
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from itertools import chain, islice
+from types import SimpleNamespace
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
 
 # Configuración de página (DEBE ser lo primero)
 st.set_page_config(
@@ -17,48 +26,38 @@ st.set_page_config(
 )
 
 # Imports
-from modules.google_trends import GoogleTrendsModule, calculate_growth_rate, calculate_seasonality
+from modules.google_trends import (
+    GoogleTrendsModule, calculate_growth_rate, calculate_seasonality, extract_timeline_series
+)
 from modules.related_queries import RelatedQueriesModule
 from modules.serp_paa import PeopleAlsoAskModule
 from modules.google_news import GoogleNewsModule
 from modules.product_analysis import ProductAnalyzer
 from modules.scoring import ScoringEngine
 from modules.ai_analysis import AIAnalyzer, render_provider_selector
-from modules.aliexpress import get_aliexpress_module, check_aliexpress_config
-from modules.youtube import get_youtube_module, check_youtube_config
-from modules.social_score import get_social_score_calculator
-from modules.market_intelligence import get_market_intelligence, check_perplexity_config
-from modules.pdf_report import generate_trend_report
-from modules.email_report import render_email_form
-from modules.url_analyzer import render_url_analyzer_form
 from modules.cache import get_cache, check_cache_config, render_cache_status_sidebar, render_cache_debug, CacheResult
 
-from components.trend_chart import render_trend_chart, render_comparison_chart
+from components.trend_chart import render_trend_chart
 from components.seasonality import render_seasonality_panel
 from components.score_cards import render_score_cards, render_score_breakdown
 from components.related_cards import render_related_queries, render_related_topics
 from components.keyword_table import render_keyword_table, render_questions_panel
-from components.geo_map import render_geo_comparison
 from components.news_panel import render_news_panel
 from components.product_matrix import render_product_section
-from components.brand_scanner import render_brand_scanner, render_quick_ranking
-from components.aliexpress_panel import (
-    render_aliexpress_panel,
-    render_aliexpress_mini,
-    render_aliexpress_comparison
-)
-from components.social_media_panel import render_social_media_section
-from components.market_intelligence_panel import (
-    render_market_intelligence_panel,
-    render_market_intelligence_mini,
-    get_intelligence_for_pdf
-)
+
+# Los módulos de secciones opcionales (scanner, YouTube, Perplexity,
+# AliExpress, comparativa por países, PDF, email, URL analyzer) se importan
+# dentro de la rama que los usa para no cargarlos en cada arranque.
 
 from utils import (
     load_css, render_logo, check_api_keys, render_api_status,
     init_session_state, add_to_history,
-    render_empty_state, render_loading_state, sanitize_html, sanitize_for_query
+    render_empty_state, render_loading_state, sanitize_html, sanitize_html_many,
+    sanitize_for_query, keyword_slug,
+    run_parallel, run_in_background
 )
+from utils.safe_operations import safe_call
+from utils.countries import get_country_name
 
 # Autenticación por email
 from modules.auth_email import (
@@ -87,14 +86,20 @@ def section_header(title: str, icon: str, subtitle: str = "") -> None:
         icon: Emoji o icono
         subtitle: Texto secundario opcional
     """
+    st.markdown(_section_header_html(title, icon, subtitle), unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def _section_header_html(title: str, icon: str, subtitle: str) -> str:
+    """HTML del header de sección (los títulos se repiten en cada rerun)"""
     subtitle_html = f'<span class="section-subtitle">{sanitize_html(subtitle)}</span>' if subtitle else ''
-    st.markdown(f"""
+    return f"""
     <div class="section-header">
         <span class="section-icon">{icon}</span>
         <span class="section-title">{sanitize_html(title)}</span>
         {subtitle_html}
     </div>
-    """, unsafe_allow_html=True)
+    """
 
 
 def section_spacer(size: str = "normal") -> None:
@@ -104,15 +109,10 @@ def section_spacer(size: str = "normal") -> None:
     Args:
         size: "small", "normal", "large"
     """
-    sizes = {
-        "small": "section-spacer-sm",
-        "normal": "section-spacer",
-        "large": "section-spacer"
-    }
-    css_class = sizes.get(size, "section-spacer")
-    st.markdown(f'<div class="{css_class}"></div>', unsafe_allow_html=True)
+    st.markdown(SPACER_HTML.get(size, SPACER_HTML["normal"]), unsafe_allow_html=True)
 
 
+@lru_cache(maxsize=256)
 def preview_badge(text: str, variant: str = "gold") -> str:
     """
     Genera HTML para un badge de preview
@@ -124,120 +124,1155 @@ def preview_badge(text: str, variant: str = "gold") -> str:
     Returns:
         HTML string del badge
     """
-    variants = {
-        "gold": "preview-badge",
-        "purple": "preview-badge preview-badge-purple",
-        "success": "preview-badge preview-badge-success"
-    }
-    css_class = variants.get(variant, "preview-badge")
+    css_class = PREVIEW_BADGE_CLASSES.get(variant, "preview-badge")
     return f'<span class="{css_class}">{sanitize_html(text)}</span>'
 
 
-def main():
-    """Función principal de la aplicación"""
+# Guía estática de operadores de búsqueda (sidebar de opciones)
+SEARCH_SYNTAX_GUIDE_HTML = """
+<div class="search-syntax-guide">
+    <div class="syntax-grid">
+        <div class="syntax-item">
+            <code class="syntax-code">"frase exacta"</code>
+            <span class="syntax-desc">Busca la frase completa tal cual</span>
+            <span class="syntax-example">Ej: "gaming laptop"</span>
+        </div>
+        <div class="syntax-item">
+            <code class="syntax-code">término1 + término2</code>
+            <span class="syntax-desc">Suma el interés de ambos términos</span>
+            <span class="syntax-example">Ej: nvidia + amd</span>
+        </div>
+        <div class="syntax-item">
+            <code class="syntax-code">término1, término2</code>
+            <span class="syntax-desc">Compara términos lado a lado</span>
+            <span class="syntax-example">Ej: iphone, samsung</span>
+        </div>
+        <div class="syntax-item">
+            <code class="syntax-code">término1 - término2</code>
+            <span class="syntax-desc">Excluye el segundo término</span>
+            <span class="syntax-example">Ej: apple - fruit</span>
+        </div>
+    </div>
+    <div class="syntax-tips">
+        <p><strong>💡 Tips:</strong></p>
+        <ul>
+            <li>Sin comillas = búsqueda amplia (incluye variaciones)</li>
+            <li>Con comillas = búsqueda exacta (solo esa frase)</li>
+            <li>Usa inglés para marcas internacionales</li>
+            <li>Sé específico: "RTX 4090" mejor que "nvidia gpu"</li>
+        </ul>
+    </div>
+</div>
+"""
 
-    # Inicializar
-    load_css()
+# Países de la comparativa (el orden define el de la leyenda)
+COMPARISON_COUNTRIES = ("ES", "PT", "FR", "IT", "DE")
+
+# Espera máxima a una respuesta de IA lanzada en segundo plano
+AI_RESULT_TIMEOUT = 60
+
+# Cada cuánto se comprueba si una tarea en cola del pool ya ha arrancado
+QUEUE_POLL_SECONDS = 0.05
+
+# Espera máxima a una precarga de tendencias ya en curso antes de consultar directamente
+PREFETCH_WAIT_TIMEOUT = 10
+
+# HTML de section_spacer según tamaño (fijo, se construye una vez)
+SPACER_HTML = {
+    "small": '<div class="section-spacer-sm"></div>',
+    "normal": '<div class="section-spacer"></div>',
+    "large": '<div class="section-spacer"></div>'
+}
+
+# Clase CSS de preview_badge según variante
+PREVIEW_BADGE_CLASSES = {
+    "gold": "preview-badge",
+    "purple": "preview-badge preview-badge-purple",
+    "success": "preview-badge preview-badge-success"
+}
+
+# Pie del sidebar
+SIDEBAR_FOOTER_HTML = (
+    '<p style="font-size: 0.75rem; color: #9CA3AF; text-align: center;">'
+    'Abra Trend Hunter v1.0<br>PCComponentes Product Discovery</p>'
+)
+
+# Etiquetas de los selectores del sidebar (el orden define las opciones)
+MODE_LABELS = {
+    "deep_dive": "🔬 Deep Dive (1 marca)",
+    "scanner": "🚀 Scanner (CSV)",
+    "quick": "⚡ Quick Ranking"
+}
+REGION_LABELS = {
+    "ES": "🇪🇸 España",
+    "PT": "🇵🇹 Portugal",
+    "FR": "🇫🇷 Francia",
+    "IT": "🇮🇹 Italia",
+    "DE": "🇩🇪 Alemania"
+}
+TIMEFRAME_LABELS = {
+    "today 5-y": "5 años",
+    "today 12-m": "1 año",
+    "today 3-m": "3 meses",
+    "today 1-m": "Último mes"
+}
+CATEGORY_LABELS = {
+    0: "Todas",
+    5: "Informática",
+    78: "Electrónica",
+    18: "Compras"
+}
+
+# Resultados por defecto cuando una fuente o un cálculo falla
+# (solo lectura: se comparten entre ejecuciones)
+EMPTY_RELATED = {"success": False, "queries": {"rising": [], "top": []}, "topics": {"rising": [], "top": []}}
+EMPTY_PAA = {"success": False, "categorized": {"all": [], "questions": [], "comparatives": [], "others": []}}
+EMPTY_NEWS = {"success": False, "news": []}
+EMPTY_SCORE = {"score": 0, "grade": "F", "factors": {}}
+EMPTY_OPPORTUNITY = {"level": "MUY BAJA", "combined_score": 0, "color": "#EF4444", "icon": "❄️", "action": "No prioritario"}
+EMPTY_PRODUCT_ANALYSIS = {"success": False, "products": [], "classified": {}, "insights": {}}
+
+# Tarjeta del análisis IA (los valores se insertan ya sanitizados; los
+# estilos viven en assets/custom.css, que load_css inyecta en cada rerun)
+AI_ANALYSIS_CARD_HTML = """
+<div class="ai-analysis-box" style="margin-bottom: 16px;">
+    <div class="ai-analysis-header">
+        <span style="font-size: 1.25rem;">🧠</span>
+        <span>Análisis ({provider})</span>
+    </div>
+    <div class="ai-analysis-content">
+        {analysis}
+    </div>
+</div>
+"""
+
+# Indicador del resumen ejecutivo (los cuatro comparten estructura; en una
+# sola línea para que el markdown no trate la indentación como código)
+SUMMARY_METRIC_HTML = (
+    '<div class="summary-metric">'
+    '<div class="summary-metric-label">{label}</div>'
+    '<div class="{value_class}"{color}>{value}</div>'
+    '{caption}'
+    '</div>'
+)
+SUMMARY_CAPTION_HTML = '<div class="summary-metric-caption">{}</div>'
+
+
+# ============================================
+# Module Registry
+# ============================================
+
+@st.cache_resource(show_spinner=False)
+def get_modules() -> SimpleNamespace:
+    """
+    Instancias de los módulos de datos, compartidas entre reruns
+
+    Se crean una sola vez por proceso (los clientes de IA incluidos) en
+    lugar de reconstruirse en cada interacción con la app.
+    """
+    serpapi_key = st.secrets.get("SERPAPI_KEY", "")
+    return SimpleNamespace(
+        trends=GoogleTrendsModule(serpapi_key),
+        related=RelatedQueriesModule(serpapi_key),
+        paa=PeopleAlsoAskModule(serpapi_key),
+        news=GoogleNewsModule(serpapi_key),
+        products=ProductAnalyzer(serpapi_key),
+        scoring=ScoringEngine(),
+        ai=AIAnalyzer()
+    )
+
+
+# ============================================
+# Cached SerpAPI Fetchers
+# ============================================
+# Streamlit re-ejecuta todo el script en cada interacción: cachear por
+# (keyword, país, timeframe...) evita repetir llamadas de pago a SerpAPI.
+# La API key vive en los módulos, así que no forma parte de la clave del caché.
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_interest_over_time(keyword: str, geo: str, timeframe: str,
+                              category: int = 0, exact_match: bool = None) -> dict:
+    return get_modules().trends.get_interest_over_time(
+        keyword=keyword, geo=geo, timeframe=timeframe,
+        category=category, exact_match=exact_match
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_related(keyword: str, geo: str, timeframe: str) -> dict:
+    return get_modules().related.get_all_related(
+        keyword=keyword, geo=geo, timeframe=timeframe
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_paa(keyword: str, country: str) -> dict:
+    return get_modules().paa.categorize_searches(
+        keyword=keyword, country=country
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_expanded_questions(keyword: str, country: str,
+                              max_depth: int = 2, max_questions: int = 25) -> dict:
+    return get_modules().paa.get_expanded_questions(
+        keyword=keyword, country=country,
+        max_depth=max_depth, max_questions=max_questions
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_news(query: str, country: str, include_english: bool = True) -> dict:
+    return get_modules().news.search_news_multilang(
+        query=query, country=country, include_english=include_english
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_product_analysis(brand: str, related_queries: list, geo: str, timeframe: str) -> dict:
+    return get_modules().products.full_analysis(
+        brand=brand, related_queries=related_queries, geo=geo, timeframe=timeframe
+    )
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_youtube_deep_dive(brand: str, geo: str) -> dict:
+    """Deep dive de YouTube y métricas básicas, cacheados por marca y país"""
+    from modules.youtube import get_youtube_module
+
+    yt_module = get_youtube_module()
+    if not yt_module:
+        return {"success": False, "deep_dive": None, "videos_by_type": None, "metrics": None}
+
+    deep_dive = yt_module.deep_dive_analysis(brand=brand, geo=geo, max_videos=50)
+
+    # También obtener métricas básicas para compatibilidad
+    videos_by_type = None
+    metrics = None
+    if deep_dive and deep_dive.videos_by_type:
+        videos_by_type = deep_dive.videos_by_type
+        metrics = yt_module.calculate_metrics(brand, videos_by_type)
+
+    return {
+        # Sin vídeos o con error de API no se cachea (ver fetch_cached)
+        "success": bool(deep_dive and deep_dive.total_videos_analyzed > 0)
+                   and not (metrics and metrics.api_error),
+        "deep_dive": deep_dive,
+        "videos_by_type": videos_by_type,
+        "metrics": metrics
+    }
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_product_intelligence(product_name: str) -> dict:
+    """Ciclo de vida, sentimiento y posición de mercado (Perplexity)"""
+    from modules.market_intelligence import get_market_intelligence
+
+    mi_module = get_market_intelligence()
+    if not mi_module:
+        return {"success": False, "result": None}
+
+    intel = mi_module.analyze_product_complete(
+        product_name=product_name,
+        brand="",
+        include_competitors=True
+    )
+    # Perplexity siempre cita fuentes: sin ellas la consulta falló
+    return {"success": bool(intel.sources), "result": intel}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_market_analysis(brand: str, geo: str) -> dict:
+    """Análisis de mercado de Perplexity, cacheado por marca y país"""
+    from modules.market_intelligence import get_market_intelligence
+
+    mi_module = get_market_intelligence()
+    if not mi_module:
+        return {"success": False, "result": None}
+
+    analysis = mi_module.analyze_market(brand=brand, category="tecnología", geo=geo)
+    return {"success": bool(analysis.sources), "result": analysis}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def cached_aliexpress_products(keyword: str) -> dict:
+    """Productos y hotproducts de AliExpress, cacheados por keyword"""
+    from modules.aliexpress import get_aliexpress_module
+
+    ali_module = get_aliexpress_module()
+    if not ali_module:
+        return {"success": False, "products": [], "hotproducts": []}
+
+    # Búsqueda y hotproducts son independientes: se piden a la vez. Los
+    # errores vuelven como excepción y se relanzan para que el panel los
+    # muestre desde el script principal
+    fetched = run_parallel({
+        "products": (ali_module.search_products, {"keyword": keyword, "max_results": 50}),
+        "hotproducts": (ali_module.get_hotproducts, {"keyword": keyword, "max_results": 20})
+    })
+    for result in fetched.values():
+        if isinstance(result, Exception):
+            raise result
+
+    products = fetched["products"]
+    return {"success": bool(products), "products": products, "hotproducts": fetched["hotproducts"]}
+
+
+def seasonality_fingerprint(seasonality_data: dict) -> tuple:
+    """
+    Resumen hashable de la estacionalidad: (es_estacional, mes pico, mes valle)
+
+    Es lo único que usan los proveedores para explicar el patrón, así que
+    dos series con los mismos meses pico/valle comparten explicación.
+    """
+    pattern = seasonality_data.get("monthly_pattern") or {}
+    if not pattern:
+        return (bool(seasonality_data.get("is_seasonal", False)), None, None)
+    return (
+        bool(seasonality_data.get("is_seasonal", False)),
+        int(max(pattern, key=pattern.get)),
+        int(min(pattern, key=pattern.get))
+    )
+
+
+@st.cache_data(ttl=24 * 3600, show_spinner=False)
+def cached_explain_seasonality(keyword: str, provider: str, fingerprint: tuple) -> str:
+    """Explicación de estacionalidad cacheada por keyword, proveedor y fingerprint"""
+    is_seasonal, peak_month, low_month = fingerprint
+    pattern = {peak_month: 1.0, low_month: 0.0} if peak_month is not None else {}
+    return get_modules().ai.explain_seasonality(
+        {"is_seasonal": is_seasonal, "monthly_pattern": pattern},
+        keyword,
+        provider
+    )
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def cached_ai_analysis(trend_data: dict, seasonality_data: dict, brand: str, provider: str) -> dict:
+    """Análisis IA (análisis, estacionalidad e ideas de blog) cacheado por datos y proveedor"""
+    return get_modules().ai.analyze_combined(
+        trend_data=trend_data,
+        seasonality_data=seasonality_data,
+        brand=brand,
+        provider=provider,
+        seasonality_explainer=lambda data, name, prov: cached_explain_seasonality(
+            name, prov, seasonality_fingerprint(data)
+        )
+    )
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def render_ai_analysis_card(analysis: str, provider: str) -> str:
+    """HTML de la tarjeta de análisis IA"""
+    return AI_ANALYSIS_CARD_HTML.format(
+        provider=sanitize_html(provider),
+        analysis=sanitize_html(analysis)
+    )
+
+
+def summary_metric_html(label: str, value: str, caption: str = "",
+                        color: str = "", is_score: bool = False) -> str:
+    """HTML de un indicador del resumen ejecutivo (score grande o valor)"""
+    return SUMMARY_METRIC_HTML.format(
+        label=label,
+        value=value,
+        value_class="summary-metric-score" if is_score else "summary-metric-value",
+        color=f' style="color: {color};"' if color else "",
+        caption=SUMMARY_CAPTION_HTML.format(caption) if caption else ""
+    )
+
+
+def score_color(score: float) -> str:
+    """Color semáforo de un score 0-100"""
+    return "#10B981" if score >= 70 else "#F59E0B" if score >= 40 else "#EF4444"
+
+
+@st.cache_data(ttl=1800, show_spinner=False)
+def sanitize_blog_ideas(blog_ideas: list) -> list:
+    """
+    Sanitiza una sola vez las ideas de blog de un análisis IA
+
+    Returns:
+        Lista (máx. 5) de dicts con titulo, enfoque y keywords (unidas por
+        comas) ya escapados
+    """
+    ideas = []
+    for i, idea in enumerate(islice(blog_ideas, 5)):
+        if not isinstance(idea, dict):
+            continue
+        keywords = idea.get('keywords_objetivo', [])
+        ideas.append({
+            "titulo": sanitize_html(idea.get('titulo', f'Idea {i+1}')),
+            "enfoque": sanitize_html(idea.get('enfoque', 'N/A')),
+            "keywords": (
+                ", ".join(sanitize_html_many(islice(keywords, 10)))
+                if keywords and isinstance(keywords, list) else ""
+            )
+        })
+    return ideas
+
+
+def task_result(result, default):
+    """Resultado de una tarea de run_parallel, o default si lanzó excepción"""
+    return default if isinstance(result, Exception) else result
+
+
+def completed_future(result) -> Future:
+    """Future ya resuelto: el panel lo recoge igual que una tarea en segundo plano"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def reusable_futures(last_background: dict, *names: str) -> Optional[list]:
+    """
+    Futures ya resueltos con los resultados de la ejecución anterior
+
+    Solo se reutilizan si están todos: resolved_results descarta cada tarea
+    por separado, así que un grupo a medias se vuelve a lanzar entero.
+    """
+    if not set(names) <= last_background.keys():
+        return None
+    return [completed_future(last_background[name]) for name in names]
+
+
+def resolved_results(futures: dict) -> dict:
+    """
+    Resultados de las tareas en segundo plano que ya terminaron bien
+
+    Un error, una tarea sin terminar o una respuesta con success=False no se
+    guardan, así se vuelven a intentar en la siguiente ejecución.
+    """
+    resolved = {}
+    for name, future in futures.items():
+        if future is None or not future.done() or future.exception() is not None:
+            continue
+        result = future.result()
+        if isinstance(result, dict) and not result.get("success", True):
+            continue
+        resolved[name] = result
+    return resolved
+
+
+def wait_for_result(future: Future, message: str, timeout: int = AI_RESULT_TIMEOUT):
+    """
+    Resultado de una tarea en segundo plano, con spinner solo si aún no ha terminado
+
+    Varios paneles leen el mismo Future: el primero espera con spinner y el
+    resto recoge el resultado sin volver a montar otro spinner. El timeout
+    cuenta desde que la tarea arranca: el tiempo en cola del pool no agota
+    el plazo de una llamada que aún no ha empezado.
+    """
+    if future.done():
+        return future.result()
+    with st.spinner(message):
+        while not future.running() and not future.done():
+            time.sleep(QUEUE_POLL_SECONDS)
+        return future.result(timeout=timeout)
+
+
+def settle_future(future: Future, message: str, timeout: int = AI_RESULT_TIMEOUT) -> Future:
+    """
+    Espera una sola vez a una tarea y devuelve su desenlace como Future resuelto
+
+    Si varios paneles leen la misma tarea, el primero la resuelve aquí y el
+    resto recibe al instante el resultado, el error o el timeout en vez de
+    volver a esperar el plazo completo.
+    """
+    try:
+        return completed_future(wait_for_result(future, message, timeout))
+    except Exception as e:
+        failed = Future()
+        failed.set_exception(e)
+        return failed
+
+
+def enrich_related_data(related_data: dict, related_module: RelatedQueriesModule, geo: str) -> dict:
+    """
+    Añade breakout_score a los rising y volúmenes reales de Google Ads
+
+    Args:
+        related_data: Resultado de get_all_related (se modifica in situ)
+        related_module: Módulo con el cálculo de breakout
+        geo: País para Google Ads
+    """
+    if not related_data.get("success"):
+        return related_data
+
+    # Enriquecer queries
+    queries = related_data.get("queries", {})
+    if queries.get("rising"):
+        queries["rising"] = related_module.enrich_with_breakout_scores(
+            queries["rising"], is_topic=False
+        )
+
+    # Enriquecer topics
+    topics = related_data.get("topics", {})
+    if topics.get("rising"):
+        topics["rising"] = related_module.enrich_with_breakout_scores(
+            topics["rising"], is_topic=True
+        )
+
+    # Enriquecer con volúmenes REALES de Google Ads (si disponible)
+    try:
+        from modules.google_ads import get_google_ads
+        google_ads = get_google_ads()
+        if google_ads:
+            # Rising y top queries con una sola consulta de volúmenes reales
+            if queries.get("rising") or queries.get("top"):
+                enriched = google_ads.enrich_related_queries_batch(
+                    {"rising": queries.get("rising", []), "top": queries.get("top", [])},
+                    geo=geo
+                )
+                queries["rising"] = enriched["rising"]
+                queries["top"] = enriched["top"]
+            st.session_state["has_real_volumes"] = True
+        else:
+            st.session_state["has_real_volumes"] = False
+    except Exception:
+        st.session_state["has_real_volumes"] = False
+
+    return related_data
+
+
+def dedupe_queries(queries: Iterable[dict]) -> list:
+    """
+    Quita queries repetidas (mismo texto normalizado), conservando la primera
+
+    Rising y top suelen compartir queries; al combinarlas, la de rising va
+    primero y es la que se conserva (su valor es el crecimiento). Acepta
+    cualquier iterable, p. ej. chain(rising, top), sin concatenar antes.
+    """
+    seen = set()
+    unique = []
+    for q in queries:
+        key = q.get("query", "").strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(q)
+    return unique
+
+
+def fetch_cached(cached_func, refresh: bool = False, **kwargs):
+    """
+    Llama a un fetcher cacheado sin dejar errores en el caché
+
+    Args:
+        cached_func: Función decorada con st.cache_data
+        refresh: Descartar la entrada cacheada antes de llamar
+        **kwargs: Argumentos del fetcher (forman la clave del caché)
+    """
+    if refresh:
+        cached_func.clear(**kwargs)
+
+    result = cached_func(**kwargs)
+
+    # Una respuesta fallida no debe servirse durante toda la hora de TTL
+    if isinstance(result, dict) and not result.get("success", True):
+        cached_func.clear(**kwargs)
+
+    return result
+
+
+def trends_fetch_kwargs(keyword: str, opts: SimpleNamespace, refresh: bool = False) -> dict:
+    """
+    Argumentos de fetch_cached para las consultas de Google Trends del análisis
+
+    Los comparten la carga principal y la precarga del buscador, así ambas
+    usan exactamente la misma clave de caché.
+    """
+    return {
+        "trends": {
+            "cached_func": cached_interest_over_time,
+            "refresh": refresh,
+            "keyword": keyword,
+            "geo": opts.geo,
+            "timeframe": opts.timeframe,
+            "category": opts.category,
+            "exact_match": opts.exact_match
+        },
+        "related": {
+            "cached_func": cached_related,
+            "refresh": refresh,
+            "keyword": keyword,
+            "geo": opts.geo,
+            "timeframe": opts.timeframe
+        }
+    }
+
+
+def search_run_key(keyword: str, opts: SimpleNamespace) -> tuple:
+    """Identifica una búsqueda: cambia si cambia cualquier dato que la define"""
+    return (keyword, opts.geo, opts.timeframe, opts.category, opts.exact_match)
+
+
+def prefetch_trends(keyword: str, opts: SimpleNamespace) -> None:
+    """
+    Calienta el caché de Google Trends para una búsqueda aún no lanzada
+
+    Si la búsqueda ya está en la caché persistente no se gasta ninguna
+    llamada a SerpAPI: la carga principal la servirá desde ahí.
+    """
+    cache = get_cache()
+    if cache:
+        cache_result = cache.get(keyword=keyword, country=opts.geo, timeframe=opts.timeframe)
+        if cache_result.hit and cache_result.data:
+            return
+
+    run_parallel({
+        name: (fetch_cached, kwargs)
+        for name, kwargs in trends_fetch_kwargs(keyword, opts).items()
+    })
+
+
+def on_search_input_change() -> None:
+    """
+    on_change del buscador: precarga Google Trends en cuanto se confirma el texto
+
+    Enter o salir del campo no lanzan el análisis; mientras el usuario pulsa
+    "Analizar" las consultas más lentas ya están en vuelo.
+    """
+    keyword = sanitize_for_query(st.session_state.get("search_input", ""))
+    if not keyword:
+        return
+
+    opts = read_options()
+    st.session_state["_prefetch"] = (
+        search_run_key(keyword, opts),
+        run_in_background(prefetch_trends, keyword=keyword, opts=opts)
+    )
+
+
+def request_market_analysis(run_key: tuple) -> None:
+    """Marca la búsqueda actual para lanzar el análisis de Perplexity"""
+    st.session_state["_market_requested"] = run_key
+
+
+def fetch_after_prefetch(prefetch: Future, **kwargs):
+    """fetch_cached que primero espera a la precarga en vuelo de la misma consulta"""
+    # Si la precarga sigue en cola tras otras tareas del pool, esperar es
+    # más lento que consultar: se cancela y se va directo
+    if not prefetch.running() and prefetch.cancel():
+        return fetch_cached(**kwargs)
+    try:
+        prefetch.result(timeout=PREFETCH_WAIT_TIMEOUT)
+    except Exception:
+        pass  # Si la precarga falla, la consulta normal lo reintenta
+    return fetch_cached(**kwargs)
+
+
+@st.fragment
+def render_country_comparison(keyword: str, opts: SimpleNamespace, refresh: bool = False):
+    """
+    Comparativa por países (fragmento: sus widgets no relanzan toda la página)
+
+    Args:
+        keyword: Término analizado
+        opts: Opciones de búsqueda del sidebar (timeframe, categoría, exacta)
+        refresh: Ignorar la caché de datos por país
+    """
+    compare_countries = st.checkbox("Comparar con otros países", value=False)
+
+    if compare_countries:
+        from components.geo_map import render_geo_comparison
+        from components.trend_chart import render_comparison_chart
+
+        try:
+            with st.spinner("Obteniendo datos por país..."):
+                # Una consulta por país, en paralelo y con la misma clave de
+                # caché que la del análisis principal: el país seleccionado
+                # sale de caché en lugar de repetirse contra SerpAPI
+                fetched = run_parallel({
+                    country: (fetch_cached, {
+                        "cached_func": cached_interest_over_time,
+                        # El país principal ya se refrescó en este rerun
+                        "refresh": refresh and country != opts.geo,
+                        "keyword": keyword,
+                        "geo": country,
+                        "timeframe": opts.timeframe,
+                        "category": opts.category,
+                        "exact_match": opts.exact_match
+                    })
+                    for country in COMPARISON_COUNTRIES
+                })
+
+            # Un país que falla no invalida al resto; se conserva el orden
+            countries = {
+                country: task_result(
+                    fetched[country], {"success": False, "error": str(fetched[country])}
+                )
+                for country in COMPARISON_COUNTRIES
+            }
+            render_geo_comparison(
+                country_data=countries,
+                keyword=keyword
+            )
+
+            # Gráfico comparativo
+            render_comparison_chart(
+                data_by_country=countries,
+                keyword=keyword
+            )
+        except Exception as e:
+            st.warning("No se pudieron cargar los datos de comparativa por países")
+
+
+def read_options() -> SimpleNamespace:
+    """
+    Snapshot de las opciones del sidebar guardadas en session_state
+
+    Se lee una sola vez por rerun en lugar de consultar session_state en
+    cada uso. has_real_volumes no se incluye: se actualiza durante la carga.
+    """
+    state = st.session_state
+    return SimpleNamespace(
+        geo=state.selected_country,
+        timeframe=state.selected_timeframe,
+        category=state.get("search_category", 5),  # Default: Informática
+        exact_match=state.get("exact_match", True),
+        show_volume=state.get("show_volume_estimate", True),
+        show_trajectory=state.get("show_trajectory", True),
+        ai_provider=state.ai_provider
+    )
+
+
+def load_analysis_data(
+    keyword: str,
+    mods: SimpleNamespace,
+    force_refresh: bool,
+    opts: SimpleNamespace
+) -> Optional[dict]:
+    """
+    Obtiene datos de todas las fuentes y calcula métricas y scores
+
+    Args:
+        keyword: Término ya sanitizado
+        mods: Módulos compartidos (get_modules)
+        force_refresh: Ignorar cachés y consultar de nuevo
+        opts: Opciones del sidebar (ver read_options)
+
+    Returns:
+        Dict con los datos del análisis o None si no hay datos de tendencia
+        (el error ya se ha mostrado)
+    """
+    # === VERIFICAR CACHÉ ===
+    cache = get_cache()
+    cache_result = CacheResult(hit=False)
+    using_cache = False
     
-    # Verificar autenticación por email
-    if not render_email_login():
-        st.stop()
+    # === INICIALIZAR TODAS LAS VARIABLES ===
+    # Esto evita errores de "variable not defined" y elimina uso de 'in dir()'
+    timeline_data = None
+    related_data = EMPTY_RELATED
+    paa_data = None
+    questions = []
+    news_data = EMPTY_NEWS
+    trend_score = {"score": 0, "grade": "F"}
+    potential_score = {"score": 0, "grade": "F"}
+    growth_data = {"growth_rate": 0, "current_value": 0}
+    seasonality_data = {}
     
-    init_session_state()
-
-    # Sidebar
-    with st.sidebar:
-        render_logo()
-        
-        # Badge del usuario logueado
-        render_user_badge()
-        
-        # Uso de APIs en la sesión
-        render_api_usage_badge()
-        
-        # Botón de logout
-        render_logout_button()
-        
-        st.markdown("---")
+    # Variables que pueden venir de caché
+    cached_timeline_data = None
+    cached_related_data = None
+    cached_paa_data = None
+    cached_questions = None
+    cached_ai_result = None
+    
+    if cache and not force_refresh:
+        cache_result = cache.get(
+            keyword=keyword,
+            country=opts.geo,
+            timeframe=opts.timeframe
+        )
         
-        # Historial de búsquedas recientes
-        history_selected = render_search_history()
-        if history_selected:
-            st.session_state["prefill_keyword"] = history_selected
+        if cache_result.hit and cache_result.data:
+            using_cache = True
+            data = cache_result.data
+            
+            # Extraer datos del caché
+            cached_timeline_data = data.get("timeline_data")
+            cached_related_data = data.get("related_data")
+            cached_ai_result = data.get("ai_analysis")
+            
+            # Extraer datos de extra_data (donde se guardan paa y questions)
+            extra = data.get("extra_data", {}) or {}
+            cached_paa_data = extra.get("paa_data")
+            cached_questions = extra.get("questions")
+            
+            # Mostrar indicador de caché
+            st.info(f"📦 Datos de caché ({cache_result.age_formatted}) | [🔄 Marcar 'Forzar actualización' para obtener datos nuevos]")
+        else:
+            # Debug: mostrar que buscó en caché pero no encontró
+            st.caption(f"🔄 No hay caché para '{keyword}' ({opts.geo}, {opts.timeframe})")
+
+    # === OBTENER DATOS EN PARALELO ===
+    # Las consultas a SerpAPI son independientes entre sí: se lanzan a la vez
+    # y la latencia total pasa a ser la de la más lenta, no la suma de todas.
+    fetch_tasks = {}
+    trends_kwargs = trends_fetch_kwargs(keyword, opts, refresh=force_refresh)
+
+    # Precarga lanzada desde el buscador para esta misma búsqueda: se espera
+    # a ella en lugar de repetir las consultas que ya están en vuelo
+    prefetch = st.session_state.pop("_prefetch", None)
+    prefetch_future = None
+    if prefetch and not force_refresh and prefetch[0] == search_run_key(keyword, opts):
+        prefetch_future = prefetch[1]
+
+    for name, cached_data in (("trends", cached_timeline_data), ("related", cached_related_data)):
+        if using_cache and cached_data:
+            continue
+        if prefetch_future is not None:
+            fetch_tasks[name] = (fetch_after_prefetch, {"prefetch": prefetch_future, **trends_kwargs[name]})
+        else:
+            fetch_tasks[name] = (fetch_cached, trends_kwargs[name])
+
+    if not (using_cache and cached_paa_data and cached_questions is not None):
+        fetch_tasks["paa"] = (fetch_cached, {
+            "cached_func": cached_paa,
+            "refresh": force_refresh,
+            "keyword": keyword,
+            "country": opts.geo
+        })
+        fetch_tasks["expanded_questions"] = (fetch_cached, {
+            "cached_func": cached_expanded_questions,
+            "refresh": force_refresh,
+            "keyword": keyword,
+            "country": opts.geo,
+            "max_depth": 2,
+            "max_questions": 25
+        })
+
+    fetch_tasks["news"] = (fetch_cached, {
+        "cached_func": cached_news,
+        "refresh": force_refresh,
+        "query": keyword,
+        "country": opts.geo,
+        "include_english": True
+    })
 
-        # Selector de modo
-        st.markdown("#### 🎯 Modo de Análisis")
-        mode = st.radio(
-            "Selecciona modo",
-            options=["deep_dive", "scanner", "quick"],
-            format_func=lambda x: {
-                "deep_dive": "🔬 Deep Dive (1 marca)",
-                "scanner": "🚀 Scanner (CSV)",
-                "quick": "⚡ Quick Ranking"
-            }.get(x),
-            label_visibility="collapsed",
-            key="analysis_mode"
+    # === INDICADOR DE PROGRESO ===
+    # Un único st.status (spinner + etiqueta) que se actualiza al terminar
+    # cada consulta; va en un placeholder para poder retirarlo al acabar
+    progress_container = st.empty()
+    progress_steps = {
+        "trends": "📈 Google Trends",
+        "related": "🔗 Búsquedas relacionadas",
+        "paa": "❓ Preguntas frecuentes",
+        "expanded_questions": "❓ Preguntas relacionadas",
+        "news": "📰 Noticias"
+    }
+    total_steps = len(fetch_tasks)
+    done_steps = []
+
+    with progress_container.status("🔮 Consultando fuentes...") as status:
+        def update_progress(step_key: str):
+            done_steps.append(step_key)
+            step_name = progress_steps.get(step_key, step_key)
+            status.update(label=f"{step_name} ({len(done_steps)}/{total_steps})")
+
+        fetched = run_parallel(fetch_tasks, on_done=update_progress)
+        status.update(state="complete")
+
+    # Google Trends
+    if "trends" in fetched:
+        trends_data = fetched["trends"]
+        if isinstance(trends_data, Exception):
+            st.error(f"Error consultando Google Trends: {sanitize_html(str(trends_data))}")
+            return None
+
+        # Mostrar info de búsqueda si usó comillas
+        if trends_data.get("exact_match"):
+            st.caption(f"🔍 Búsqueda: `{trends_data.get('query_used', keyword)}` | Categoría: {opts.category}")
+
+        if not trends_data.get("success"):
+            error_msg = trends_data.get('error', 'Error desconocido')
+            st.error(f"Error obteniendo datos: {sanitize_html(str(error_msg))}")
+            st.info("💡 Esto puede ocurrir si la marca es muy nueva o tiene poco volumen de búsqueda.")
+            return None
+
+        timeline_data = trends_data.get("timeline_data", [])
+    else:
+        # Usar datos de caché
+        timeline_data = cached_timeline_data
+        trends_data = {"success": True, "timeline_data": timeline_data}
+
+    if not timeline_data:
+        st.warning(f"No se encontraron datos para '{sanitize_html(keyword)}'.")
+        st.info("💡 Prueba con otro término o verifica que la marca existe.")
+        return None
+
+    # Calcular métricas (manejando valores cero)
+    growth_data = calculate_growth_rate(timeline_data)
+    seasonality_data = calculate_seasonality(timeline_data)
+
+    # Datos relacionados
+    if "related" in fetched:
+        related_data = safe_call(
+            enrich_related_data,
+            task_result(fetched["related"], EMPTY_RELATED),
+            mods.related,
+            opts.geo,
+            default=EMPTY_RELATED
         )
+    else:
+        related_data = cached_related_data
 
-        st.markdown("---")
+    # PAA expandido
+    if "paa" in fetched:
+        paa_data = task_result(fetched["paa"], EMPTY_PAA)
+        questions = task_result(fetched["expanded_questions"], {}).get("questions", [])
+    else:
+        paa_data = cached_paa_data
+        questions = cached_questions
+
+    # Noticias (se renderizan más abajo)
+    news_error = fetched["news"] if isinstance(fetched["news"], Exception) else None
+    news_data = task_result(fetched["news"], EMPTY_NEWS)
+
+    # Valores que usan scores, IA y paneles: se resuelven una sola vez
+    current_value = growth_data.get("current_value", 0)
+    growth_rate = growth_data.get("growth_rate", 0)
+    is_seasonal = seasonality_data.get("is_seasonal", False)
+    rising_queries = related_data.get("queries", {}).get("rising", [])
+
+    # Calcular scores (manejando valores cero)
+    trend_score = safe_call(
+        mods.scoring.calculate_trend_score,
+        timeline_data=timeline_data,
+        related_queries_count=len(rising_queries),
+        default=EMPTY_SCORE
+    )
+
+    potential_score = safe_call(
+        mods.scoring.calculate_potential_score,
+        timeline_data=timeline_data,
+        rising_queries=rising_queries,
+        current_value=current_value,
+        is_seasonal=is_seasonal,
+        default=EMPTY_SCORE
+    )
+
+    opportunity = safe_call(
+        mods.scoring.calculate_opportunity_level,
+        trend_score=trend_score.get("score", 0),
+        potential_score=potential_score.get("score", 0),
+        default=EMPTY_OPPORTUNITY
+    )
+
+    # Limpiar indicador de progreso
+    progress_container.empty()
+
+    return {
+        "using_cache": using_cache,
+        "timeline_data": timeline_data,
+        "related_data": related_data,
+        "paa_data": paa_data,
+        "questions": questions,
+        "news_data": news_data,
+        "news_error": news_error,
+        "growth_data": growth_data,
+        "seasonality_data": seasonality_data,
+        "current_value": current_value,
+        "growth_rate": growth_rate,
+        "is_seasonal": is_seasonal,
+        "rising_queries": rising_queries,
+        "trend_score": trend_score,
+        "potential_score": potential_score,
+        "opportunity": opportunity,
+        "cached_ai_result": cached_ai_result
+    }
+
+
+@st.fragment
+def render_export_section(keyword: str, opts: SimpleNamespace, report: dict):
+    """
+    Exportación del análisis a PDF, Excel y JSON (y envío por email).
+
+    Es un fragmento: pulsar los botones de exportar solo reejecuta esta
+    sección, no todo el Deep Dive. report lleva los datos ya calculados
+    del análisis (timeline, scores, queries, inteligencia de mercado...).
+    """
+    timeline_data = report["timeline_data"]
+    related_data = report["related_data"]
+    paa_data = report["paa_data"]
+    news_data = report["news_data"]
+    youtube_deep_dive = report["youtube_deep_dive"]
+    trend_score = report["trend_score"]
+    potential_score = report["potential_score"]
+    growth_data = report["growth_data"]
+    growth_rate = report["growth_rate"]
+    current_value = report["current_value"]
+    seasonality_data = report["seasonality_data"]
+    rising_queries = report["rising_queries"]
+    top_queries = report["top_queries"]
+    market_analysis = report["market_analysis"]
+    product_intelligence = report["product_intelligence"]
+
+    st.markdown("### 📄 Exportar Informe")
+
+    col_pdf1, col_pdf2, col_pdf3 = st.columns([1, 2, 1])
+
+    with col_pdf2:
+        if st.button("📥 Descargar Informe PDF", type="primary", use_container_width=True):
+            with st.spinner("Generando informe PDF..."):
+                try:
+                    from modules.pdf_report import generate_trend_report
+                    from components.market_intelligence_panel import get_intelligence_for_pdf
+
+                    # Extraer fechas y valores del timeline (formato SerpAPI)
+                    trend_dates, trend_values = extract_timeline_series(timeline_data)
+
+                    # Preparar datos para el PDF
+                    pdf_data = {
+                        "trend_score": trend_score.get("score", 0),
+                        "potential_score": potential_score.get("score", 0),
+                        "growth_rate": growth_rate,
+                        "current_value": current_value,
+                        "trend_values": trend_values,
+                        "trend_dates": trend_dates,
+                        "growth_data": growth_data,
+                        "seasonality_data": seasonality_data,
+                        "rising_queries": rising_queries,
+                        "top_queries": top_queries,
+                        "products": [],
+                        "ai_recommendation": ""
+                    }
+
+                    # Añadir datos de Market Intelligence si existen
+                    if market_analysis or product_intelligence:
+                        intel_data = get_intelligence_for_pdf(market_analysis, product_intelligence)
+                        pdf_data["market_intelligence"] = intel_data.get("market_intelligence", {})
+                        pdf_data["sentiment_data"] = intel_data.get("sentiment_data", {})
+
+                    # Generar PDF
+                    pdf_bytes = generate_trend_report(keyword, pdf_data)
+                    
+                    # Guardar en session_state para envío por email
+                    st.session_state["last_pdf_bytes"] = pdf_bytes
+                    st.session_state["last_pdf_keyword"] = keyword
+
+                    # Botón de descarga
+                    st.download_button(
+                        label="💾 Guardar PDF",
+                        data=pdf_bytes,
+                        file_name=f"trend_report_{keyword_slug(keyword)}_{opts.geo}.pdf",
+                        mime="application/pdf",
+                        use_container_width=True
+                    )
 
-        # Selector de IA
-        st.markdown("#### 🤖 Proveedor IA")
-        ai_provider = render_provider_selector()
-        st.session_state.ai_provider = ai_provider
+                    st.success("✅ Informe generado correctamente")
 
-        st.markdown("---")
+                except Exception as e:
+                    st.error(f"Error generando PDF: {sanitize_html(str(e))}")
 
-        # Estado de APIs
-        render_api_status()
+        st.caption("El informe incluye: tendencias, scores, búsquedas relacionadas, estacionalidad e inteligencia de mercado (si Perplexity está configurado).")
         
-        # Estado de Caché
-        render_cache_status_sidebar()
+        # Botón de exportar a Excel
+        st.divider()
+        if st.button("📊 Descargar Excel (datos completos)", use_container_width=True):
+            with st.spinner("Generando Excel..."):
+                try:
+                    from modules.excel_report import generate_excel_report, get_excel_filename
+                    
+                    excel_bytes = generate_excel_report(
+                        keyword=keyword,
+                        country=opts.geo,
+                        timeline_data=timeline_data,
+                        related_data=related_data,
+                        trend_score=trend_score,
+                        potential_score=potential_score,
+                        growth_data=growth_data,
+                        seasonality_data=seasonality_data,
+                        youtube_data=youtube_deep_dive,
+                        news_data=news_data.get("news") if news_data else None,
+                        paa_data=paa_data
+                    )
+                    
+                    filename = get_excel_filename(keyword, opts.geo)
+                    
+                    st.download_button(
+                        label="💾 Guardar Excel",
+                        data=excel_bytes,
+                        file_name=filename,
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        use_container_width=True
+                    )
+                    st.success("✅ Excel generado con múltiples hojas de datos")
+                    
+                except Exception as e:
+                    st.error(f"Error generando Excel: {sanitize_html(str(e))}")
         
-        # Debug de caché (temporal)
-        with st.expander("🔧 Debug Caché", expanded=False):
-            render_cache_debug()
-
-        st.markdown("---")
+        st.caption("📊 El Excel incluye hojas separadas: Resumen, Tendencia, Queries, Topics, YouTube, Noticias, PAA y Factores de Score.")
         
-        # URL Analyzer (herramienta auxiliar)
-        with st.expander("🔗 Analizar URL", expanded=False):
-            st.caption("Pega una URL de producto para extraer su marca y tendencias")
-            render_url_analyzer_form()
-
-        st.markdown("---")
-        st.markdown(
-            '<p style="font-size: 0.75rem; color: #9CA3AF; text-align: center;">'
-            'Abra Trend Hunter v1.0<br>PCComponentes Product Discovery</p>',
-            unsafe_allow_html=True
-        )
-
-    # Verificar API key
-    api_status = check_api_keys()
-    if not api_status["serpapi"]:
-        st.error("⚠️ SerpAPI no está configurada. Añade tu API key en los secrets.")
-        st.info("Ve a Settings > Secrets y añade: SERPAPI_KEY = 'tu_api_key'")
-        return
-
-    serpapi_key = st.secrets.get("SERPAPI_KEY", "")
-    geo = st.session_state.get("selected_country", "ES")
+        # Export JSON para integraciones
+        st.divider()
+        if st.button("🔗 Descargar JSON (para APIs)", use_container_width=True):
+            import json
+            from datetime import datetime
+            
+            # Preparar datos para export
+            json_export = {
+                "metadata": {
+                    "keyword": keyword,
+                    "country": opts.geo,
+                    "timeframe": opts.timeframe,
+                    "generated_at": datetime.now().isoformat(),
+                    "version": "1.0"
+                },
+                "scores": {
+                    "trend_score": trend_score.get("score", 0) if trend_score else 0,
+                    "trend_grade": trend_score.get("grade", "F") if trend_score else "F",
+                    "potential_score": potential_score.get("score", 0) if potential_score else 0,
+                    "potential_grade": potential_score.get("grade", "F") if potential_score else "F",
+                },
+                "growth": {
+                    "rate_3m": growth_data.get("growth_rate_3m", 0) if growth_data else 0,
+                    "rate_12m": growth_data.get("growth_rate_12m", 0) if growth_data else 0,
+                    "current_vs_max": growth_data.get("current_vs_max", 0) if growth_data else 0,
+                },
+                "timeline": timeline_data[:12] if timeline_data else [],  # Últimos 12 puntos
+                "related_queries": {
+                    "rising": rising_queries[:10],
+                    "top": top_queries[:10]
+                }
+            }
+            
+            json_str = json.dumps(json_export, indent=2, ensure_ascii=False, default=str)
+            
+            st.download_button(
+                label="💾 Guardar JSON",
+                data=json_str,
+                file_name=f"abra_{keyword_slug(keyword).lower()}_{opts.geo}.json",
+                mime="application/json",
+                use_container_width=True
+            )
+            st.success("✅ JSON listo para integración con otras herramientas")
+        
+        st.caption("🔗 El JSON está optimizado para integración con dashboards, APIs y herramientas de BI.")
+        
+        # Sección de envío por email (si hay PDF generado)
+        if st.session_state.get("last_pdf_bytes"):
+            with st.expander("📧 Enviar informe por email"):
+                from modules.email_report import render_email_form
+                render_email_form(
+                    keyword=st.session_state.get("last_pdf_keyword", keyword),
+                    pdf_bytes=st.session_state["last_pdf_bytes"]
+                )
 
-    # Renderizar según modo seleccionado
-    mode = st.session_state.get("analysis_mode", "deep_dive")
 
-    if mode == "scanner":
-        # Modo Scanner: análisis masivo de marcas
-        render_brand_scanner(serpapi_key, geo)
-        return
+@st.fragment
+def render_deep_dive(serpapi_key: str):
+    """
+    Modo Deep Dive: buscador, opciones de búsqueda y análisis de 1 marca.
 
-    elif mode == "quick":
-        # Modo Quick: ranking rápido
-        render_quick_ranking(serpapi_key, geo)
-        return
+    Es un fragmento: los widgets de aquí dentro (búsqueda, región, período,
+    categoría, forzar actualización...) solo reejecutan esta sección, sin
+    volver a pintar el sidebar. El sidebar (historial, uso de APIs) se
+    actualiza en el siguiente rerun completo.
+    """
 
-    # ===== MODO DEEP DIVE =====
-    # Contenido principal - análisis profundo de 1 marca
-    
     # Barra de búsqueda mejorada con guía de operadores
     st.markdown("""
     <div class="search-container">
@@ -256,7 +1291,8 @@ def main():
             placeholder="Ej: RTX 5090, Framework Laptop, Steam Deck...",
             label_visibility="collapsed",
             key="search_input",
-            max_chars=200  # Limitar longitud
+            max_chars=200,  # Limitar longitud
+            on_change=on_search_input_change
         )
 
     with col_button:
@@ -274,41 +1310,7 @@ def main():
     
     # Guía de operadores de búsqueda (colapsable)
     with st.expander("💡 **Sintaxis de búsqueda avanzada**", expanded=False):
-        st.markdown("""
-        <div class="search-syntax-guide">
-            <div class="syntax-grid">
-                <div class="syntax-item">
-                    <code class="syntax-code">"frase exacta"</code>
-                    <span class="syntax-desc">Busca la frase completa tal cual</span>
-                    <span class="syntax-example">Ej: "gaming laptop"</span>
-                </div>
-                <div class="syntax-item">
-                    <code class="syntax-code">término1 + término2</code>
-                    <span class="syntax-desc">Suma el interés de ambos términos</span>
-                    <span class="syntax-example">Ej: nvidia + amd</span>
-                </div>
-                <div class="syntax-item">
-                    <code class="syntax-code">término1, término2</code>
-                    <span class="syntax-desc">Compara términos lado a lado</span>
-                    <span class="syntax-example">Ej: iphone, samsung</span>
-                </div>
-                <div class="syntax-item">
-                    <code class="syntax-code">término1 - término2</code>
-                    <span class="syntax-desc">Excluye el segundo término</span>
-                    <span class="syntax-example">Ej: apple - fruit</span>
-                </div>
-            </div>
-            <div class="syntax-tips">
-                <p><strong>💡 Tips:</strong></p>
-                <ul>
-                    <li>Sin comillas = búsqueda amplia (incluye variaciones)</li>
-                    <li>Con comillas = búsqueda exacta (solo esa frase)</li>
-                    <li>Usa inglés para marcas internacionales</li>
-                    <li>Sé específico: "RTX 4090" mejor que "nvidia gpu"</li>
-                </ul>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(SEARCH_SYNTAX_GUIDE_HTML, unsafe_allow_html=True)
 
     # Opciones de búsqueda (debajo de sintaxis)
     with st.expander("⚙️ **Opciones de búsqueda**", expanded=False):
@@ -317,14 +1319,8 @@ def main():
         with col_region:
             region = st.selectbox(
                 "🌍 Región",
-                options=["ES", "PT", "FR", "IT", "DE"],
-                format_func=lambda x: {
-                    "ES": "🇪🇸 España",
-                    "PT": "🇵🇹 Portugal",
-                    "FR": "🇫🇷 Francia",
-                    "IT": "🇮🇹 Italia",
-                    "DE": "🇩🇪 Alemania"
-                }.get(x, x),
+                options=list(REGION_LABELS),
+                format_func=REGION_LABELS.get,
                 index=0,
                 help="Mercado a analizar. Los datos de tendencias, noticias y YouTube se filtrarán para este país.",
                 key="region_select"
@@ -334,18 +1330,8 @@ def main():
         with col_time:
             timeframe = st.selectbox(
                 "📅 Período",
-                options=[
-                    "today 5-y",
-                    "today 12-m",
-                    "today 3-m",
-                    "today 1-m"
-                ],
-                format_func=lambda x: {
-                    "today 1-m": "Último mes",
-                    "today 3-m": "3 meses",
-                    "today 12-m": "1 año",
-                    "today 5-y": "5 años"
-                }.get(x, x),
+                options=list(TIMEFRAME_LABELS),
+                format_func=TIMEFRAME_LABELS.get,
                 index=0,
                 help="5 años: ideal para ver estacionalidad y ciclos. 1 año: tendencias recientes. 3 meses: movimientos rápidos.",
                 key="timeframe_select"
@@ -355,13 +1341,8 @@ def main():
         with col_cat:
             category = st.selectbox(
                 "📂 Categoría",
-                options=[0, 5, 78, 18],
-                format_func=lambda x: {
-                    0: "Todas",
-                    5: "Informática",
-                    78: "Electrónica",
-                    18: "Compras"
-                }.get(x, f"Cat {x}"),
+                options=list(CATEGORY_LABELS),
+                format_func=CATEGORY_LABELS.get,
                 index=1,
                 help="Filtrar por categoría de Google. 'Informática' recomendado para hardware y tech.",
                 key="category_select"
@@ -424,312 +1405,206 @@ def main():
 
     # Inicializar módulos
     try:
-        serpapi_key = st.secrets.get("SERPAPI_KEY", "")
-        trends_module = GoogleTrendsModule(serpapi_key)
-        related_module = RelatedQueriesModule(serpapi_key)
-        paa_module = PeopleAlsoAskModule(serpapi_key)
-        news_module = GoogleNewsModule(serpapi_key)
-        product_analyzer = ProductAnalyzer(serpapi_key)
-        scoring_engine = ScoringEngine()
-        ai_analyzer = AIAnalyzer()
+        mods = get_modules()
     except Exception as e:
         st.error(f"Error inicializando módulos: {sanitize_html(str(e))}")
         return
 
-    # === VERIFICAR CACHÉ ===
-    cache = get_cache()
-    cache_result = CacheResult(hit=False)
-    using_cache = False
-    
-    # === INICIALIZAR TODAS LAS VARIABLES ===
-    # Esto evita errores de "variable not defined" y elimina uso de 'in dir()'
-    timeline_data = None
-    related_data = {"success": False, "queries": {"rising": [], "top": []}, "topics": {"rising": [], "top": []}}
-    paa_data = None
-    questions = []
-    youtube_deep_dive = None
-    news_data = {"success": False, "news": []}
-    ai_result = None
-    trend_score = {"score": 0, "grade": "F"}
-    potential_score = {"score": 0, "grade": "F"}
-    growth_data = {"growth_rate": 0, "current_value": 0}
-    seasonality_data = {}
-    market_analysis = None
-    progress_container = None
-    
-    # Variables que pueden venir de caché
-    cached_timeline_data = None
-    cached_related_data = None
-    cached_paa_data = None
-    cached_questions = None
-    cached_youtube_data = None
-    cached_news_data = None
-    cached_ai_result = None
-    cached_market_analysis = None
-    cached_trend_score = None
-    cached_potential_score = None
-    
-    if cache and not force_refresh:
-        cache_result = cache.get(
-            keyword=keyword,
-            country=st.session_state.selected_country,
-            timeframe=st.session_state.selected_timeframe
-        )
-        
-        if cache_result.hit and cache_result.data:
-            using_cache = True
-            data = cache_result.data
-            
-            # Extraer datos del caché
-            cached_timeline_data = data.get("timeline_data")
-            cached_related_data = data.get("related_data")
-            cached_youtube_data = data.get("youtube_data")
-            cached_news_data = data.get("news_data")
-            cached_ai_result = data.get("ai_analysis")
-            cached_trend_score = data.get("trend_score")
-            cached_potential_score = data.get("potential_score")
-            
-            # Extraer datos de extra_data (donde se guardan paa, questions, market_analysis)
-            extra = data.get("extra_data", {}) or {}
-            cached_paa_data = extra.get("paa_data")
-            cached_questions = extra.get("questions")
-            cached_market_analysis = extra.get("market_analysis")
-            
-            # Mostrar indicador de caché
-            st.info(f"📦 Datos de caché ({cache_result.age_formatted}) | [🔄 Marcar 'Forzar actualización' para obtener datos nuevos]")
-        else:
-            # Debug: mostrar que buscó en caché pero no encontró
-            st.caption(f"🔄 No hay caché para '{keyword}' ({st.session_state.selected_country}, {st.session_state.selected_timeframe})")
+    # Opciones del sidebar, leídas una sola vez por rerun
+    opts = read_options()
 
-    # Obtener datos
-    # Obtener opciones del sidebar
-    search_category = st.session_state.get("search_category", 5)  # Default: Informática
-    exact_match = st.session_state.get("exact_match", True)
-    
-    # === INDICADOR DE PROGRESO ===
-    if not using_cache:
-        progress_container = st.empty()
-        progress_steps = {
-            "trends": "📈 Google Trends",
-            "related": "🔗 Búsquedas relacionadas", 
-            "paa": "❓ Preguntas frecuentes",
-            "youtube": "📺 YouTube",
-            "news": "📰 Noticias",
-            "ai": "🤖 Análisis IA"
-        }
-        current_step = 0
-        total_steps = len(progress_steps)
-        
-        def update_progress(step_key: str):
-            nonlocal current_step
-            current_step += 1
-            step_name = progress_steps.get(step_key, step_key)
-            progress_container.progress(
-                current_step / total_steps, 
-                f"{step_name} ({current_step}/{total_steps})"
-            )
-    
-    # Google Trends
-    if using_cache and cached_timeline_data:
-        # Usar datos de caché
-        timeline_data = cached_timeline_data
-        trends_data = {"success": True, "timeline_data": timeline_data}
+    # === REUTILIZAR LA ÚLTIMA EJECUCIÓN ===
+    # Cualquier widget provoca un rerun completo: si la búsqueda no ha
+    # cambiado se reutilizan los datos ya calculados y solo se vuelve a pintar.
+    run_key = search_run_key(keyword, opts)
+    last_results = st.session_state.get("_last_results")
+    reused_results = (
+        not force_refresh and bool(last_results) and st.session_state.get("_last_key") == run_key
+    )
+    if reused_results:
+        # Ya guardados en caché persistente en la ejecución original
+        results = {**last_results, "using_cache": True}
     else:
-        if not using_cache:
-            update_progress("trends")
-        with st.spinner("🔮 Consultando Google Trends..."):
-            try:
-                trends_data = trends_module.get_interest_over_time(
-                    keyword=keyword,
-                    geo=st.session_state.selected_country,
-                    timeframe=st.session_state.selected_timeframe,
-                    category=search_category,
-                    exact_match=exact_match
-                )
-
-                # Mostrar info de búsqueda si usó comillas
-                if trends_data.get("exact_match"):
-                    st.caption(f"🔍 Búsqueda: `{trends_data.get('query_used', keyword)}` | Categoría: {search_category}")
-
-            except Exception as e:
-                st.error(f"Error consultando Google Trends: {sanitize_html(str(e))}")
-                return
-
-        if not trends_data.get("success"):
-            error_msg = trends_data.get('error', 'Error desconocido')
-            st.error(f"Error obteniendo datos: {sanitize_html(str(error_msg))}")
-            st.info("💡 Esto puede ocurrir si la marca es muy nueva o tiene poco volumen de búsqueda.")
+        results = load_analysis_data(keyword, mods, force_refresh, opts)
+        if results is None:
+            st.session_state.pop("_last_key", None)
+            st.session_state.pop("_last_results", None)
             return
+        st.session_state["_last_key"] = run_key
+        st.session_state["_last_results"] = results
+
+    # Lo mismo para IA, productos, YouTube y Perplexity: con la misma búsqueda
+    # y proveedor se reutilizan sus resultados sin relanzar ningún thread
+    background_key = (run_key, opts.ai_provider)
+    last_background = (
+        st.session_state.get("_last_background", {})
+        if reused_results and st.session_state.get("_last_background_key") == background_key
+        else {}
+    )
 
-        timeline_data = trends_data.get("timeline_data", [])
+    using_cache = results["using_cache"]
+    timeline_data = results["timeline_data"]
+    related_data = results["related_data"]
+    paa_data = results["paa_data"]
+    questions = results["questions"]
+    news_data = results["news_data"]
+    news_error = results["news_error"]
+    growth_data = results["growth_data"]
+    seasonality_data = results["seasonality_data"]
+    current_value = results["current_value"]
+    growth_rate = results["growth_rate"]
+    is_seasonal = results["is_seasonal"]
+    rising_queries = results["rising_queries"]
+    queries_data = related_data.get("queries", {})
+    top_queries = queries_data.get("top", [])
+    trend_score = results["trend_score"]
+    potential_score = results["potential_score"]
+    opportunity = results["opportunity"]
+    youtube_deep_dive = None
+    ai_result = None
+    market_analysis = None
 
-    if not timeline_data:
-        st.warning(f"No se encontraron datos para '{keyword_display}'.")
-        st.info("💡 Prueba con otro término o verifica que la marca existe.")
-        return
+    # === LAYOUT PRINCIPAL ===
 
-    # Calcular métricas (manejando valores cero)
-    growth_data = calculate_growth_rate(timeline_data)
-    seasonality_data = calculate_seasonality(timeline_data)
+    # === ANÁLISIS IA EN SEGUNDO PLANO ===
+    # Una sola llamada al LLM devuelve análisis, explicación de estacionalidad
+    # e ideas de blog. Se lanza ya y se recoge al pintar el primer panel que
+    # la necesita, así su latencia se solapa con el render de gráficos y scores.
+    ai_available = bool(mods.ai.get_available_providers())
+    analysis_future = None
+    stored_ai_result = results.get("cached_ai_result")
+    if ai_available and "ai" in last_background:
+        analysis_future = completed_future(last_background["ai"])
+    elif (
+        ai_available
+        and stored_ai_result
+        and stored_ai_result.get("success")
+        and stored_ai_result.get("provider") == mods.ai.PROVIDER_NAMES.get(opts.ai_provider)
+    ):
+        # El análisis guardado en caché persistente es del mismo proveedor:
+        # se reutiliza en lugar de repetir la llamada al LLM
+        analysis_future = completed_future(stored_ai_result)
+    elif ai_available:
+        analysis_data = {
+            "keyword": keyword,
+            "current_value": current_value,
+            "growth_rate": growth_rate,
+            "trend_score": trend_score.get("score", 0),
+            "potential_score": potential_score.get("score", 0),
+            "is_seasonal": is_seasonal,
+            "rising_queries": rising_queries[:5],
+            "questions": [
+                q.get("question", "")
+                for q in islice(questions, 5) if isinstance(q, dict)
+            ]
+        }
+        analysis_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_ai_analysis,
+            trend_data=analysis_data,
+            seasonality_data=seasonality_data,
+            brand=keyword,
+            provider=opts.ai_provider
+        )
 
-    # Obtener datos relacionados
-    if using_cache and cached_related_data:
-        related_data = cached_related_data
-    else:
-        if not using_cache:
-            update_progress("related")
-        with st.spinner("🔍 Obteniendo búsquedas relacionadas..."):
-            try:
-                related_data = related_module.get_all_related(
-                    keyword=keyword,
-                    geo=st.session_state.selected_country,
-                    timeframe=st.session_state.selected_timeframe
-                )
-                
-                # Enriquecer con breakout_score para comparación
-                if related_data.get("success"):
-                    # Enriquecer queries
-                    queries = related_data.get("queries", {})
-                    if queries.get("rising"):
-                        queries["rising"] = related_module.enrich_with_breakout_scores(
-                            queries["rising"], is_topic=False
-                        )
-                    
-                    # Enriquecer topics
-                    topics = related_data.get("topics", {})
-                    if topics.get("rising"):
-                        topics["rising"] = related_module.enrich_with_breakout_scores(
-                            topics["rising"], is_topic=True
-                        )
-                    
-                    # Enriquecer con volúmenes REALES de Google Ads (si disponible)
-                    try:
-                        from modules.google_ads import get_google_ads
-                        google_ads = get_google_ads()
-                        if google_ads:
-                            # Enriquecer rising queries con volúmenes reales
-                            if queries.get("rising"):
-                                queries["rising"] = google_ads.enrich_related_queries(
-                                    queries["rising"],
-                                    geo=st.session_state.selected_country
-                                )
-                            # Enriquecer top queries
-                            if queries.get("top"):
-                                queries["top"] = google_ads.enrich_related_queries(
-                                    queries["top"],
-                                    geo=st.session_state.selected_country
-                                )
-                            st.session_state["has_real_volumes"] = True
-                        else:
-                            st.session_state["has_real_volumes"] = False
-                    except Exception:
-                        st.session_state["has_real_volumes"] = False
-                        
-            except Exception as e:
-                related_data = {"success": False, "queries": {"rising": [], "top": []}, "topics": {"rising": [], "top": []}}
+    # === FUENTES SECUNDARIAS EN SEGUNDO PLANO ===
+    # Productos, YouTube, Perplexity y AliExpress son independientes entre sí
+    # y del resto de la página: se lanzan a la vez y cada panel recoge su resultado.
+    from modules.youtube import check_youtube_config
+    from modules.market_intelligence import get_market_intelligence, check_perplexity_config
+    from modules.aliexpress import check_aliexpress_config
 
-    # Obtener PAA expandido
-    if using_cache and cached_paa_data and cached_questions is not None:
-        paa_data = cached_paa_data
-        questions = cached_questions
+    if "products" in last_background:
+        product_future = completed_future(last_background["products"])
     else:
-        if not using_cache:
-            update_progress("paa")
-        with st.spinner("❓ Buscando preguntas frecuentes..."):
-            try:
-                paa_data = paa_module.categorize_searches(
-                    keyword=keyword,
-                    country=st.session_state.selected_country
-                )
-            except Exception as e:
-                paa_data = {"success": False, "categorized": {"all": [], "questions": [], "comparatives": [], "others": []}}
-
-            try:
-                expanded_questions = paa_module.get_expanded_questions(
-                    keyword=keyword,
-                    country=st.session_state.selected_country,
-                    max_depth=2,
-                    max_questions=25
-                )
-                questions = expanded_questions.get("questions", [])
-            except Exception as e:
-                questions = []
-
-    # Calcular scores (manejando valores cero)
-    try:
-        trend_score = scoring_engine.calculate_trend_score(
-            timeline_data=timeline_data,
-            related_queries_count=len(related_data.get("queries", {}).get("rising", []))
+        product_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_product_analysis,
+            refresh=force_refresh,
+            # Combinar queries rising y top para detección
+            brand=keyword,
+            related_queries=dedupe_queries(chain(rising_queries, top_queries)),
+            geo=opts.geo,
+            timeframe=opts.timeframe
         )
-    except Exception:
-        trend_score = {"score": 0, "grade": "F", "factors": {}}
 
-    try:
-        potential_score = scoring_engine.calculate_potential_score(
-            timeline_data=timeline_data,
-            rising_queries=related_data.get("queries", {}).get("rising", []),
-            current_value=growth_data.get("current_value", 0),
-            is_seasonal=seasonality_data.get("is_seasonal", False)
+    yt_config = check_youtube_config()
+    youtube_future = None
+    if yt_config.get("has_key") and "youtube" in last_background:
+        youtube_future = completed_future(last_background["youtube"])
+    elif yt_config.get("has_key"):
+        youtube_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_youtube_deep_dive,
+            refresh=force_refresh,
+            brand=keyword,
+            geo=opts.geo
         )
-    except Exception:
-        potential_score = {"score": 0, "grade": "F", "factors": {}}
 
-    try:
-        opportunity = scoring_engine.calculate_opportunity_level(
-            trend_score=trend_score.get("score", 0),
-            potential_score=potential_score.get("score", 0)
+    pplx_config = check_perplexity_config()
+    # Perplexity es de pago y lento: solo se consulta cuando el usuario lo
+    # pide para esta búsqueda desde su panel
+    market_requested = st.session_state.get("_market_requested") == run_key
+    product_intel_future = None
+    market_future = None
+    reused_market = reusable_futures(last_background, "product_intel", "market")
+    if pplx_config.get("configured") and reused_market:
+        product_intel_future, market_future = reused_market
+    elif pplx_config.get("configured") and market_requested and get_market_intelligence():
+        # Análisis completo del producto/marca y de mercado, en paralelo
+        product_intel_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_product_intelligence,
+            refresh=force_refresh,
+            product_name=keyword
+        )
+        market_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_market_analysis,
+            refresh=force_refresh,
+            brand=keyword,
+            geo=get_country_name(opts.geo)
         )
-    except Exception:
-        opportunity = {"level": "MUY BAJA", "combined_score": 0, "color": "#EF4444", "icon": "❄️", "action": "No prioritario"}
 
-    # === LAYOUT PRINCIPAL ===
-    
-    # Limpiar indicador de progreso
-    if not using_cache and progress_container is not None:
-        progress_container.empty()
+    ali_config = check_aliexpress_config()
+    ali_configured = ali_config["has_key"] and ali_config["has_secret"]
+    aliexpress_future = None
+    if ali_configured and "aliexpress" in last_background:
+        aliexpress_future = completed_future(last_background["aliexpress"])
+    elif ali_configured:
+        aliexpress_future = run_in_background(
+            fetch_cached,
+            cached_func=cached_aliexpress_products,
+            refresh=force_refresh,
+            keyword=keyword
+        )
 
     # === RESUMEN EJECUTIVO ===
     with st.expander("📋 **Resumen Ejecutivo**", expanded=True):
-        col_sum1, col_sum2, col_sum3, col_sum4 = st.columns(4)
-        with col_sum1:
-            ts = trend_score.get("score", 0)
-            ts_color = "#10B981" if ts >= 70 else "#F59E0B" if ts >= 40 else "#EF4444"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 8px;">
-                <div style="font-size: 0.8rem; color: #6B7280;">Trend Score</div>
-                <div style="font-size: 1.8rem; font-weight: 700; color: {ts_color};">{ts}</div>
-                <div style="font-size: 0.75rem; color: #9CA3AF;">{trend_score.get('grade', 'F')}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_sum2:
-            ps = potential_score.get("score", 0)
-            ps_color = "#10B981" if ps >= 70 else "#F59E0B" if ps >= 40 else "#EF4444"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 8px;">
-                <div style="font-size: 0.8rem; color: #6B7280;">Potential</div>
-                <div style="font-size: 1.8rem; font-weight: 700; color: {ps_color};">{ps}</div>
-                <div style="font-size: 0.75rem; color: #9CA3AF;">{potential_score.get('grade', 'F')}</div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_sum3:
-            st.markdown(f"""
-            <div style="text-align: center; padding: 8px;">
-                <div style="font-size: 0.8rem; color: #6B7280;">Oportunidad</div>
-                <div style="font-size: 1.5rem; font-weight: 600; color: {opportunity.get('color', '#6B7280')};">
-                    {opportunity.get('icon', '📊')} {opportunity.get('level', 'N/A')}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        with col_sum4:
-            growth_pct = growth_data.get("pct_change", 0) if growth_data else 0
-            growth_icon = "📈" if growth_pct > 0 else "📉" if growth_pct < 0 else "➡️"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 8px;">
-                <div style="font-size: 0.8rem; color: #6B7280;">Crecimiento</div>
-                <div style="font-size: 1.5rem; font-weight: 600;">{growth_icon} {growth_pct:+.1f}%</div>
-                <div style="font-size: 0.75rem; color: #9CA3AF;">vs periodo anterior</div>
-            </div>
-            """, unsafe_allow_html=True)
+        # Las cuatro métricas en un solo bloque (rejilla .summary-metrics)
+        ts = trend_score.get("score", 0)
+        ps = potential_score.get("score", 0)
+        growth_pct = growth_data.get("pct_change", 0) if growth_data else 0
+        growth_icon = "📈" if growth_pct > 0 else "📉" if growth_pct < 0 else "➡️"
+        summary_cards = "".join((
+            summary_metric_html(
+                "Trend Score", ts, trend_score.get('grade', 'F'),
+                color=score_color(ts), is_score=True
+            ),
+            summary_metric_html(
+                "Potential", ps, potential_score.get('grade', 'F'),
+                color=score_color(ps), is_score=True
+            ),
+            summary_metric_html(
+                "Oportunidad",
+                f"{opportunity.get('icon', '📊')} {opportunity.get('level', 'N/A')}",
+                color=opportunity.get('color', '#6B7280')
+            ),
+            summary_metric_html(
+                "Crecimiento", f"{growth_icon} {growth_pct:+.1f}%", "vs periodo anterior"
+            )
+        ))
+        st.markdown(f'<div class="summary-metrics">{summary_cards}</div>', unsafe_allow_html=True)
         
         # Recomendación principal
         st.markdown(f"""
@@ -745,10 +1620,10 @@ def main():
     render_trend_chart(
         timeline_data=timeline_data,
         keyword=keyword,
-        show_trajectory=st.session_state.get("show_trajectory", True),
-        api_key=st.secrets.get("SERPAPI_KEY", ""),
-        geo=st.session_state.selected_country,
-        show_volume_estimate=st.session_state.get("show_volume_estimate", True)
+        show_trajectory=opts.show_trajectory,
+        api_key=serpapi_key,
+        geo=opts.geo,
+        show_volume_estimate=opts.show_volume
     )
 
     # Fila 2: Scores y Estacionalidad
@@ -777,14 +1652,13 @@ def main():
     with col_season:
         # Explicación IA de estacionalidad
         ai_explanation = None
-        if ai_analyzer.get_available_providers():
+        if analysis_future is not None:
+            # Un único plazo de espera: el bloque de Análisis IA lee este
+            # mismo desenlace (resultado, error o timeout) sin volver a esperar
+            analysis_future = settle_future(analysis_future, "🤖 Generando explicación...")
             try:
-                with st.spinner("🤖 Generando explicación..."):
-                    ai_explanation = ai_analyzer.explain_seasonality(
-                        seasonality_data=seasonality_data,
-                        brand=keyword,
-                        provider=st.session_state.ai_provider
-                    )
+                ai_result = analysis_future.result()
+                ai_explanation = ai_result.get("seasonality_explanation")
             except Exception:
                 ai_explanation = None
 
@@ -793,44 +1667,34 @@ def main():
             ai_explanation=ai_explanation
         )
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 3: Related Queries y Topics
     col_queries, col_topics = st.columns(2)
 
     with col_queries:
         render_related_queries(
-            related_data.get("queries", {}),
-            country=st.session_state.selected_country,
+            queries_data,
+            country=opts.geo,
             has_real_volumes=st.session_state.get("has_real_volumes", False)
         )
 
     with col_topics:
         render_related_topics(related_data.get("topics", {}))
 
-    st.markdown("---")
-
-    # Fila 4: Análisis de Productos de la Marca
-    with st.spinner("🏷️ Analizando productos de la marca..."):
-        try:
-            # Combinar queries rising y top para detección
-            all_related_queries = (
-                related_data.get("queries", {}).get("rising", []) +
-                related_data.get("queries", {}).get("top", [])
-            )
+    st.divider()
 
-            product_analysis = product_analyzer.full_analysis(
-                brand=keyword,
-                related_queries=all_related_queries,
-                geo=st.session_state.selected_country,
-                timeframe=st.session_state.selected_timeframe
-            )
-        except Exception as e:
-            product_analysis = {"success": False, "products": [], "classified": {}, "insights": {}}
+    # Fila 4: Análisis de Productos de la Marca
+    product_analysis = safe_call(
+        wait_for_result,
+        product_future,
+        "🏷️ Analizando productos de la marca...",
+        default=EMPTY_PRODUCT_ANALYSIS
+    )
 
     render_product_section(product_analysis, keyword)
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 4.5: Social Media Intelligence (YouTube Deep Dive)
     with st.expander("📺 YouTube Deep Dive", expanded=False):
@@ -840,8 +1704,8 @@ def main():
         tiktok_metrics = None
         social_metrics = None
 
-        # Verificar configuración de YouTube
-        yt_config = check_youtube_config()
+        from modules.social_score import get_social_score_calculator
+        from components.social_media_panel import render_social_media_section
 
         if not yt_config.get("configured"):
             st.info("""
@@ -857,29 +1721,22 @@ def main():
             2. Habilitar "YouTube Data API v3"
             3. Crear credenciales > API Key
             """)
-        else:
-            with st.spinner("🔍 Analizando YouTube (Deep Dive)..."):
-                try:
-                    yt_module = get_youtube_module()
-                    if yt_module:
-                        # Deep Dive Analysis (incluye sentimiento, marcas, idiomas)
-                        youtube_deep_dive = yt_module.deep_dive_analysis(
-                            brand=keyword,
-                            geo=st.session_state.selected_country,
-                            max_videos=50
-                        )
-                        
-                        # También obtener métricas básicas para compatibilidad
-                        if youtube_deep_dive and youtube_deep_dive.videos_by_type:
-                            youtube_data = youtube_deep_dive.videos_by_type
-                            youtube_metrics = yt_module.calculate_metrics(keyword, youtube_data)
-
-                        # Mostrar error de API si lo hubo
-                        if youtube_metrics and youtube_metrics.api_error:
-                            st.warning(f"⚠️ API: {youtube_metrics.api_error}")
+        elif youtube_future is not None:
+            try:
+                # Deep Dive Analysis (incluye sentimiento, marcas, idiomas)
+                youtube_result = wait_for_result(
+                    youtube_future, "🔍 Analizando YouTube (Deep Dive)..."
+                )
+                youtube_deep_dive = youtube_result["deep_dive"]
+                youtube_data = youtube_result["videos_by_type"]
+                youtube_metrics = youtube_result["metrics"]
 
-                except Exception as e:
-                    st.warning(f"Error consultando YouTube: {sanitize_html(str(e))}")
+                # Mostrar error de API si lo hubo
+                if youtube_metrics and youtube_metrics.api_error:
+                    st.warning(f"⚠️ API: {youtube_metrics.api_error}")
+
+            except Exception as e:
+                st.warning(f"Error consultando YouTube: {sanitize_html(str(e))}")
 
         # Renderizar Deep Dive si hay datos
         if youtube_deep_dive and youtube_deep_dive.total_videos_analyzed > 0:
@@ -900,7 +1757,7 @@ def main():
 
         # Calcular Social Score (funciona incluso sin datos)
         try:
-            current_index = growth_data.get("current_value", 0)
+            current_index = current_value
             calculator = get_social_score_calculator()
             social_metrics = calculator.calculate(
                 keyword=keyword,
@@ -924,14 +1781,14 @@ def main():
         except Exception as e:
             st.warning(f"Error calculando Social Score: {sanitize_html(str(e))}")
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 4.6: Market Intelligence (Perplexity)
     market_analysis = None
     product_intelligence = None
 
     with st.expander("🧠 Inteligencia de Mercado (Perplexity)", expanded=False):
-        pplx_config = check_perplexity_config()
+        from components.market_intelligence_panel import render_market_intelligence_panel
 
         if not pplx_config.get("configured"):
             st.info("""
@@ -950,73 +1807,62 @@ def main():
             - ⚔️ Análisis competitivo actualizado
             - 💡 Oportunidades y amenazas
             """)
-        else:
-            with st.spinner("Analizando mercado con Perplexity..."):
-                try:
-                    mi_module = get_market_intelligence()
-                    if mi_module:
-                        # Mapeo de códigos a nombres de país para Perplexity
-                        country_names = {
-                            "ES": "España",
-                            "PT": "Portugal",
-                            "FR": "Francia",
-                            "IT": "Italia",
-                            "DE": "Alemania"
-                        }
-                        geo_name = country_names.get(
-                            st.session_state.selected_country,
-                            st.session_state.selected_country
-                        )
-                        
-                        # Análisis completo del producto/marca
-                        product_intelligence = mi_module.analyze_product_complete(
-                            product_name=keyword,
-                            brand="",
-                            include_competitors=True
-                        )
-
-                        # Análisis de mercado
-                        market_analysis = mi_module.analyze_market(
-                            brand=keyword,
-                            category="tecnología",
-                            geo=geo_name
-                        )
-
-                        # Renderizar panel completo
-                        render_market_intelligence_panel(
-                            keyword=keyword,
-                            market_analysis=market_analysis,
-                            product_intelligence=product_intelligence
-                        )
+        elif market_future is None and not market_requested:
+            st.caption("El análisis con Perplexity consume créditos de API y se lanza bajo demanda.")
+            st.button(
+                "🧠 Analizar mercado con Perplexity",
+                key="market_request",
+                on_click=request_market_analysis,
+                args=(run_key,)
+            )
+        elif market_future is not None:
+            try:
+                product_intelligence = wait_for_result(
+                    product_intel_future, "Analizando mercado con Perplexity..."
+                )["result"]
+                market_analysis = wait_for_result(
+                    market_future, "Analizando mercado con Perplexity..."
+                )["result"]
+
+                # Renderizar panel completo
+                render_market_intelligence_panel(
+                    keyword=keyword,
+                    market_analysis=market_analysis,
+                    product_intelligence=product_intelligence
+                )
 
-                except Exception as e:
-                    st.warning(f"Error en análisis de mercado: {sanitize_html(str(e))}")
+            except Exception as e:
+                st.warning(f"Error en análisis de mercado: {sanitize_html(str(e))}")
+        else:
+            st.warning("No se pudo inicializar el módulo de Perplexity")
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 4.7: AliExpress (si está configurado)
-    ali_config = check_aliexpress_config()
-    if ali_config["has_key"] and ali_config["has_secret"]:
-        with st.expander("🛒 Datos de AliExpress", expanded=False):
-            with st.spinner("Consultando AliExpress..."):
-                try:
-                    ali_module = get_aliexpress_module()
-                    if ali_module:
-                        # Buscar productos
-                        ali_products = ali_module.search_products(keyword, max_results=50)
-                        ali_hotproducts = ali_module.get_hotproducts(keyword, max_results=20)
-
-                        # Calcular métricas
-                        ali_metrics = ali_module.calculate_metrics(keyword, ali_products)
+    from modules.aliexpress import get_aliexpress_module
+    from components.aliexpress_panel import render_aliexpress_panel, render_aliexpress_comparison
 
-                        # Renderizar panel
-                        render_aliexpress_panel(keyword, ali_products, ali_hotproducts, ali_metrics)
-
-                        # Comparativa con Google Trends
-                        current_index = growth_data.get("current_value", 0)
-                        render_aliexpress_comparison(keyword, current_index, ali_metrics)
-                except Exception as e:
-                    st.warning(f"No se pudo obtener datos de AliExpress: {sanitize_html(str(e))}")
+    if aliexpress_future is not None:
+        with st.expander("🛒 Datos de AliExpress", expanded=False):
+            try:
+                ali_module = get_aliexpress_module()
+                if ali_module:
+                    # Productos pedidos en segundo plano junto al resto de fuentes
+                    ali_result = wait_for_result(aliexpress_future, "Consultando AliExpress...")
+                    ali_products = ali_result["products"]
+                    ali_hotproducts = ali_result["hotproducts"]
+
+                    # Calcular métricas
+                    ali_metrics = ali_module.calculate_metrics(keyword, ali_products)
+
+                    # Renderizar panel
+                    render_aliexpress_panel(keyword, ali_products, ali_hotproducts, ali_metrics)
+
+                    # Comparativa con Google Trends
+                    current_index = current_value
+                    render_aliexpress_comparison(keyword, current_index, ali_metrics)
+            except Exception as e:
+                st.warning(f"No se pudo obtener datos de AliExpress: {sanitize_html(str(e))}")
     else:
         with st.expander("🛒 AliExpress (no configurado)", expanded=False):
             st.info("""
@@ -1031,7 +1877,7 @@ def main():
             Obtén tus credenciales en [AliExpress Open Platform](https://portals.aliexpress.com/)
             """)
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 5: Keywords y Preguntas
     col_keywords, col_questions = st.columns([2, 1])
@@ -1042,52 +1888,25 @@ def main():
     with col_questions:
         render_questions_panel(questions)
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 6: Análisis IA
-    if ai_analyzer.get_available_providers():
+    if analysis_future is not None:
         st.markdown("### 🤖 Análisis IA")
 
         try:
-            with st.spinner(f"Generando análisis con {st.session_state.ai_provider}..."):
-                # Preparar datos para el análisis
-                analysis_data = {
-                    "keyword": keyword,
-                    "current_value": growth_data.get("current_value", 0),
-                    "growth_rate": growth_data.get("growth_rate", 0),
-                    "trend_score": trend_score.get("score", 0),
-                    "potential_score": potential_score.get("score", 0),
-                    "is_seasonal": seasonality_data.get("is_seasonal", False),
-                    "rising_queries": related_data.get("queries", {}).get("rising", [])[:5],
-                    "questions": [q.get("question", "") for q in questions[:5] if isinstance(q, dict)]
-                }
-
-                ai_result = ai_analyzer.analyze(
-                    trend_data=analysis_data,
-                    provider=st.session_state.ai_provider
-                )
+            ai_result = wait_for_result(
+                analysis_future,
+                f"Generando análisis con {opts.ai_provider}..."
+            )
 
             if ai_result.get("success"):
                 # Análisis principal - sanitizar contenido de IA
-                analysis_text = sanitize_html(ai_result.get("analysis", "No se pudo generar el análisis"))
-                provider_name = sanitize_html(ai_result.get("provider", "IA"))
-
                 st.markdown(
-                    f'''
-                    <div style="background: linear-gradient(135deg, #EDE9FE 0%, #FFFFFF 100%);
-                    border-radius: 12px; padding: 24px; border-left: 4px solid #7C3AED;
-                    margin-bottom: 16px;">
-                        <div style="display: flex; align-items: center; gap: 8px; margin-bottom: 12px;">
-                            <span style="font-size: 1.25rem;">🧠</span>
-                            <span style="font-weight: 600; color: #5B21B6;">
-                                Análisis ({provider_name})
-                            </span>
-                        </div>
-                        <div style="color: #374151; line-height: 1.6;">
-                            {analysis_text}
-                        </div>
-                    </div>
-                    ''',
+                    render_ai_analysis_card(
+                        ai_result.get("analysis", "No se pudo generar el análisis"),
+                        ai_result.get("provider", "IA")
+                    ),
                     unsafe_allow_html=True
                 )
 
@@ -1096,39 +1915,35 @@ def main():
                 if blog_ideas:
                     st.markdown("#### 📝 Ideas para el blog")
 
-                    for i, idea in enumerate(blog_ideas[:5]):
-                        if not isinstance(idea, dict):
-                            continue
-                        titulo = sanitize_html(idea.get('titulo', f'Idea {i+1}'))
-                        with st.expander(f"💡 {titulo}"):
-                            enfoque = sanitize_html(idea.get('enfoque', 'N/A'))
-                            st.markdown(f"**Enfoque:** {enfoque}")
-                            keywords = idea.get('keywords_objetivo', [])
-                            if keywords and isinstance(keywords, list):
-                                keywords_safe = [sanitize_html(str(k)) for k in keywords[:10]]
-                                st.markdown(f"**Keywords:** {', '.join(keywords_safe)}")
+                    for idea in sanitize_blog_ideas(blog_ideas):
+                        with st.expander(f"💡 {idea['titulo']}"):
+                            st.markdown(f"**Enfoque:** {idea['enfoque']}")
+                            if idea["keywords"]:
+                                st.markdown(f"**Keywords:** {idea['keywords']}")
             else:
                 error_msg = sanitize_html(ai_result.get('error', 'Error desconocido'))
                 st.warning(f"No se pudo generar el análisis: {error_msg}")
+        except FutureTimeoutError:
+            st.warning(
+                f"El análisis IA no respondió en {AI_RESULT_TIMEOUT}s. "
+                "Vuelve a lanzar la búsqueda en unos segundos."
+            )
         except Exception as e:
+            logger.exception("Error en análisis IA para '%s'", keyword)
             st.warning(f"Error en análisis IA: {sanitize_html(str(e))}")
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 7: Noticias relacionadas
     st.markdown("### 📰 Noticias Relacionadas")
 
     try:
-        with st.spinner("Buscando noticias (local + inglés)..."):
-            news_data = news_module.search_news_multilang(
-                query=keyword,
-                country=st.session_state.selected_country,
-                include_english=True
-            )
+        if news_error is not None:
+            raise news_error
 
         if news_data.get("success") and news_data.get("news"):
             # Analizar sentimiento
-            sentiment = news_module.analyze_news_sentiment(news_data.get("news", []))
+            sentiment = mods.news.analyze_news_sentiment(news_data.get("news", []))
 
             render_news_panel(
                 news=news_data.get("news", []),
@@ -1139,52 +1954,47 @@ def main():
             )
         else:
             st.info(f"No se encontraron noticias recientes sobre '{keyword_display}'")
-    except Exception as e:
-        st.info(f"No se pudieron cargar las noticias")
+    except Exception:
+        logger.warning("No se pudieron cargar las noticias de '%s'", keyword, exc_info=True)
+        st.info("No se pudieron cargar las noticias")
 
-    st.markdown("---")
+    st.divider()
 
     # Fila 8: Comparativa por países
     st.markdown("### 🌍 Comparativa por países")
 
-    compare_countries = st.checkbox("Comparar con otros países", value=False)
-
-    if compare_countries:
-        try:
-            with st.spinner("Obteniendo datos por país..."):
-                country_data = trends_module.get_multi_country_data(
-                    keyword=keyword,
-                    countries=["ES", "PT", "FR", "IT", "DE"],
-                    timeframe=st.session_state.selected_timeframe
-                )
-
-            render_geo_comparison(
-                country_data=country_data.get("countries", {}),
-                keyword=keyword
-            )
+    render_country_comparison(
+        keyword=keyword,
+        opts=opts,
+        refresh=force_refresh
+    )
 
-            # Gráfico comparativo
-            render_comparison_chart(
-                data_by_country=country_data.get("countries", {}),
-                keyword=keyword
-            )
-        except Exception as e:
-            st.warning("No se pudieron cargar los datos de comparativa por países")
+    st.divider()
 
-    st.markdown("---")
+    # Resultados en segundo plano ya resueltos, para el próximo rerun
+    st.session_state["_last_background_key"] = background_key
+    st.session_state["_last_background"] = resolved_results({
+        "ai": analysis_future,
+        "products": product_future,
+        "youtube": youtube_future,
+        "product_intel": product_intel_future,
+        "market": market_future,
+        "aliexpress": aliexpress_future
+    })
 
     # === GUARDAR EN CACHÉ Y LOG DE BÚSQUEDA ===
     # Si no estamos usando caché y hay datos válidos, guardarlos
+    cache = get_cache()
     if cache and not using_cache and timeline_data:
         try:
             cache.save(
                 keyword=keyword,
-                country=st.session_state.selected_country,
-                timeframe=st.session_state.selected_timeframe,
+                country=opts.geo,
+                timeframe=opts.timeframe,
                 timeline_data=timeline_data,
                 related_data=related_data if related_data else None,
                 google_ads_data=None,
-                youtube_data=youtube_deep_dive.__dict__ if youtube_deep_dive and hasattr(youtube_deep_dive, '__dict__') else None,
+                youtube_data=youtube_deep_dive,
                 news_data=news_data.get("news") if news_data else None,
                 ai_analysis=ai_result,
                 trend_score=trend_score.get("score", 0) if trend_score else 0,
@@ -1194,7 +2004,7 @@ def main():
                     "questions": questions,
                     "growth_data": growth_data,
                     "seasonality_data": seasonality_data,
-                    "market_analysis": market_analysis.__dict__ if market_analysis and hasattr(market_analysis, '__dict__') else None,
+                    "market_analysis": market_analysis,
                 }
             )
             # Notificación de guardado exitoso
@@ -1204,16 +2014,17 @@ def main():
             pass
     
     # Registrar búsqueda en log (para trazabilidad)
+    # Solo cuando la búsqueda se ha ejecutado, no en cada rerun por widgets
     user_email = get_current_user_email()
-    if user_email and timeline_data:
+    if user_email and timeline_data and not reused_results:
         ts = trend_score.get("score", 0) if trend_score else 0
         ps = potential_score.get("score", 0) if potential_score else 0
         
         log_search(
             user_email=user_email,
             keyword=keyword,
-            country=st.session_state.selected_country,
-            timeframe=st.session_state.selected_timeframe,
+            country=opts.geo,
+            timeframe=opts.timeframe,
             trend_score=ts,
             potential_score=ps
         )
@@ -1221,174 +2032,134 @@ def main():
         # Añadir al historial de la sesión
         add_to_search_history(
             keyword=keyword,
-            country=st.session_state.selected_country,
+            country=opts.geo,
             trend_score=ts,
             potential_score=ps
         )
 
     # Fila 9: Exportar a PDF
-    st.markdown("### 📄 Exportar Informe")
+    render_export_section(keyword, opts, {
+        "timeline_data": timeline_data,
+        "related_data": related_data,
+        "paa_data": paa_data,
+        "news_data": news_data,
+        "youtube_deep_dive": youtube_deep_dive,
+        "trend_score": trend_score,
+        "potential_score": potential_score,
+        "growth_data": growth_data,
+        "growth_rate": growth_rate,
+        "current_value": current_value,
+        "seasonality_data": seasonality_data,
+        "rising_queries": rising_queries,
+        "top_queries": top_queries,
+        "market_analysis": market_analysis,
+        "product_intelligence": product_intelligence
+    })
 
-    col_pdf1, col_pdf2, col_pdf3 = st.columns([1, 2, 1])
 
-    with col_pdf2:
-        if st.button("📥 Descargar Informe PDF", type="primary", use_container_width=True):
-            with st.spinner("Generando informe PDF..."):
-                try:
-                    # Extraer valores del timeline (formato correcto de SerpAPI)
-                    trend_values = []
-                    trend_dates = []
-                    if timeline_data:
-                        for point in timeline_data:
-                            # Extraer fecha
-                            date_str = point.get("date", "")
-                            trend_dates.append(date_str)
-                            
-                            # Extraer valor (formato SerpAPI: values[0].extracted_value)
-                            values = point.get("values", [])
-                            if values and len(values) > 0:
-                                val = values[0].get("extracted_value", 0)
-                                trend_values.append(int(val) if val else 0)
-                            else:
-                                trend_values.append(0)
-                    
-                    # Preparar datos para el PDF
-                    pdf_data = {
-                        "trend_score": trend_score.get("score", 0),
-                        "potential_score": potential_score.get("score", 0),
-                        "growth_rate": growth_data.get("growth_rate", 0),
-                        "current_value": growth_data.get("current_value", 0),
-                        "trend_values": trend_values,
-                        "trend_dates": trend_dates,
-                        "growth_data": growth_data,
-                        "seasonality_data": seasonality_data,
-                        "rising_queries": related_data.get("queries", {}).get("rising", []),
-                        "top_queries": related_data.get("queries", {}).get("top", []),
-                        "products": [],
-                        "ai_recommendation": ""
-                    }
+def main():
+    """Función principal de la aplicación"""
 
-                    # Añadir datos de Market Intelligence si existen
-                    if market_analysis or product_intelligence:
-                        intel_data = get_intelligence_for_pdf(market_analysis, product_intelligence)
-                        pdf_data["market_intelligence"] = intel_data.get("market_intelligence", {})
-                        pdf_data["sentiment_data"] = intel_data.get("sentiment_data", {})
+    # Inicializar
+    load_css()
+    
+    # Verificar autenticación por email
+    if not render_email_login():
+        st.stop()
+    
+    init_session_state()
 
-                    # Generar PDF
-                    pdf_bytes = generate_trend_report(keyword, pdf_data)
-                    
-                    # Guardar en session_state para envío por email
-                    st.session_state["last_pdf_bytes"] = pdf_bytes
-                    st.session_state["last_pdf_keyword"] = keyword
+    # Sidebar
+    with st.sidebar:
+        render_logo()
+        
+        # Badge del usuario logueado
+        render_user_badge()
+        
+        # Uso de APIs en la sesión
+        render_api_usage_badge()
+        
+        # Botón de logout
+        render_logout_button()
+        
+        st.divider()
+        
+        # Historial de búsquedas recientes
+        history_selected = render_search_history()
+        if history_selected:
+            st.session_state["prefill_keyword"] = history_selected
 
-                    # Botón de descarga
-                    st.download_button(
-                        label="💾 Guardar PDF",
-                        data=pdf_bytes,
-                        file_name=f"trend_report_{keyword.replace(' ', '_')}_{st.session_state.selected_country}.pdf",
-                        mime="application/pdf",
-                        use_container_width=True
-                    )
+        # Selector de modo
+        st.markdown("#### 🎯 Modo de Análisis")
+        mode = st.radio(
+            "Selecciona modo",
+            options=list(MODE_LABELS),
+            format_func=MODE_LABELS.get,
+            label_visibility="collapsed",
+            key="analysis_mode"
+        )
 
-                    st.success("✅ Informe generado correctamente")
+        st.divider()
 
-                except Exception as e:
-                    st.error(f"Error generando PDF: {sanitize_html(str(e))}")
+        # Selector de IA
+        st.markdown("#### 🤖 Proveedor IA")
+        # Se consulta el analizador compartido: crear uno nuevo en cada rerun
+        # reinstanciaría todos los clientes de IA solo para leer su estado
+        ai_provider = render_provider_selector(get_modules().ai)
+        st.session_state.ai_provider = ai_provider
 
-        st.caption("El informe incluye: tendencias, scores, búsquedas relacionadas, estacionalidad e inteligencia de mercado (si Perplexity está configurado).")
-        
-        # Botón de exportar a Excel
-        st.markdown("---")
-        if st.button("📊 Descargar Excel (datos completos)", use_container_width=True):
-            with st.spinner("Generando Excel..."):
-                try:
-                    from modules.excel_report import generate_excel_report, get_excel_filename
-                    
-                    excel_bytes = generate_excel_report(
-                        keyword=keyword,
-                        country=st.session_state.selected_country,
-                        timeline_data=timeline_data,
-                        related_data=related_data,
-                        trend_score=trend_score,
-                        potential_score=potential_score,
-                        growth_data=growth_data,
-                        seasonality_data=seasonality_data,
-                        youtube_data=youtube_deep_dive,
-                        news_data=news_data.get("news") if news_data else None,
-                        paa_data=paa_data
-                    )
-                    
-                    filename = get_excel_filename(keyword, st.session_state.selected_country)
-                    
-                    st.download_button(
-                        label="💾 Guardar Excel",
-                        data=excel_bytes,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        use_container_width=True
-                    )
-                    st.success("✅ Excel generado con múltiples hojas de datos")
-                    
-                except Exception as e:
-                    st.error(f"Error generando Excel: {sanitize_html(str(e))}")
-        
-        st.caption("📊 El Excel incluye hojas separadas: Resumen, Tendencia, Queries, Topics, YouTube, Noticias, PAA y Factores de Score.")
+        st.divider()
+
+        # Estado de APIs
+        render_api_status()
         
-        # Export JSON para integraciones
-        st.markdown("---")
-        if st.button("🔗 Descargar JSON (para APIs)", use_container_width=True):
-            import json
-            from datetime import datetime
-            
-            # Preparar datos para export
-            json_export = {
-                "metadata": {
-                    "keyword": keyword,
-                    "country": st.session_state.selected_country,
-                    "timeframe": st.session_state.selected_timeframe,
-                    "generated_at": datetime.now().isoformat(),
-                    "version": "1.0"
-                },
-                "scores": {
-                    "trend_score": trend_score.get("score", 0) if trend_score else 0,
-                    "trend_grade": trend_score.get("grade", "F") if trend_score else "F",
-                    "potential_score": potential_score.get("score", 0) if potential_score else 0,
-                    "potential_grade": potential_score.get("grade", "F") if potential_score else "F",
-                },
-                "growth": {
-                    "rate_3m": growth_data.get("growth_rate_3m", 0) if growth_data else 0,
-                    "rate_12m": growth_data.get("growth_rate_12m", 0) if growth_data else 0,
-                    "current_vs_max": growth_data.get("current_vs_max", 0) if growth_data else 0,
-                },
-                "timeline": timeline_data[:12] if timeline_data else [],  # Últimos 12 puntos
-                "related_queries": {
-                    "rising": (related_data.get("queries", {}).get("rising", [])[:10] 
-                              if related_data else []),
-                    "top": (related_data.get("queries", {}).get("top", [])[:10]
-                           if related_data else [])
-                }
-            }
-            
-            json_str = json.dumps(json_export, indent=2, ensure_ascii=False, default=str)
-            
-            st.download_button(
-                label="💾 Guardar JSON",
-                data=json_str,
-                file_name=f"abra_{keyword.lower().replace(' ', '_')}_{st.session_state.selected_country}.json",
-                mime="application/json",
-                use_container_width=True
-            )
-            st.success("✅ JSON listo para integración con otras herramientas")
+        # Estado de Caché
+        render_cache_status_sidebar()
         
-        st.caption("🔗 El JSON está optimizado para integración con dashboards, APIs y herramientas de BI.")
+        # Debug de caché (temporal)
+        with st.expander("🔧 Debug Caché", expanded=False):
+            render_cache_debug()
+
+        st.divider()
         
-        # Sección de envío por email (si hay PDF generado)
-        if st.session_state.get("last_pdf_bytes"):
-            with st.expander("📧 Enviar informe por email"):
-                render_email_form(
-                    keyword=st.session_state.get("last_pdf_keyword", keyword),
-                    pdf_bytes=st.session_state["last_pdf_bytes"]
-                )
+        # URL Analyzer (herramienta auxiliar)
+        with st.expander("🔗 Analizar URL", expanded=False):
+            st.caption("Pega una URL de producto para extraer su marca y tendencias")
+            from modules.url_analyzer import render_url_analyzer_form
+            render_url_analyzer_form()
+
+        st.divider()
+        st.markdown(SIDEBAR_FOOTER_HTML, unsafe_allow_html=True)
+
+    # Verificar API key
+    api_status = check_api_keys()
+    if not api_status["serpapi"]:
+        st.error("⚠️ SerpAPI no está configurada. Añade tu API key en los secrets.")
+        st.info("Ve a Settings > Secrets y añade: SERPAPI_KEY = 'tu_api_key'")
+        return
+
+    # Se lee una sola vez por rerun y se reutiliza en el resto de main()
+    serpapi_key = st.secrets.get("SERPAPI_KEY", "")
+    geo = st.session_state.get("selected_country", "ES")
+
+    # Renderizar según modo seleccionado
+    mode = st.session_state.get("analysis_mode", "deep_dive")
+
+    if mode == "scanner":
+        # Modo Scanner: análisis masivo de marcas
+        from components.brand_scanner import render_brand_scanner
+        render_brand_scanner(serpapi_key, geo)
+        return
+
+    elif mode == "quick":
+        # Modo Quick: ranking rápido
+        from components.brand_scanner import render_quick_ranking
+        render_quick_ranking(serpapi_key, geo)
+        return
+
+    # ===== MODO DEEP DIVE =====
+    # Contenido principal - análisis profundo de 1 marca
+    render_deep_dive(serpapi_key)
 
 
 if __name__ == "__main__":
@@ -3,32 +3,45 @@ Abra Trend Hunter - UI Components
 Componentes visuales reutilizables
 """
 
-from .trend_chart import render_trend_chart, render_mini_sparkline, render_trend_with_events
-from .seasonality import render_seasonality_panel, render_seasonality_heatmap
-from .score_cards import render_score_cards, render_opportunity_badge
-from .related_cards import render_related_queries, render_related_topics, render_trend_cards
-from .keyword_table import render_keyword_table, render_questions_panel
-from .geo_map import render_geo_comparison
-from .news_panel import render_news_panel, render_news_comparison, render_tech_news_section
-from .product_matrix import render_product_section, render_opportunity_matrix, render_product_ranking
-from .brand_scanner import render_brand_scanner, render_quick_ranking
-from .quick_compare import render_quick_compare, render_quick_compare_standalone
-from .aliexpress_panel import (
-    render_aliexpress_panel,
-    render_aliexpress_mini,
-    render_aliexpress_config,
-    render_aliexpress_comparison
-)
-from .youtube_panel import (
-    render_youtube_panel,
-    render_youtube_mini,
-    render_youtube_trends_comparison,
-    render_youtube_deep_dive
-)
-from .social_media_panel import (
-    render_social_media_section,
-    render_social_media_mini
-)
+import importlib
+
+# Los submódulos se importan bajo demanda (PEP 562): importar p. ej.
+# components.trend_chart no arrastra YouTube, AliExpress, etc.
+_LAZY_IMPORTS = {
+    "render_trend_chart": "trend_chart",
+    "render_mini_sparkline": "trend_chart",
+    "render_trend_with_events": "trend_chart",
+    "render_seasonality_panel": "seasonality",
+    "render_seasonality_heatmap": "seasonality",
+    "render_score_cards": "score_cards",
+    "render_opportunity_badge": "score_cards",
+    "render_related_queries": "related_cards",
+    "render_related_topics": "related_cards",
+    "render_trend_cards": "related_cards",
+    "render_keyword_table": "keyword_table",
+    "render_questions_panel": "keyword_table",
+    "render_geo_comparison": "geo_map",
+    "render_news_panel": "news_panel",
+    "render_news_comparison": "news_panel",
+    "render_tech_news_section": "news_panel",
+    "render_product_section": "product_matrix",
+    "render_opportunity_matrix": "product_matrix",
+    "render_product_ranking": "product_matrix",
+    "render_brand_scanner": "brand_scanner",
+    "render_quick_ranking": "brand_scanner",
+    "render_quick_compare": "quick_compare",
+    "render_quick_compare_standalone": "quick_compare",
+    "render_aliexpress_panel": "aliexpress_panel",
+    "render_aliexpress_mini": "aliexpress_panel",
+    "render_aliexpress_config": "aliexpress_panel",
+    "render_aliexpress_comparison": "aliexpress_panel",
+    "render_youtube_panel": "youtube_panel",
+    "render_youtube_mini": "youtube_panel",
+    "render_youtube_trends_comparison": "youtube_panel",
+    "render_youtube_deep_dive": "youtube_panel",
+    "render_social_media_section": "social_media_panel",
+    "render_social_media_mini": "social_media_panel",
+}
 
 __all__ = [
     'render_trend_chart',
@@ -62,3 +75,12 @@ __all__ = [
     'render_social_media_mini'
 ]
 
+
+def __getattr__(name: str):
+    """Importa el submódulo que define `name` la primera vez que se usa"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -11,6 +11,15 @@ from typing import List, Optional
 import pandas as pd
 
 
+# Etiquetas del selector de orden
+SORT_LABELS = {
+    "orders": "Más vendidos",
+    "price_asc": "Precio: menor a mayor",
+    "price_desc": "Precio: mayor a menor",
+    "rating": "Mejor valorados"
+}
+
+
 def render_aliexpress_panel(
     keyword: str,
     products: list,
@@ -156,6 +165,7 @@ def _render_hotproducts(products: list) -> None:
                 _render_product_card(product, show_rank=True, rank=idx + 1)
 
 
+@st.fragment
 def _render_product_grid(products: list) -> None:
     """Renderiza grid de productos"""
     if not products:
@@ -168,13 +178,8 @@ def _render_product_grid(products: list) -> None:
     with col1:
         sort_by = st.selectbox(
             "Ordenar por",
-            options=["orders", "price_asc", "price_desc", "rating"],
-            format_func=lambda x: {
-                "orders": "Más vendidos",
-                "price_asc": "Precio: menor a mayor",
-                "price_desc": "Precio: mayor a menor",
-                "rating": "Mejor valorados"
-            }.get(x)
+            options=list(SORT_LABELS),
+            format_func=SORT_LABELS.get
         )
 
     with col2:
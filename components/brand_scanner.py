@@ -13,6 +13,14 @@ import time
 from typing import List, Dict, Optional
 
 
+# Etiquetas del selector de período
+SCAN_TIMEFRAME_LABELS = {
+    "today 1-m": "Último mes",
+    "today 3-m": "Últimos 3 meses",
+    "today 12-m": "Último año"
+}
+
+
 def render_brand_scanner(api_key: str, geo: str = "ES") -> None:
     """
     Renderiza el modo Scanner para análisis rápido de marcas
@@ -73,12 +81,8 @@ def render_brand_scanner(api_key: str, geo: str = "ES") -> None:
     with col2:
         timeframe = st.selectbox(
             "Período",
-            options=["today 1-m", "today 3-m", "today 12-m"],
-            format_func=lambda x: {
-                "today 1-m": "Último mes",
-                "today 3-m": "Últimos 3 meses",
-                "today 12-m": "Último año"
-            }.get(x),
+            options=list(SCAN_TIMEFRAME_LABELS),
+            format_func=SCAN_TIMEFRAME_LABELS.get,
             index=2
         )
 
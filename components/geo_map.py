@@ -6,8 +6,11 @@ Visualización de interés por país (ES, PT, FR, IT, DE)
 import plotly.graph_objects as go
 import plotly.express as px
 import streamlit as st
+import numpy as np
 from typing import Dict
 
+from modules.google_trends import extract_timeline_series
+
 
 # Configuración de países
 COUNTRIES = {
@@ -47,23 +50,20 @@ def render_geo_comparison(
         if not timeline:
             continue
 
-        # Calcular valor promedio
-        values = []
-        for point in timeline:
-            if "values" in point and len(point["values"]) > 0:
-                val = point["values"][0].get("extracted_value", 0)
-                if val:
-                    values.append(float(val))
+        # Valores del timeline convertidos de una vez; los puntos sin valor
+        # o a 0 no cuentan para la media
+        values = np.asarray(extract_timeline_series(timeline)[1], dtype=np.float64)
+        values = values[values > 0]
 
-        if values:
-            avg_value = sum(values) / len(values)
-            current_value = values[-1] if values else 0
+        if values.size:
+            avg_value = float(values.mean())
+            current_value = float(values[-1])
 
             # Calcular crecimiento
-            if len(values) >= 4:
-                recent = sum(values[-2:]) / 2
-                previous = sum(values[:2]) / 2
-                growth = ((recent - previous) / previous * 100) if previous > 0 else 0
+            if values.size >= 4:
+                recent = values[-2:].mean()
+                previous = values[:2].mean()
+                growth = float((recent - previous) / previous * 100) if previous > 0 else 0
             else:
                 growth = 0
 
@@ -71,7 +71,7 @@ def render_geo_comparison(
                 "avg_value": avg_value,
                 "current_value": current_value,
                 "growth": growth,
-                "values": values
+                "values": values.tolist()
             }
 
     if not country_scores:
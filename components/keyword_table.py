@@ -9,6 +9,7 @@ import math
 from typing import List, Optional
 
 
+@st.fragment
 def render_keyword_table(
     categorized_data: dict,
     items_per_page: int = 30
@@ -133,7 +134,7 @@ def _render_keyword_grid(
         with col_prev:
             if st.button("← Anterior", disabled=current_page <= 1, key=f"prev_{key_prefix}"):
                 st.session_state[f"page_{key_prefix}"] = current_page - 1
-                st.rerun()
+                st.rerun(scope="fragment")
 
         with col_info:
             st.markdown(
@@ -145,7 +146,7 @@ def _render_keyword_grid(
         with col_next:
             if st.button("Próximo →", disabled=current_page >= total_pages, key=f"next_{key_prefix}"):
                 st.session_state[f"page_{key_prefix}"] = current_page + 1
-                st.rerun()
+                st.rerun(scope="fragment")
 
 
 def render_questions_panel(questions: list, show_depth: bool = True) -> None:
@@ -158,6 +158,7 @@ def render_product_section(
             pass  # Módulo no disponible
 
 
+@st.fragment
 def render_shopping_products(
     products: List[Dict],
     brand: str,
@@ -503,6 +504,7 @@ def render_opportunity_matrix(
     )
 
 
+@st.fragment
 def render_product_ranking(products: List, paginate: bool = False) -> None:
     """Renderiza el ranking de productos con sparklines y paginación opcional"""
 
@@ -743,6 +745,7 @@ def render_lifecycle_chart(products: List) -> None:
             )
 
 
+@st.fragment
 def render_product_comparison(products: List, brand: str) -> None:
     """Renderiza comparativa visual de productos"""
 
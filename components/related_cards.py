@@ -10,6 +10,7 @@ from typing import List, Optional
 
 # Importar funciones centralizadas de formateo
 from utils.formatting import format_volume, format_change
+from utils.countries import get_country_name
 
 
 def render_related_queries(
@@ -27,8 +28,7 @@ def render_related_queries(
         country: Código de país (ES, PT, FR, etc.)
         has_real_volumes: Si los datos incluyen volúmenes reales de Google Ads
     """
-    country_names = {"ES": "España", "PT": "Portugal", "FR": "Francia", "IT": "Italia", "DE": "Alemania"}
-    country_name = country_names.get(country, country)
+    country_name = get_country_name(country) if country else country
 
     st.markdown(f"#### 🔍 Búsquedas relacionadas ({country_name})")
     
@@ -8,6 +8,27 @@ import streamlit as st
 import math
 
 
+# Color de fondo de la tarjeta de oportunidad según nivel
+OPPORTUNITY_BG_COLORS = {
+    "ALTA": "#D1FAE5",
+    "MEDIA": "#FEF3C7",
+    "BAJA": "#F3F4F6",
+    "MUY BAJA": "#FEE2E2"
+}
+
+# Nombres legibles de los factores de scoring
+FACTOR_NAMES = {
+    "current_vs_avg": "Valor actual vs media",
+    "growth": "Crecimiento",
+    "momentum": "Momentum",
+    "consistency": "Consistencia",
+    "acceleration": "Aceleración",
+    "early_stage": "Etapa temprana",
+    "rising_queries": "Queries en crecimiento",
+    "growth_room": "Espacio de crecimiento"
+}
+
+
 def render_score_cards(
     trend_score: dict,
     potential_score: dict,
@@ -148,13 +169,7 @@ def _render_opportunity_card(opportunity: dict) -> None:
     combined_score = opportunity.get("combined_score", 0)
 
     # Determinar color de fondo
-    bg_colors = {
-        "ALTA": "#D1FAE5",
-        "MEDIA": "#FEF3C7",
-        "BAJA": "#F3F4F6",
-        "MUY BAJA": "#FEE2E2"
-    }
-    bg_color = bg_colors.get(level, "#F3F4F6")
+    bg_color = OPPORTUNITY_BG_COLORS.get(level, "#F3F4F6")
 
     st.markdown(
         f'''
@@ -213,19 +228,8 @@ def render_score_breakdown(
     """
     st.markdown(f"**{title}**")
 
-    factor_names = {
-        "current_vs_avg": "Valor actual vs media",
-        "growth": "Crecimiento",
-        "momentum": "Momentum",
-        "consistency": "Consistencia",
-        "acceleration": "Aceleración",
-        "early_stage": "Etapa temprana",
-        "rising_queries": "Queries en crecimiento",
-        "growth_room": "Espacio de crecimiento"
-    }
-
     for key, value in factors.items():
-        display_name = factor_names.get(key, key.replace("_", " ").title())
+        display_name = FACTOR_NAMES.get(key, key.replace("_", " ").title())
 
         # Barra de progreso
         st.markdown(
@@ -14,6 +14,35 @@ from typing import List, Tuple, Optional, Dict
 
 # Importar función de formateo centralizada
 from utils.formatting import format_volume
+from utils.validation import keyword_slug
+from utils.countries import get_country_name
+
+
+# Períodos de crecimiento y sus etiquetas
+GROWTH_PERIODS = {
+    "1m": timedelta(days=30),
+    "3m": timedelta(days=90),
+    "6m": timedelta(days=180),
+    "12m": timedelta(days=365),
+    "5y": timedelta(days=365*5)
+}
+
+GROWTH_PERIOD_LABELS = {
+    "1m": "1 Mes",
+    "3m": "3 Meses",
+    "6m": "6 Meses",
+    "12m": "1 Año",
+    "5y": "5 Años"
+}
+
+# Colores por país en el gráfico comparativo
+COUNTRY_COLORS = {
+    "ES": "#F5C518",  # Amarillo - España
+    "PT": "#10B981",  # Verde - Portugal
+    "FR": "#3B82F6",  # Azul - Francia
+    "IT": "#EF4444",  # Rojo - Italia
+    "DE": "#8B5CF6"   # Púrpura - Alemania
+}
 
 
 def calculate_multi_period_growth(values: List[float], dates: List[datetime]) -> Dict[str, float]:
@@ -38,16 +67,7 @@ def calculate_multi_period_growth(values: List[float], dates: List[datetime]) ->
     
     results = {}
     
-    # Definir períodos
-    periods = {
-        "1m": timedelta(days=30),
-        "3m": timedelta(days=90),
-        "6m": timedelta(days=180),
-        "12m": timedelta(days=365),
-        "5y": timedelta(days=365*5)
-    }
-    
-    for period_name, delta in periods.items():
+    for period_name, delta in GROWTH_PERIODS.items():
         target_date = now - delta
         
         # Encontrar el valor más cercano a esa fecha
@@ -84,15 +104,7 @@ def render_growth_metrics(growths: Dict[str, float]) -> None:
     """
     cols = st.columns(5)
     
-    period_labels = {
-        "1m": "1 Mes",
-        "3m": "3 Meses", 
-        "6m": "6 Meses",
-        "12m": "1 Año",
-        "5y": "5 Años"
-    }
-    
-    for i, (period, label) in enumerate(period_labels.items()):
+    for i, (period, label) in enumerate(GROWTH_PERIOD_LABELS.items()):
         growth = growths.get(period, 0)
         
         with cols[i]:
@@ -194,6 +206,17 @@ def parse_date_string(date_str: str, fallback_date: Optional[datetime] = None) -
     return fallback_date
 
 
+def _extract_point_value(point: dict) -> float:
+    """Extrae values[0].extracted_value de un punto (0 si no hay valor)"""
+    if "values" in point and len(point["values"]) > 0:
+        raw_val = point["values"][0].get("extracted_value", 0)
+        try:
+            return float(raw_val) if raw_val else 0
+        except (ValueError, TypeError):
+            return 0
+    return 0
+
+
 def extract_timeline_values(timeline_data: list) -> Tuple[List[datetime], List[float]]:
     """
     Extrae fechas y valores de timeline_data.
@@ -209,15 +232,6 @@ def extract_timeline_values(timeline_data: list) -> Tuple[List[datetime], List[f
     now = datetime.now()
     
     for i, point in enumerate(timeline_data):
-        # Extraer valor
-        val = 0
-        if "values" in point and len(point["values"]) > 0:
-            raw_val = point["values"][0].get("extracted_value", 0)
-            try:
-                val = float(raw_val) if raw_val else 0
-            except (ValueError, TypeError):
-                val = 0
-        
         # Extraer fecha
         date_str = point.get("date", "")
         weeks_back = len(timeline_data) - i - 1
@@ -226,117 +240,91 @@ def extract_timeline_values(timeline_data: list) -> Tuple[List[datetime], List[f
         date = parse_date_string(date_str, fallback)
         
         dates.append(date)
-        values.append(val)
+        values.append(_extract_point_value(point))
     
     return dates, values
 
 
-# =============================================================================
-# MAIN COMPONENT
-# =============================================================================
-
-def render_trend_chart(
-    timeline_data: list,
-    keyword: str,
-    show_trajectory: bool = True,
-    show_seasonality: bool = False,
-    height: int = 400,
-    api_key: str = None,
-    geo: str = "ES",
-    show_volume_estimate: bool = True,
-    show_predictions: bool = False
-) -> None:
+def timeline_to_frame(timeline_data: list) -> pd.DataFrame:
     """
-    Renderiza el gráfico principal de tendencia con volúmenes estimados.
-
+    Convierte timeline_data en un DataFrame columnar (date, value).
+    
+    Las fechas salen de los timestamps UNIX de SerpAPI en una única
+    conversión vectorizada; solo si falta alguno se parsean los textos
+    de fecha punto a punto.
+    
     Args:
-        timeline_data: Lista de datos de Google Trends
-        keyword: Palabra clave buscada
-        show_trajectory: Mostrar línea de tendencia suavizada
-        show_seasonality: Mostrar/ocultar efecto estacional
-        height: Altura del gráfico en pixels
-        api_key: API key de SerpAPI para estimar volúmenes
-        geo: Código de país
-        show_volume_estimate: Mostrar volúmenes estimados en lugar de índice
-        show_predictions: Mostrar predicciones futuras
+        timeline_data: Lista de puntos de Google Trends
+        
+    Returns:
+        DataFrame con columnas date y value
     """
-    if not timeline_data:
-        st.warning("No hay datos para mostrar")
-        return
+    timestamps = [point.get("timestamp") for point in timeline_data]
+    if timestamps and all(timestamps):
+        try:
+            dates = pd.to_datetime(np.array(timestamps, dtype=np.int64), unit="s")
+            values = np.fromiter(
+                (_extract_point_value(point) for point in timeline_data),
+                dtype=np.float64,
+                count=len(timeline_data)
+            )
+            return pd.DataFrame({"date": dates, "value": values})
+        except (ValueError, TypeError):
+            pass
 
-    # Extraer datos usando helper
     dates, values = extract_timeline_values(timeline_data)
+    return pd.DataFrame({"date": dates, "value": values})
 
-    if not values or all(v == 0 for v in values):
-        st.warning("No se pudieron procesar los datos")
-        return
-
-    df = pd.DataFrame({"date": dates, "value": values})
-    df = df.sort_values("date")
 
-    # Estimar volúmenes si tenemos API key
-    volume_data = None
-    if show_volume_estimate and api_key:
-        try:
-            from modules.search_volume import SearchVolumeEstimator
-            estimator = SearchVolumeEstimator(api_key)
-
-            current_index = int(df["value"].iloc[-1])
-            volume_estimate = estimator.estimate_volume(keyword, current_index, geo)
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_trend_figure(
+    dates: np.ndarray,
+    values: np.ndarray,
+    is_volume: bool,
+    show_trajectory: bool,
+    height: int
+) -> go.Figure:
+    """
+    Construye la figura Plotly del gráfico principal de tendencia.
 
-            if current_index > 0:
-                scale_factor = volume_estimate["estimated_volume"] / current_index
-            else:
-                scale_factor = volume_estimate["estimated_volume"] / 50
+    Cacheada con st.cache_data: los arrays se hashean por contenido y, en
+    los reruns, la figura se recupera del caché en lugar de rehacer las
+    trazas y el layout (la parte más lenta del componente).
 
-            df["volume"] = (df["value"] * scale_factor).astype(int)
-            volume_data = {
-                "current": volume_estimate,
-                "scale_factor": scale_factor
-            }
-        except Exception:
-            st.caption("⚠️ Usando índice de tendencia (0-100)")
-            volume_data = None
+    Args:
+        dates: Fechas ordenadas (datetime64)
+        values: Valores del eje Y (índice o volumen estimado)
+        is_volume: Si los valores son volúmenes estimados
+        show_trajectory: Añadir línea de trayectoria (media móvil)
+        height: Altura del gráfico en pixels
 
-    # Configurar columnas según datos disponibles
-    if volume_data and "volume" in df.columns:
-        y_col = "volume"
+    Returns:
+        Figura de Plotly
+    """
+    if is_volume:
         y_label = "Búsquedas/mes (est.)"
         hover_label = "Búsquedas"
         format_fn = format_volume
     else:
-        y_col = "value"
         y_label = "Índice Google Trends"
         hover_label = "Índice"
         format_fn = lambda v: f"{v:.0f}"
 
-    # Calcular métricas
-    current_value = df[y_col].iloc[-1]
-    avg_value = df[y_col].mean()
-    max_value = df[y_col].max()
-
-    # Calcular crecimiento
-    if len(df) >= 6:
-        recent_avg = df[y_col].tail(3).mean()
-        previous_avg = df[y_col].head(len(df) - 3).mean()
-        if previous_avg > 0:
-            growth = ((recent_avg - previous_avg) / previous_avg) * 100
-        else:
-            growth = 0
-    else:
-        growth = 0
+    df = pd.DataFrame({"date": pd.DatetimeIndex(dates), "value": values})
+    avg_value = df["value"].mean()
+    max_value = df["value"].max()
 
     # Crear figura
     fig = go.Figure()
 
     # Preparar texto de hover
     hover_texts = [f"<b>{d.strftime('%b %Y')}</b><br>{hover_label}: {format_fn(v)}"
-                   for d, v in zip(df["date"], df[y_col])]
+                   for d, v in zip(df["date"], df["value"])]
 
     # Área con gradiente
     fig.add_trace(go.Scatter(
         x=df["date"],
-        y=df[y_col],
+        y=df["value"],
         mode='lines',
         name=y_label,
         line=dict(color='#7C3AED', width=2),
@@ -349,11 +337,11 @@ def render_trend_chart(
     # Línea de trayectoria (media móvil)
     if show_trajectory and len(df) >= 6:
         window = min(6, len(df) // 3)
-        df["trajectory"] = df[y_col].rolling(window=window, center=True).mean()
+        trajectory = df["value"].rolling(window=window, center=True).mean()
 
         fig.add_trace(go.Scatter(
             x=df["date"],
-            y=df["trajectory"],
+            y=trajectory,
             mode='lines',
             name='Trayectoria',
             line=dict(color='#1A1A2E', width=3, dash='solid'),
@@ -398,9 +386,9 @@ def render_trend_chart(
         yaxis=dict(
             showgrid=True,
             gridcolor='rgba(0,0,0,0.05)',
-            title=y_label if volume_data else None,
+            title=y_label if is_volume else None,
             range=[0, max_value * 1.1],
-            tickformat=',.0f' if volume_data else None
+            tickformat=',.0f' if is_volume else None
         ),
         hovermode='x unified',
         showlegend=True,
@@ -411,12 +399,114 @@ def render_trend_chart(
             xanchor="right",
             x=1
         ),
-        margin=dict(l=60 if volume_data else 40, r=40, t=40, b=40),
+        margin=dict(l=60 if is_volume else 40, r=40, t=40, b=40),
         height=height,
         plot_bgcolor='white',
         paper_bgcolor='white'
     )
 
+    return fig
+
+
+# =============================================================================
+# MAIN COMPONENT
+# =============================================================================
+
+@st.fragment
+def render_trend_chart(
+    timeline_data: list,
+    keyword: str,
+    show_trajectory: bool = True,
+    show_seasonality: bool = False,
+    height: int = 400,
+    api_key: str = None,
+    geo: str = "ES",
+    show_volume_estimate: bool = True,
+    show_predictions: bool = False
+) -> None:
+    """
+    Renderiza el gráfico principal de tendencia con volúmenes estimados.
+
+    Args:
+        timeline_data: Lista de datos de Google Trends
+        keyword: Palabra clave buscada
+        show_trajectory: Mostrar línea de tendencia suavizada
+        show_seasonality: Mostrar/ocultar efecto estacional
+        height: Altura del gráfico en pixels
+        api_key: API key de SerpAPI para estimar volúmenes
+        geo: Código de país
+        show_volume_estimate: Mostrar volúmenes estimados en lugar de índice
+        show_predictions: Mostrar predicciones futuras
+    """
+    if not timeline_data:
+        st.warning("No hay datos para mostrar")
+        return
+
+    # Extraer datos en columnas (fechas y valores)
+    df = timeline_to_frame(timeline_data)
+
+    if df.empty or not df["value"].any():
+        st.warning("No se pudieron procesar los datos")
+        return
+
+    df = df.sort_values("date")
+
+    # Estimar volúmenes si tenemos API key
+    volume_data = None
+    if show_volume_estimate and api_key:
+        try:
+            from modules.search_volume import SearchVolumeEstimator
+            estimator = SearchVolumeEstimator(api_key)
+
+            current_index = int(df["value"].iloc[-1])
+            volume_estimate = estimator.estimate_volume(keyword, current_index, geo)
+
+            if current_index > 0:
+                scale_factor = volume_estimate["estimated_volume"] / current_index
+            else:
+                scale_factor = volume_estimate["estimated_volume"] / 50
+
+            df["volume"] = (df["value"] * scale_factor).astype(int)
+            volume_data = {
+                "current": volume_estimate,
+                "scale_factor": scale_factor
+            }
+        except Exception:
+            st.caption("⚠️ Usando índice de tendencia (0-100)")
+            volume_data = None
+
+    # Configurar columnas según datos disponibles
+    if volume_data and "volume" in df.columns:
+        y_col = "volume"
+        format_fn = format_volume
+    else:
+        y_col = "value"
+        format_fn = lambda v: f"{v:.0f}"
+
+    # Calcular métricas
+    current_value = df[y_col].iloc[-1]
+    avg_value = df[y_col].mean()
+
+    # Calcular crecimiento
+    if len(df) >= 6:
+        recent_avg = df[y_col].tail(3).mean()
+        previous_avg = df[y_col].head(len(df) - 3).mean()
+        if previous_avg > 0:
+            growth = ((recent_avg - previous_avg) / previous_avg) * 100
+        else:
+            growth = 0
+    else:
+        growth = 0
+
+    # Figura cacheada por datos y opciones (no se reconstruye en cada rerun)
+    fig = build_trend_figure(
+        dates=df["date"].to_numpy(),
+        values=df[y_col].to_numpy(),
+        is_volume=y_col == "volume",
+        show_trajectory=show_trajectory,
+        height=height
+    )
+
     # Métricas en header
     col1, col2, col3, col4 = st.columns(4)
 
@@ -497,7 +587,7 @@ def render_trend_chart(
         st.download_button(
             label="📥 Exportar",
             data=csv_data,
-            file_name=f"trend_{keyword}_{datetime.now().strftime('%Y%m%d')}.csv",
+            file_name=f"trend_{keyword_slug(keyword)}_{datetime.now().strftime('%Y%m%d')}.csv",
             mime="text/csv"
         )
 
@@ -570,22 +660,6 @@ def render_comparison_chart(
         st.warning("No hay datos para comparar")
         return
 
-    colors = {
-        "ES": "#F5C518",  # Amarillo - España
-        "PT": "#10B981",  # Verde - Portugal
-        "FR": "#3B82F6",  # Azul - Francia
-        "IT": "#EF4444",  # Rojo - Italia
-        "DE": "#8B5CF6"   # Púrpura - Alemania
-    }
-
-    country_names = {
-        "ES": "España",
-        "PT": "Portugal",
-        "FR": "Francia",
-        "IT": "Italia",
-        "DE": "Alemania"
-    }
-
     fig = go.Figure()
     has_data = False
 
@@ -648,9 +722,9 @@ def render_comparison_chart(
                 x=dates,
                 y=values,
                 mode='lines',
-                name=f"{country_names.get(country, country)}",
-                line=dict(color=colors.get(country, "#666"), width=2),
-                hovertemplate=f'<b>{country_names.get(country, country)}</b><br>%{{x|%b %Y}}: %{{y}}<extra></extra>'
+                name=get_country_name(country),
+                line=dict(color=COUNTRY_COLORS.get(country, "#666"), width=2),
+                hovertemplate=f'<b>{get_country_name(country)}</b><br>%{{x|%b %Y}}: %{{y}}<extra></extra>'
             ))
 
     if not has_data:
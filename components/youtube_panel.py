@@ -53,6 +53,7 @@ def render_language_selector(key: str = "yt_lang") -> str:
     return selected
 
 
+@st.fragment
 def render_youtube_deep_dive(
     keyword: str,
     deep_dive: Any,
@@ -3,18 +3,39 @@ Abra Trend Hunter - Data Modules
 Módulos independientes para cada fuente de datos
 """
 
-from .google_trends import GoogleTrendsModule
-from .related_queries import RelatedQueriesModule
-from .serp_paa import PeopleAlsoAskModule
-from .google_news import GoogleNewsModule
-from .product_analysis import ProductAnalyzer, ProductData, OpportunityCategory, LifecycleStage
-from .scoring import ScoringEngine
-from .ai_analysis import AIAnalyzer
-from .search_volume import SearchVolumeEstimator, estimate_from_trends_data
-from .aliexpress import AliExpressModule, check_aliexpress_config, get_aliexpress_module
-from .youtube import YouTubeModule, YouTubeVideo, YouTubeMetrics, check_youtube_config, get_youtube_module
-from .tiktok import TikTokModule, TikTokMetrics, check_tiktok_config, get_tiktok_module
-from .social_score import SocialScoreCalculator, SocialMetrics, get_social_score_calculator
+import importlib
+
+# Los submódulos se importan bajo demanda (PEP 562): importar p. ej.
+# modules.google_trends no arrastra YouTube, TikTok, AliExpress, etc.
+_LAZY_IMPORTS = {
+    "GoogleTrendsModule": "google_trends",
+    "RelatedQueriesModule": "related_queries",
+    "PeopleAlsoAskModule": "serp_paa",
+    "GoogleNewsModule": "google_news",
+    "ProductAnalyzer": "product_analysis",
+    "ProductData": "product_analysis",
+    "OpportunityCategory": "product_analysis",
+    "LifecycleStage": "product_analysis",
+    "ScoringEngine": "scoring",
+    "AIAnalyzer": "ai_analysis",
+    "SearchVolumeEstimator": "search_volume",
+    "estimate_from_trends_data": "search_volume",
+    "AliExpressModule": "aliexpress",
+    "check_aliexpress_config": "aliexpress",
+    "get_aliexpress_module": "aliexpress",
+    "YouTubeModule": "youtube",
+    "YouTubeVideo": "youtube",
+    "YouTubeMetrics": "youtube",
+    "check_youtube_config": "youtube",
+    "get_youtube_module": "youtube",
+    "TikTokModule": "tiktok",
+    "TikTokMetrics": "tiktok",
+    "check_tiktok_config": "tiktok",
+    "get_tiktok_module": "tiktok",
+    "SocialScoreCalculator": "social_score",
+    "SocialMetrics": "social_score",
+    "get_social_score_calculator": "social_score",
+}
 
 __all__ = [
     'GoogleTrendsModule',
@@ -46,3 +67,12 @@ __all__ = [
     'get_social_score_calculator'
 ]
 
+
+def __getattr__(name: str):
+    """Importa el submódulo que define `name` la primera vez que se usa"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
@@ -3,7 +3,7 @@ AI Analysis Module
 Orquestador que gestiona múltiples proveedores de IA
 """
 
-from typing import Optional, Literal
+from typing import Callable, Optional, Literal
 import streamlit as st
 
 from .providers import ClaudeProvider, OpenAIProvider, PerplexityProvider
@@ -11,6 +11,9 @@ from .providers import ClaudeProvider, OpenAIProvider, PerplexityProvider
 
 ProviderType = Literal["claude", "gpt4", "perplexity"]
 
+# Explicación fija para series sin estacionalidad (no requiere LLM)
+STABLE_SEASONALITY_TEXT = "El interés en {brand} es relativamente estable a lo largo del año, sin patrones estacionales marcados."
+
 
 class AIAnalyzer:
     """Orquestador de análisis con múltiples proveedores de IA"""
@@ -129,8 +132,72 @@ class AIAnalyzer:
             else:
                 return "No hay proveedores de IA configurados para generar explicación."
 
+        # Sin estacionalidad la explicación es fija: no hace falta llamar al LLM
+        if not seasonality_data.get("is_seasonal", False):
+            return STABLE_SEASONALITY_TEXT.format(brand=brand)
+
         return self.providers[provider].explain_seasonality(seasonality_data, brand)
 
+    def analyze_combined(
+        self,
+        trend_data: dict,
+        seasonality_data: dict,
+        brand: str,
+        provider: ProviderType = "claude",
+        seasonality_explainer: Optional[Callable[[dict, str, str], str]] = None
+    ) -> dict:
+        """
+        Análisis, explicación de estacionalidad e ideas de blog en una sola llamada
+
+        Pide al proveedor un único JSON con las tres partes. Si el proveedor
+        falla o la respuesta no se puede parsear, recurre a analyze() +
+        explain_seasonality() por separado.
+
+        Args:
+            trend_data: Diccionario con todos los datos de tendencia
+            seasonality_data: Resultado de calculate_seasonality
+            brand: Marca o término analizado
+            provider: Proveedor a usar (claude, gpt4, perplexity)
+            seasonality_explainer: Sustituto de explain_seasonality en el
+                fallback (p. ej. una versión cacheada), con su misma firma
+
+        Returns:
+            dict con análisis, seasonality_explanation, ideas de blog, etc.
+        """
+        if provider not in self.providers:
+            available = self.get_available_providers()
+            if available:
+                provider = available[0]
+            else:
+                return {
+                    "success": False,
+                    "error": "No hay proveedores de IA configurados"
+                }
+
+        selected_provider = self.providers[provider]
+        combined = selected_provider.analyze_combined(trend_data, seasonality_data, brand)
+
+        if not combined.get("success"):
+            result = self.analyze(trend_data, provider)
+            explain = seasonality_explainer or self.explain_seasonality
+            result["seasonality_explanation"] = explain(seasonality_data, brand, provider)
+            return result
+
+        explanation = combined.get("seasonality_explanation")
+        if not seasonality_data.get("is_seasonal", False):
+            explanation = STABLE_SEASONALITY_TEXT.format(brand=brand)
+        elif not explanation:
+            explanation = f"El interés en {brand} muestra un patrón estacional con picos en {seasonality_data.get('peak_month', 'ciertos meses')}."
+
+        return {
+            "success": True,
+            "analysis": combined.get("analysis", ""),
+            "seasonality_explanation": explanation,
+            "blog_ideas": combined.get("blog_ideas", []),
+            "provider": self.PROVIDER_NAMES.get(provider, provider),
+            "error": None
+        }
+
     def get_brand_context(
         self,
         brand: str,
@@ -163,12 +230,17 @@ class AIAnalyzer:
         }
 
 
-def render_provider_selector() -> str:
+def render_provider_selector(analyzer: Optional[AIAnalyzer] = None) -> str:
     """
     Renderiza un selector de proveedores de IA en Streamlit con info de costos
+
+    Args:
+        analyzer: Instancia compartida a consultar; si no se pasa se crea una
+            nueva (inicializa todos los clientes de IA)
+
     Returns: El proveedor seleccionado
     """
-    analyzer = AIAnalyzer()
+    analyzer = analyzer or AIAnalyzer()
     status = analyzer.get_provider_status()
 
     # Información de precios por proveedor (por 1M tokens, actualizado 2025)
@@ -19,6 +19,14 @@ from plotly.subplots import make_subplots
 import requests
 
 
+# Etiquetas del selector de modelo
+PROVIDER_LABELS = {
+    "claude": "Claude (Anthropic)",
+    "openai": "GPT-4 (OpenAI)",
+    "perplexity": "Perplexity"
+}
+
+
 @dataclass
 class ProductCluster:
     """Un cluster de productos identificado por IA"""
@@ -876,7 +884,7 @@ def render_ai_product_analysis(
         provider = st.selectbox(
             "Modelo de IA",
             available_providers,
-            format_func=lambda x: {"claude": "Claude (Anthropic)", "openai": "GPT-4 (OpenAI)", "perplexity": "Perplexity"}[x]
+            format_func=PROVIDER_LABELS.get
         )
     
     with col2:
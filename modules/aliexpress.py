@@ -6,6 +6,7 @@ Obtiene datos de productos, tendencias y hotproducts de AliExpress
 import streamlit as st
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
+from functools import lru_cache
 import html
 
 
@@ -66,6 +67,7 @@ class AliExpressModule:
         self.tracking_id = tracking_id
         self._api = None
         self._initialized = False
+        self._init_error = ""
 
     def _init_api(self) -> bool:
         """Inicializa la API de AliExpress"""
@@ -84,11 +86,11 @@ class AliExpressModule:
             self._initialized = True
             return True
         except ImportError:
-            st.warning("⚠️ Módulo python-aliexpress-api no instalado")
+            self._init_error = "Módulo python-aliexpress-api no instalado"
             self._initialized = True
             return False
         except Exception as e:
-            st.error(f"Error inicializando AliExpress API: {html.escape(str(e))}")
+            self._init_error = f"Error inicializando AliExpress API: {e}"
             self._initialized = True
             return False
 
@@ -112,9 +114,12 @@ class AliExpressModule:
 
         Returns:
             Lista de productos
+
+        Raises:
+            RuntimeError: Si la API no se pudo inicializar o la búsqueda falla
         """
         if not self._init_api():
-            return []
+            raise RuntimeError(self._init_error)
 
         try:
             # Construir parámetros
@@ -145,8 +150,9 @@ class AliExpressModule:
             return self._parse_products(response.products)
 
         except Exception as e:
-            st.error(f"Error buscando productos: {html.escape(str(e))}")
-            return []
+            # Se llama desde threads en segundo plano: el error se propaga
+            # y lo muestra quien pinta el panel
+            raise RuntimeError(f"Error buscando productos: {e}") from e
 
     def get_hotproducts(
         self,
@@ -164,9 +170,12 @@ class AliExpressModule:
 
         Returns:
             Lista de productos trending
+
+        Raises:
+            RuntimeError: Si la API no se pudo inicializar o la consulta falla
         """
         if not self._init_api():
-            return []
+            raise RuntimeError(self._init_error)
 
         try:
             params = {
@@ -185,8 +194,7 @@ class AliExpressModule:
             return self._parse_products(response.products)
 
         except Exception as e:
-            st.error(f"Error obteniendo hotproducts: {html.escape(str(e))}")
-            return []
+            raise RuntimeError(f"Error obteniendo hotproducts: {e}") from e
 
     def get_product_details(self, product_ids: List[str]) -> List[AliExpressProduct]:
         """
@@ -199,6 +207,7 @@ class AliExpressModule:
             Lista de productos con detalles
         """
         if not self._init_api():
+            st.error(html.escape(self._init_error))
             return []
 
         try:
@@ -419,8 +428,9 @@ def check_aliexpress_config() -> Dict[str, bool]:
     }
 
 
+@lru_cache(maxsize=1)
 def _check_module_installed() -> bool:
-    """Verifica si el módulo está instalado"""
+    """Verifica si el módulo está instalado (no cambia durante el proceso)"""
     try:
         import aliexpress_api
         return True
@@ -428,16 +438,36 @@ def _check_module_installed() -> bool:
         return False
 
 
+_aliexpress_instance = None
+
+
 def get_aliexpress_module() -> Optional[AliExpressModule]:
-    """Factory para obtener módulo configurado"""
+    """
+    Obtiene instancia singleton del módulo configurado
+
+    Se reutiliza entre reruns para no reconstruir el cliente de la API en
+    cada llamada; se recrea solo si cambian las credenciales.
+    """
+    global _aliexpress_instance
+
     config = check_aliexpress_config()
 
     if not config["has_key"] or not config["has_secret"]:
         return None
 
-    return AliExpressModule(
-        app_key=st.secrets.get("ALIEXPRESS_KEY", ""),
-        app_secret=st.secrets.get("ALIEXPRESS_SECRET", ""),
-        tracking_id=st.secrets.get("ALIEXPRESS_TRACKING_ID", "")
+    credentials = (
+        st.secrets.get("ALIEXPRESS_KEY", ""),
+        st.secrets.get("ALIEXPRESS_SECRET", ""),
+        st.secrets.get("ALIEXPRESS_TRACKING_ID", "")
     )
+    instance = _aliexpress_instance
+    if instance is None or (instance.app_key, instance.app_secret, instance.tracking_id) != credentials:
+        instance = AliExpressModule(
+            app_key=credentials[0],
+            app_secret=credentials[1],
+            tracking_id=credentials[2]
+        )
+        _aliexpress_instance = instance
+
+    return instance
 
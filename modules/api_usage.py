@@ -6,16 +6,14 @@ para control de costes en Supabase
 
 import streamlit as st
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from dataclasses import dataclass
 from enum import Enum
 
-# Intentar importar supabase
-try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
-except ImportError:
-    SUPABASE_AVAILABLE = False
+# supabase se importa al crear el cliente: cargarlo arrastra ~0.3s de
+# dependencias y este módulo lo importan Google Trends y los proveedores IA
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 class APIName(Enum):
@@ -72,19 +70,17 @@ class APIUsageRecord:
     error_message: Optional[str] = None
 
 
-def _get_supabase_client() -> Optional[Client]:
+def _get_supabase_client() -> Optional["Client"]:
     """Obtiene cliente de Supabase si está configurado"""
-    if not SUPABASE_AVAILABLE:
-        return None
-    
     try:
         url = st.secrets.get("SUPABASE_URL", "")
         key = st.secrets.get("SUPABASE_KEY", "")
         
         if url and key:
+            from supabase import create_client
             return create_client(url, key)
     except Exception:
-        pass
+        pass  # ImportError incluido: sin supabase no se registra el uso
     
     return None
 
@@ -328,7 +324,7 @@ def render_usage_badge() -> None:
     st.sidebar.markdown(f"**Total: €{total_cost:.4f}**")
 
 
-def get_monthly_costs(client: Optional[Client] = None) -> Optional[Dict[str, Any]]:
+def get_monthly_costs(client: Optional["Client"] = None) -> Optional[Dict[str, Any]]:
     """
     Obtiene costes del mes actual desde Supabase
     
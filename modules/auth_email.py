@@ -450,7 +450,7 @@ def render_api_usage_badge() -> None:
             cost_color = "#EF4444"
             cost_icon = "🔴"
         
-        st.markdown(f"""
+        header_html = f"""
         <div style="
             background: #F9FAFB;
             padding: 12px;
@@ -467,7 +467,7 @@ def render_api_usage_badge() -> None:
                 </span>
             </div>
             <div style="display: flex; gap: 8px; flex-wrap: wrap;">
-        """, unsafe_allow_html=True)
+        """
         
         api_icons = {
             "serpapi": "🔍",
@@ -486,7 +486,8 @@ def render_api_usage_badge() -> None:
                 f'{icon} {data["calls"]}{cached}</span>'
             )
         
-        st.markdown(" ".join(badges_html) + "</div></div>", unsafe_allow_html=True)
+        # Un solo bloque: los divs abiertos en la cabecera se cierran aquí
+        st.markdown(header_html + " ".join(badges_html) + "</div></div>", unsafe_allow_html=True)
     except Exception:
         pass  # Silenciar errores de logging
 
@@ -503,6 +504,9 @@ def render_logout_button() -> None:
                 del st.session_state["search_history"]
             if "api_usage_session" in st.session_state:
                 del st.session_state["api_usage_session"]
+            # Soltar los textos de la sesión retenidos en la caché de escapado
+            from utils import clear_sanitize_cache
+            clear_sanitize_cache()
             st.rerun()
 
 
@@ -600,21 +604,16 @@ def add_to_search_history(keyword: str, country: str, trend_score: int = 0, pote
         trend_score: Score de tendencia
         potential_score: Score de potencial
     """
-    if "search_history" not in st.session_state:
-        st.session_state["search_history"] = []
-    
-    # Añadir al historial
-    st.session_state["search_history"].append({
+    from utils import get_search_history
+
+    # Añadir al historial (acotado: descarta solo las más antiguas)
+    get_search_history().append({
         "keyword": keyword,
         "country": country,
         "trend_score": trend_score,
         "potential_score": potential_score,
         "timestamp": datetime.now().isoformat()
     })
-    
-    # Limitar a 20 búsquedas
-    if len(st.session_state["search_history"]) > 20:
-        st.session_state["search_history"] = st.session_state["search_history"][-20:]
 
 
 def get_current_user_email() -> Optional[str]:
@@ -7,7 +7,6 @@ Configuración en secrets.toml:
     SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
 """
 
-import json
 import streamlit as st
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -366,14 +365,28 @@ class TrendCache:
             return {"available": True, "error": str(e)[:50]}
     
     def _serialize(self, data: Any) -> Any:
-        """Serializa datos para guardar en JSONB"""
+        """
+        Serializa datos para guardar en JSONB
+
+        Recorre dicts y listas para convertir también los dataclasses y
+        datetimes anidados (p. ej. los vídeos de YouTubeDeepDive).
+        """
         if data is None:
             return None
         
-        # Si ya es serializable, devolverlo
-        if isinstance(data, (dict, list, str, int, float, bool)):
+        # Escalares ya serializables
+        if isinstance(data, (str, int, float, bool)):
             return data
         
+        if isinstance(data, dict):
+            return {k: self._serialize(v) for k, v in data.items()}
+        
+        if isinstance(data, (list, tuple)):
+            return [self._serialize(v) for v in data]
+        
+        if isinstance(data, datetime):
+            return data.isoformat()
+        
         # Si es dataclass, convertir a dict
         if hasattr(data, '__dataclass_fields__'):
             return self._dataclass_to_dict(data)
@@ -387,37 +400,14 @@ class TrendCache:
     
     def _dataclass_to_dict(self, obj) -> Dict:
         """Convierte dataclass a dict recursivamente"""
-        result = {}
-        for field_name in obj.__dataclass_fields__:
-            value = getattr(obj, field_name)
-            if hasattr(value, '__dataclass_fields__'):
-                result[field_name] = self._dataclass_to_dict(value)
-            elif isinstance(value, list):
-                result[field_name] = [
-                    self._dataclass_to_dict(v) if hasattr(v, '__dataclass_fields__') else v
-                    for v in value
-                ]
-            elif isinstance(value, datetime):
-                result[field_name] = value.isoformat()
-            else:
-                result[field_name] = value
-        return result
+        return {
+            field_name: self._serialize(getattr(obj, field_name))
+            for field_name in obj.__dataclass_fields__
+        }
     
     def _clean_dict(self, d: Dict) -> Dict:
-        """Limpia un dict para serialización"""
-        result = {}
-        for k, v in d.items():
-            if k.startswith('_'):
-                continue
-            if isinstance(v, datetime):
-                result[k] = v.isoformat()
-            elif isinstance(v, (dict, list, str, int, float, bool, type(None))):
-                result[k] = v
-            elif hasattr(v, '__dict__'):
-                result[k] = self._clean_dict(v.__dict__)
-            else:
-                result[k] = str(v)
-        return result
+        """Limpia un dict para serialización (omite atributos privados)"""
+        return {k: self._serialize(v) for k, v in d.items() if not k.startswith('_')}
 
 
 # =============================================================================
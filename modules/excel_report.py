@@ -9,6 +9,8 @@ from datetime import datetime
 from typing import Dict, Any, List, Optional
 import html
 
+from modules.google_trends import extract_timeline_series
+
 
 def generate_excel_report(
     keyword: str,
@@ -77,19 +79,13 @@ def generate_excel_report(
         
         # ========== HOJA 2: TENDENCIA TEMPORAL ==========
         if timeline_data:
-            timeline_rows = []
-            for point in timeline_data:
-                date = point.get("date", "")
-                values = point.get("values", [{}])
-                value = values[0].get("extracted_value", 0) if values else 0
-                timeline_rows.append({
-                    "Fecha": date,
-                    "Índice de Interés": value
-                })
-            
-            if timeline_rows:
-                timeline_df = pd.DataFrame(timeline_rows)
-                timeline_df.to_excel(writer, sheet_name="Tendencia", index=False)
+            # Fechas y valores extraídos de una vez (mismo lector que el PDF)
+            dates, values = extract_timeline_series(timeline_data)
+            timeline_df = pd.DataFrame({
+                "Fecha": dates,
+                "Índice de Interés": values
+            })
+            timeline_df.to_excel(writer, sheet_name="Tendencia", index=False)
         
         # ========== HOJA 3: QUERIES RELACIONADAS ==========
         if related_data and related_data.get("queries"):
@@ -14,6 +14,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 import json
 
+from utils.parallel import run_parallel
+
 
 @dataclass
 class KeywordMetrics:
@@ -88,6 +90,9 @@ LOCATION_IDS = {
     "MX": "2484",   # México
 }
 
+# GenerateKeywordIdeas admite como máximo 20 keywords semilla por petición
+MAX_SEED_KEYWORDS = 20
+
 # Mapeo de idiomas
 LANGUAGE_IDS = {
     "ES": "1003",   # Español
@@ -181,6 +186,40 @@ class GoogleAdsKeywordPlanner:
         if not self.is_available:
             return {}
         
+        # La API rechaza peticiones con más de MAX_SEED_KEYWORDS semillas:
+        # se trocea en lotes y se piden todos a la vez
+        batches = [
+            keywords[i:i + MAX_SEED_KEYWORDS]
+            for i in range(0, len(keywords), MAX_SEED_KEYWORDS)
+        ]
+        if len(batches) <= 1:
+            return self._request_keyword_volumes(keywords, geo, language)
+        
+        fetched = run_parallel({
+            str(i): (self._request_keyword_volumes, {
+                "keywords": batch,
+                "geo": geo,
+                "language": language
+            })
+            for i, batch in enumerate(batches)
+        })
+        
+        # Se combinan en el orden de los lotes
+        results = {}
+        for i in range(len(batches)):
+            batch_results = fetched[str(i)]
+            if isinstance(batch_results, dict):
+                results.update(batch_results)
+        
+        return results
+    
+    def _request_keyword_volumes(
+        self,
+        keywords: List[str],
+        geo: str,
+        language: Optional[str]
+    ) -> Dict[str, KeywordMetrics]:
+        """Una petición a GenerateKeywordIdeas (como máximo MAX_SEED_KEYWORDS keywords)"""
         try:
             # Obtener servicios
             keyword_plan_idea_service = self._client.get_service("KeywordPlanIdeaService")
@@ -359,33 +398,58 @@ class GoogleAdsKeywordPlanner:
         Returns:
             Lista enriquecida con 'real_volume', 'change_3m', 'change_12m'
         """
-        if not queries or not self.is_available:
-            return queries
+        return self.enrich_related_queries_batch({"queries": queries}, geo)["queries"]
+    
+    def enrich_related_queries_batch(
+        self,
+        groups: Dict[str, List[Dict]],
+        geo: str = "ES"
+    ) -> Dict[str, List[Dict]]:
+        """
+        Enriquece varias listas de queries (p. ej. rising y top) con una
+        sola consulta de volúmenes para todas ellas
         
-        # Extraer keywords
-        keywords = [q.get("query", "") for q in queries if q.get("query")]
+        Args:
+            groups: Dict nombre -> lista de queries (con 'query' key)
+            geo: Código de país
+        
+        Returns:
+            Dict con los mismos nombres y las listas enriquecidas con
+            'real_volume', 'change_3m', 'change_12m'
+        """
+        if not self.is_available:
+            return groups
+        
+        # Keywords de todos los grupos, sin repetir y en orden
+        keywords = list(dict.fromkeys(
+            q["query"] for queries in groups.values() for q in queries or [] if q.get("query")
+        ))
         
         if not keywords:
-            return queries
+            return groups
+        
+        # Obtener volúmenes (get_keyword_volumes trocea según el límite de la API)
+        volumes = self.get_keyword_volumes(keywords, geo)
         
-        # Obtener volúmenes (máximo 200 por llamada)
-        volumes = {}
-        for i in range(0, len(keywords), 200):
-            batch = keywords[i:i+200]
-            batch_volumes = self.get_keyword_volumes(batch, geo)
-            volumes.update(batch_volumes)
+        # Índice por keyword en minúsculas (gana la primera, como en la API)
+        volumes_by_text = {}
+        for k, v in volumes.items():
+            volumes_by_text.setdefault(k.lower(), v)
         
-        # Enriquecer queries
+        return {
+            name: self._enrich_with_volumes(queries, volumes_by_text) if queries else queries
+            for name, queries in groups.items()
+        }
+    
+    def _enrich_with_volumes(
+        self,
+        queries: List[Dict],
+        volumes_by_text: Dict[str, KeywordMetrics]
+    ) -> List[Dict]:
+        """Copia las queries añadiendo las métricas de volumes_by_text"""
         enriched = []
         for q in queries:
-            query_text = q.get("query", "").lower()
-            
-            # Buscar en resultados
-            metrics = None
-            for k, v in volumes.items():
-                if k.lower() == query_text:
-                    metrics = v
-                    break
+            metrics = volumes_by_text.get(q.get("query", "").lower())
             
             enriched_query = q.copy()
             
@@ -12,6 +12,8 @@ from typing import Optional, List
 from datetime import datetime
 import streamlit as st
 
+from utils.http_client import get_http_session, parse_json_response
+
 
 class GoogleNewsModule:
     """Módulo para obtener noticias de Google News via SerpAPI"""
@@ -41,6 +43,7 @@ class GoogleNewsModule:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def search_news(
         self,
@@ -78,9 +81,9 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             # Procesar resultados
             news_results = data.get("news_results", [])
@@ -287,9 +290,9 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             news_results = data.get("news_results", [])
             processed_news = self._process_news_results(news_results)
@@ -331,9 +334,9 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             news_results = data.get("news_results", [])
             processed_news = self._process_news_results(news_results)
@@ -379,9 +382,9 @@ class GoogleNewsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             news_results = data.get("news_results", [])
             processed_news = self._process_news_results(news_results)
@@ -15,6 +15,10 @@ from typing import Optional, List
 from datetime import datetime, timedelta
 import streamlit as st
 import re
+import numpy as np
+
+from utils.parallel import run_parallel
+from utils.http_client import get_http_session, parse_json_response
 
 # API Logger para tracking de costes
 try:
@@ -68,6 +72,7 @@ class GoogleTrendsModule:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def test_connection(self) -> tuple:
         """
@@ -88,14 +93,14 @@ class GoogleTrendsModule:
                 "api_key": self.api_key
             }
             
-            response = requests.get(
+            response = self.session.get(
                 self.BASE_URL,
                 params=params,
                 timeout=10
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json_response(response)
                 if "error" in data:
                     error_msg = data.get("error", "")
                     if "Invalid API key" in error_msg:
@@ -209,9 +214,9 @@ class GoogleTrendsModule:
             
             for attempt in range(max_retries + 1):
                 try:
-                    response = requests.get(self.BASE_URL, params=params, timeout=45)
+                    response = self.session.get(self.BASE_URL, params=params, timeout=45)
                     response.raise_for_status()
-                    data = response.json()
+                    data = parse_json_response(response)
                     
                     # Log de la llamada API
                     log_serpapi_call(
@@ -323,9 +328,9 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -366,9 +371,9 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -398,14 +403,22 @@ class GoogleTrendsModule:
         if countries is None:
             countries = ["ES", "PT", "FR", "IT", "DE"]
 
-        results = {}
+        # Una llamada por país, todas a la vez (I/O puro contra SerpAPI)
+        fetched = run_parallel({
+            country: (self.get_interest_over_time, {
+                "keyword": keyword,
+                "geo": country,
+                "timeframe": timeframe
+            })
+            for country in countries
+        })
 
+        # Un país que falla no invalida al resto; se conserva el orden pedido
+        results = {}
         for country in countries:
-            data = self.get_interest_over_time(
-                keyword=keyword,
-                geo=country,
-                timeframe=timeframe
-            )
+            data = fetched[country]
+            if isinstance(data, Exception):
+                data = {"success": False, "error": str(data)}
             results[country] = data
 
         return {
@@ -450,9 +463,9 @@ class GoogleTrendsModule:
             params["only_active"] = "true"
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -485,9 +498,9 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -523,9 +536,9 @@ class GoogleTrendsModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -549,6 +562,116 @@ class GoogleTrendsModule:
         return result
 
 
+# Formatos de fecha de SerpAPI (fallback cuando un punto no trae timestamp)
+_DATE_FORMATS = [
+    "%b %d, %Y",      # Nov 3, 2024
+    "%B %d, %Y",      # November 3, 2024
+    "%b %Y",          # Nov 2024
+    "%B %Y",          # November 2024
+    "%Y-%m-%d",       # 2024-11-03
+    "%d/%m/%Y",       # 03/11/2024
+    "%d %b %Y",       # 03 Nov 2024
+]
+
+_MONTH_ABBR = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+    'ene': 1, 'abr': 4, 'ago': 8, 'dic': 12
+}
+
+_MONTH_WORD_RE = re.compile(r'(\w{3,})\s+\d')
+
+MONTH_NAMES = {
+    1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril",
+    5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto",
+    9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
+}
+
+
+def _point_value(point: dict) -> Optional[float]:
+    """Extrae values[0].extracted_value de un punto (None si no tiene valores)"""
+    values = point.get("values")
+    if not values:
+        return None
+    try:
+        return float(values[0].get("extracted_value", 0) or 0)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _timeline_values(timeline_data: list) -> np.ndarray:
+    """Valor de cada punto del timeline (NaN si el punto no tiene valores)"""
+    # fromiter convierte None en NaN al usar dtype float
+    return np.fromiter(
+        map(_point_value, timeline_data),
+        dtype=np.float64,
+        count=len(timeline_data)
+    )
+
+
+def _parse_month(date_str: str) -> Optional[int]:
+    """Obtiene el mes (1-12) de una fecha de SerpAPI en texto"""
+    if not date_str:
+        return None
+
+    # Limpiar rangos de fecha
+    if " – " in date_str:
+        date_str = date_str.split(" – ")[0]
+    if " - " in date_str:
+        date_str = date_str.split(" - ")[0]
+    date_str = date_str.strip()
+
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).month
+        except ValueError:
+            continue
+
+    # Fallback: extraer mes con regex
+    match = _MONTH_WORD_RE.search(date_str.lower())
+    if match:
+        return _MONTH_ABBR.get(match.group(1)[:3])
+
+    return None
+
+
+def _timeline_months(timeline_data: list) -> np.ndarray:
+    """
+    Mes (1-12) de cada punto del timeline, 0 si no se puede determinar
+
+    Usa el timestamp UNIX de SerpAPI (conversión vectorizada) y solo
+    recurre a parsear el texto de la fecha si falta algún timestamp.
+    """
+    timestamps = [point.get("timestamp") for point in timeline_data]
+    if all(timestamps):
+        try:
+            ts = np.array(timestamps, dtype=np.int64).astype("datetime64[s]")
+            return ts.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        except (ValueError, TypeError):
+            pass
+
+    return np.array(
+        [_parse_month(point.get("date", "")) or 0 for point in timeline_data],
+        dtype=np.int64
+    )
+
+
+def extract_timeline_series(timeline_data: list) -> tuple:
+    """
+    Separa el timeline en fechas y valores enteros (p.ej. para el informe PDF)
+
+    Args:
+        timeline_data: Datos del timeline de Google Trends
+
+    Returns:
+        Tupla (fechas, valores); los puntos sin valores cuentan como 0
+    """
+    timeline_data = timeline_data or []
+    dates = [point.get("date", "") for point in timeline_data]
+    values = np.nan_to_num(_timeline_values(timeline_data)).astype(np.int64)
+    return dates, values.tolist()
+
+
 def calculate_growth_rate(timeline_data: list) -> dict:
     """
     Calcula la tasa de crecimiento de una serie temporal
@@ -559,25 +682,11 @@ def calculate_growth_rate(timeline_data: list) -> dict:
     Returns:
         Dict con current_value, avg_value, growth_rate, peak_value
     """
-    if not timeline_data:
-        return {
-            "current_value": 0,
-            "avg_value": 0,
-            "growth_rate": 0,
-            "peak_value": 0
-        }
+    # Extraer valores (los puntos sin valores se ignoran)
+    values = _timeline_values(timeline_data or [])
+    values = values[~np.isnan(values)]
 
-    # Extraer valores
-    values = []
-    for point in timeline_data:
-        if "values" in point and len(point["values"]) > 0:
-            val = point["values"][0].get("extracted_value", 0)
-            try:
-                values.append(float(val) if val else 0)
-            except (ValueError, TypeError):
-                values.append(0)
-
-    if not values:
+    if values.size == 0:
         return {
             "current_value": 0,
             "avg_value": 0,
@@ -585,14 +694,10 @@ def calculate_growth_rate(timeline_data: list) -> dict:
             "peak_value": 0
         }
 
-    current_value = values[-1] if values else 0
-    avg_value = sum(values) / len(values) if values else 0
-    peak_value = max(values) if values else 0
-
     # Calcular crecimiento (últimos 3 puntos vs anteriores)
-    if len(values) >= 6:
-        recent = sum(values[-3:]) / 3
-        previous = sum(values[:-3]) / max(1, len(values) - 3)
+    if values.size >= 6:
+        recent = values[-3:].mean()
+        previous = values[:-3].mean()
         if previous > 0:
             growth_rate = ((recent - previous) / previous) * 100
         else:
@@ -601,10 +706,10 @@ def calculate_growth_rate(timeline_data: list) -> dict:
         growth_rate = 0
 
     return {
-        "current_value": round(current_value, 1),
-        "avg_value": round(avg_value, 1),
-        "growth_rate": round(growth_rate, 1),
-        "peak_value": round(peak_value, 1)
+        "current_value": round(float(values[-1]), 1),
+        "avg_value": round(float(values.mean()), 1),
+        "growth_rate": round(float(growth_rate), 1),
+        "peak_value": round(float(values.max()), 1)
     }
 
 
@@ -618,152 +723,69 @@ def calculate_seasonality(timeline_data: list) -> dict:
     Returns:
         Dict con is_seasonal, seasonality_score, peak_month, low_month, monthly_pattern
     """
-    if not timeline_data or len(timeline_data) < 12:
-        return {
-            "is_seasonal": False,
-            "seasonality_score": 0,
-            "peak_month": None,
-            "low_month": None,
-            "monthly_pattern": {},
-            "explanation": "Datos insuficientes para análisis estacional"
-        }
-
-    from datetime import datetime
-    import re
-
-    # Agrupar valores por mes
-    monthly_values = {}
-
-    for point in timeline_data:
-        date_str = point.get("date", "")
-        if not date_str:
-            continue
-
-        # Limpiar rangos de fecha
-        if " – " in date_str:
-            date_str = date_str.split(" – ")[0]
-        if " - " in date_str:
-            date_str = date_str.split(" - ")[0]
-        date_str = date_str.strip()
-
-        # Intentar extraer mes
-        month = None
-
-        # Intentar múltiples formatos
-        formats_to_try = [
-            "%b %d, %Y",      # Nov 3, 2024
-            "%B %d, %Y",      # November 3, 2024
-            "%b %Y",          # Nov 2024
-            "%B %Y",          # November 2024
-            "%Y-%m-%d",       # 2024-11-03
-            "%d/%m/%Y",       # 03/11/2024
-            "%d %b %Y",       # 03 Nov 2024
-        ]
+    insufficient = {
+        "is_seasonal": False,
+        "seasonality_score": 0,
+        "peak_month": None,
+        "low_month": None,
+        "monthly_pattern": {},
+        "explanation": "Datos insuficientes para análisis estacional"
+    }
 
-        for fmt in formats_to_try:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                month = dt.month
-                break
-            except ValueError:
-                continue
-
-        # Fallback: extraer mes con regex
-        if month is None:
-            month_map = {
-                'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
-                'ene': 1, 'abr': 4, 'ago': 8, 'dic': 12
-            }
-            match = re.search(r'(\w{3,})\s+\d', date_str.lower())
-            if match:
-                month_str = match.group(1)[:3]
-                month = month_map.get(month_str)
+    if not timeline_data or len(timeline_data) < 12:
+        return insufficient
 
-        if month is None:
-            continue
+    # Mes y valor de cada punto (sin valores cuenta como 0)
+    months = _timeline_months(timeline_data)
+    values = np.nan_to_num(_timeline_values(timeline_data), nan=0.0)
 
-        # Extraer valor
-        val = 0
-        if "values" in point and len(point["values"]) > 0:
-            try:
-                val = float(point["values"][0].get("extracted_value", 0) or 0)
-            except (ValueError, TypeError):
-                val = 0
+    # Descartar puntos sin mes reconocible
+    valid = months > 0
+    months = months[valid]
+    values = values[valid]
 
-        if month not in monthly_values:
-            monthly_values[month] = []
-        monthly_values[month].append(val)
+    # Agrupar valores por mes
+    counts = np.bincount(months, minlength=13)
+    sums = np.bincount(months, weights=values, minlength=13)
 
-    if len(monthly_values) < 6:
-        return {
-            "is_seasonal": False,
-            "seasonality_score": 0,
-            "peak_month": None,
-            "low_month": None,
-            "monthly_pattern": {},
-            "explanation": "Datos insuficientes para análisis estacional"
-        }
+    # Meses presentes, en orden de primera aparición
+    _, first_seen = np.unique(months, return_index=True)
+    month_order = months[np.sort(first_seen)]
 
-    # Calcular promedio por mes
-    monthly_avg = {}
-    for month, vals in monthly_values.items():
-        monthly_avg[month] = sum(vals) / len(vals) if vals else 0
+    if month_order.size < 6:
+        return insufficient
 
-    if not monthly_avg:
-        return {
-            "is_seasonal": False,
-            "seasonality_score": 0,
-            "peak_month": None,
-            "low_month": None,
-            "monthly_pattern": {},
-            "explanation": "No hay datos válidos"
-        }
-
-    # Calcular promedio global
-    all_values = [v for vals in monthly_values.values() for v in vals]
-    global_avg = sum(all_values) / len(all_values) if all_values else 1
+    # Desviación de cada mes respecto al promedio global
+    global_avg = values.mean()
+    if global_avg > 0:
+        deviations = ((sums / np.maximum(counts, 1)) - global_avg) / global_avg * 100
+    else:
+        deviations = np.zeros(13)
 
-    # Calcular desviación de cada mes respecto al promedio
-    monthly_pattern = {}
-    for month, avg in monthly_avg.items():
-        if global_avg > 0:
-            deviation = ((avg - global_avg) / global_avg) * 100
-        else:
-            deviation = 0
-        monthly_pattern[month] = round(deviation, 1)
+    monthly_pattern = {
+        int(month): round(float(deviations[month]), 1)
+        for month in month_order
+    }
 
     # Determinar pico y valle
-    if monthly_pattern:
-        peak_month = max(monthly_pattern, key=monthly_pattern.get)
-        low_month = min(monthly_pattern, key=monthly_pattern.get)
+    peak_month = max(monthly_pattern, key=monthly_pattern.get)
+    low_month = min(monthly_pattern, key=monthly_pattern.get)
 
-        # Calcular score de estacionalidad (diferencia entre pico y valle)
-        seasonality_score = abs(monthly_pattern[peak_month] - monthly_pattern[low_month])
-    else:
-        peak_month = None
-        low_month = None
-        seasonality_score = 0
+    # Score de estacionalidad (diferencia entre pico y valle)
+    seasonality_score = abs(monthly_pattern[peak_month] - monthly_pattern[low_month])
 
     # Determinar si es estacional (diferencia significativa)
     is_seasonal = seasonality_score > 30
 
-    # Nombres de meses
-    month_names = {
-        1: "Enero", 2: "Febrero", 3: "Marzo", 4: "Abril",
-        5: "Mayo", 6: "Junio", 7: "Julio", 8: "Agosto",
-        9: "Septiembre", 10: "Octubre", 11: "Noviembre", 12: "Diciembre"
-    }
-
     return {
         "is_seasonal": is_seasonal,
         "seasonality_score": round(seasonality_score, 1),
-        "peak_month": month_names.get(peak_month, f"Mes {peak_month}") if peak_month else None,
+        "peak_month": MONTH_NAMES.get(peak_month, f"Mes {peak_month}"),
         "peak_month_num": peak_month,
-        "peak_value": monthly_pattern.get(peak_month, 0) if peak_month else 0,
-        "low_month": month_names.get(low_month, f"Mes {low_month}") if low_month else None,
+        "peak_value": monthly_pattern[peak_month],
+        "low_month": MONTH_NAMES.get(low_month, f"Mes {low_month}"),
         "low_month_num": low_month,
-        "low_value": monthly_pattern.get(low_month, 0) if low_month else 0,
+        "low_value": monthly_pattern[low_month],
         "monthly_pattern": monthly_pattern,
         "explanation": "Patrón estacional detectado" if is_seasonal else "Sin patrón estacional claro"
     }
@@ -20,6 +20,8 @@ from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 
+from utils.http_client import get_http_session, parse_json_response
+
 
 def _get_language_instruction(geo: str) -> str:
     """
@@ -238,6 +240,7 @@ class MarketIntelligence:
             raise ValueError("API key de Perplexity es demasiado corta")
         
         self.api_key = api_key
+        self.session = get_http_session()
         self._cache: Dict[str, Any] = {}
         self._last_error: str = ""
     
@@ -265,7 +268,7 @@ class MarketIntelligence:
                 "max_tokens": 5
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.BASE_URL,
                 headers=headers,
                 json=payload,
@@ -332,7 +335,7 @@ class MarketIntelligence:
                 "temperature": 0.2,
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.BASE_URL,
                 headers=headers,
                 json=payload,
@@ -356,7 +359,7 @@ class MarketIntelligence:
             
             response.raise_for_status()
             
-            data = response.json()
+            data = parse_json_response(response)
             
             # Extraer citas de la respuesta (vienen por defecto)
             citations = data.get("citations", [])
@@ -983,8 +983,8 @@ class TrendReportPDF:
         # Construir PDF
         doc.build(self.elements)
         
-        # Retornar bytes
-        buffer.seek(0)
+        # Retornar bytes (getvalue no depende de la posición ni copia el
+        # buffer de nuevo; los bytes van tal cual a download_button y al email)
         return buffer.getvalue()
 
 
@@ -16,6 +16,8 @@ from dataclasses import dataclass
 from enum import Enum
 import streamlit as st
 
+from utils.http_client import get_http_session, parse_json_response
+
 # Mapeo de idiomas por país (evita import circular)
 COUNTRY_LANGUAGES = {
     "ES": "es", "PT": "pt", "FR": "fr", 
@@ -88,6 +90,7 @@ class ProductAnalyzer:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
     
     def _get_language_code(self, country: str) -> str:
         """Obtiene código de idioma para un país"""
@@ -128,9 +131,11 @@ class ProductAnalyzer:
 
         # 2. Añadir autocomplete si existe
         if autocomplete:
+            seen_texts = {q["text"].lower() for q in all_queries}
             for suggestion in autocomplete:
-                if suggestion and suggestion.lower() not in [q["text"].lower() for q in all_queries]:
+                if suggestion and suggestion.lower() not in seen_texts:
                     all_queries.append({"text": suggestion, "growth": 0})
+                    seen_texts.add(suggestion.lower())
 
         # 3. Procesar queries para extraer productos
         for query_data in all_queries:
@@ -247,9 +252,9 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             timeline_data = data.get("interest_over_time", {}).get("timeline_data", [])
             averages = data.get("interest_over_time", {}).get("averages", [])
@@ -522,9 +527,9 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             shopping_results = data.get("shopping_results", [])
 
@@ -770,9 +775,9 @@ class ProductAnalyzer:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=15)
+            response = self.session.get(self.BASE_URL, params=params, timeout=15)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             suggestions = []
             for item in data.get("suggestions", []):
@@ -858,9 +863,9 @@ class ProductAnalyzer:
             }
 
             try:
-                response = requests.get(self.BASE_URL, params=params, timeout=15)
+                response = self.session.get(self.BASE_URL, params=params, timeout=15)
                 if response.status_code == 200:
-                    data = response.json()
+                    data = parse_json_response(response)
                     for item in data.get("shopping_results", []):
                         # Evitar duplicados
                         if not any(p.get("link") == item.get("link") for p in all_products):
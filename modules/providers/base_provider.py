@@ -6,6 +6,7 @@ Define la interfaz común que todos los proveedores deben implementar.
 
 from abc import ABC, abstractmethod
 from typing import Tuple, Dict, Any, Optional
+import json
 
 
 class BaseAIProvider(ABC):
@@ -172,3 +173,90 @@ Explica:
 3. Cómo mitigar los valles
 
 Máximo 150 palabras."""
+
+COMBINED_PROMPT_TEMPLATE = """{analysis_prompt}
+
+Además, en la MISMA respuesta:
+{seasonality_instruction}- Genera exactamente 5 ideas de artículos para un blog de tecnología/hardware sobre "{brand}"
+  (preguntas frecuentes: {questions}).
+
+Responde SOLO con un JSON con esta estructura, sin texto adicional:
+{{
+    "analisis": "texto del análisis ejecutivo",{seasonality_field}
+    "ideas": [
+        {{
+            "titulo": "...",
+            "enfoque": "...",
+            "keywords_objetivo": ["...", "..."]
+        }}
+    ]
+}}"""
+
+
+def build_combined_prompt(
+    analysis_prompt: str,
+    seasonality_data: dict,
+    brand: str,
+    questions: list
+) -> str:
+    """
+    Une análisis, explicación de estacionalidad e ideas de blog en un solo prompt
+
+    Args:
+        analysis_prompt: Prompt de análisis propio del proveedor
+        seasonality_data: Resultado de calculate_seasonality
+        brand: Marca o término analizado
+        questions: Preguntas frecuentes de usuarios
+
+    Returns:
+        Prompt que pide un único JSON con analisis, estacionalidad e ideas
+    """
+    seasonality_instruction = ""
+    seasonality_field = ""
+    if seasonality_data.get("is_seasonal"):
+        seasonality_instruction = (
+            f'- En una sola frase, explica por qué "{brand}" podría tener más búsquedas en '
+            f'{seasonality_data.get("peak_month", "ciertos meses")} y menos en '
+            f'{seasonality_data.get("low_month", "otros")} (Black Friday, Navidad, '
+            f'vuelta al cole, lanzamientos, temporadas de gaming...).\n'
+        )
+        seasonality_field = '\n    "estacionalidad": "una sola frase",'
+
+    return COMBINED_PROMPT_TEMPLATE.format(
+        analysis_prompt=analysis_prompt,
+        seasonality_instruction=seasonality_instruction,
+        seasonality_field=seasonality_field,
+        brand=brand,
+        questions=questions
+    )
+
+
+def parse_combined_response(content: str) -> dict:
+    """
+    Parsea la respuesta JSON de un prompt combinado
+
+    Args:
+        content: Texto devuelto por el modelo
+
+    Returns:
+        Dict con analysis, seasonality_explanation y blog_ideas
+
+    Raises:
+        ValueError: Si la respuesta no es un JSON con análisis
+    """
+    # Limpiar posibles bloques de código
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0]
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0]
+
+    data = json.loads(content.strip())
+    if not isinstance(data, dict) or not data.get("analisis"):
+        raise ValueError("Respuesta combinada sin análisis")
+
+    ideas = data.get("ideas", [])
+    return {
+        "analysis": data["analisis"],
+        "seasonality_explanation": data.get("estacionalidad") or None,
+        "blog_ideas": ideas if isinstance(ideas, list) else []
+    }
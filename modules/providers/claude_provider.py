@@ -6,6 +6,8 @@ Integración con Anthropic Claude API (2024-2025)
 from typing import Optional, Tuple
 import json
 
+from .base_provider import build_combined_prompt, parse_combined_response
+
 # API Logger para tracking de costes
 try:
     from modules.api_usage import log_ai_call
@@ -208,6 +210,71 @@ Responde SOLO con el JSON, sin texto adicional."""
                 "provider": "Claude 4.5"
             }
 
+    def analyze_combined(self, trend_data: dict, seasonality_data: dict, brand: str) -> dict:
+        """
+        Análisis, estacionalidad e ideas de blog en una sola llamada
+        """
+        prompt = build_combined_prompt(
+            self._build_analysis_prompt(trend_data),
+            seasonality_data,
+            brand,
+            trend_data.get("questions", [])
+        )
+
+        try:
+            response = self.client.messages.create(
+                model=self.MODEL,
+                max_tokens=2500,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            )
+
+            content = self._extract_content(response)
+
+            # Log de uso de API con tokens
+            tokens_in = getattr(response.usage, 'input_tokens', 0)
+            tokens_out = getattr(response.usage, 'output_tokens', 0)
+            log_ai_call(
+                provider="claude",
+                tokens_input=tokens_in,
+                tokens_output=tokens_out,
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=True
+            )
+
+        except Exception as e:
+            log_ai_call(
+                provider="claude",
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=False,
+                error_message=str(e)
+            )
+            return {
+                "success": False,
+                "error": str(e),
+                "provider": "Claude 4.5"
+            }
+
+        try:
+            return {
+                "success": True,
+                **parse_combined_response(content),
+                "provider": "Claude 4.5"
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"Respuesta combinada no válida: {e}",
+                "raw_response": content,
+                "provider": "Claude 4.5"
+            }
+
     def explain_seasonality(self, seasonality_data: dict, brand: str) -> str:
         """
         Genera una explicación del patrón de estacionalidad
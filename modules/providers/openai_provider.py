@@ -6,6 +6,8 @@ Integración con OpenAI GPT-4o API (2024-2025)
 from typing import Optional, Tuple
 import json
 
+from .base_provider import build_combined_prompt, parse_combined_response
+
 # API Logger para tracking de costes
 try:
     from modules.api_usage import log_ai_call
@@ -203,6 +205,78 @@ Responde SOLO con el JSON, sin texto adicional."""
                 "provider": "GPT-4o"
             }
 
+    def analyze_combined(self, trend_data: dict, seasonality_data: dict, brand: str) -> dict:
+        """
+        Análisis, estacionalidad e ideas de blog en una sola llamada
+        """
+        prompt = build_combined_prompt(
+            self._build_analysis_prompt(trend_data),
+            seasonality_data,
+            brand,
+            trend_data.get("questions", [])
+        )
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.MODEL,
+                max_tokens=2500,
+                response_format={"type": "json_object"},
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Eres un analista de tendencias de mercado especializado en retail de tecnología. Proporcionas insights accionables y directos."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ]
+            )
+
+            content = self._extract_content(response)
+
+            # Log de uso de API
+            tokens_in = getattr(response.usage, 'prompt_tokens', 0)
+            tokens_out = getattr(response.usage, 'completion_tokens', 0)
+            log_ai_call(
+                provider="openai",
+                tokens_input=tokens_in,
+                tokens_output=tokens_out,
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=True
+            )
+
+        except Exception as e:
+            log_ai_call(
+                provider="openai",
+                tokens_input=0,
+                tokens_output=0,
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=False,
+                error_message=str(e)
+            )
+            return {
+                "success": False,
+                "error": str(e),
+                "provider": "GPT-4o"
+            }
+
+        try:
+            return {
+                "success": True,
+                **parse_combined_response(content),
+                "provider": "GPT-4o"
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"Respuesta combinada no válida: {e}",
+                "raw_response": content,
+                "provider": "GPT-4o"
+            }
+
     def explain_seasonality(self, seasonality_data: dict, brand: str) -> str:
         """
         Genera una explicación del patrón de estacionalidad
@@ -5,7 +5,10 @@ Integración con Perplexity API
 
 from typing import Optional
 import json
-import requests
+
+from utils.http_client import get_http_session, parse_json_response
+
+from .base_provider import build_combined_prompt, parse_combined_response
 
 # API Logger para tracking de costes
 try:
@@ -22,6 +25,7 @@ class PerplexityProvider:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
     
     def _extract_content(self, data: dict) -> str:
         """
@@ -77,7 +81,7 @@ class PerplexityProvider:
                 "max_tokens": 1500
             }
 
-            response = requests.post(
+            response = self.session.post(
                 self.BASE_URL,
                 headers=headers,
                 json=payload,
@@ -85,7 +89,7 @@ class PerplexityProvider:
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = parse_json_response(response)
             
             # Validar estructura de respuesta
             choices = data.get("choices", [])
@@ -177,7 +181,7 @@ Responde SOLO con el JSON, sin texto adicional ni explicaciones."""
                 "max_tokens": 1000
             }
 
-            response = requests.post(
+            response = self.session.post(
                 self.BASE_URL,
                 headers=headers,
                 json=payload,
@@ -185,7 +189,7 @@ Responde SOLO con el JSON, sin texto adicional ni explicaciones."""
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = parse_json_response(response)
             content = self._extract_content(data)
 
             # Intentar parsear JSON
@@ -216,6 +220,91 @@ Responde SOLO con el JSON, sin texto adicional ni explicaciones."""
                 "provider": "Perplexity"
             }
 
+    def analyze_combined(self, trend_data: dict, seasonality_data: dict, brand: str) -> dict:
+        """
+        Análisis, estacionalidad e ideas de blog en una sola llamada
+        """
+        prompt = build_combined_prompt(
+            self._build_analysis_prompt(trend_data),
+            seasonality_data,
+            brand,
+            trend_data.get("questions", [])
+        )
+
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+
+            payload = {
+                "model": self.MODEL,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "Eres un analista de tendencias de mercado especializado en retail de tecnología. Proporcionas insights accionables basados en datos y búsquedas en tiempo real."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "max_tokens": 2500
+            }
+
+            response = self.session.post(
+                self.BASE_URL,
+                headers=headers,
+                json=payload,
+                timeout=60
+            )
+            response.raise_for_status()
+
+            data = parse_json_response(response)
+            content = self._extract_content(data)
+
+            # Log de uso de API
+            usage = data.get("usage", {})
+            log_ai_call(
+                provider="perplexity",
+                tokens_input=usage.get("prompt_tokens", 0),
+                tokens_output=usage.get("completion_tokens", 0),
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=True
+            )
+
+        except Exception as e:
+            log_ai_call(
+                provider="perplexity",
+                tokens_input=0,
+                tokens_output=0,
+                keyword=brand,
+                endpoint="analyze_combined",
+                success=False,
+                error_message=str(e)
+            )
+            return {
+                "success": False,
+                "error": str(e),
+                "provider": "Perplexity"
+            }
+
+        try:
+            return {
+                "success": True,
+                **parse_combined_response(content),
+                "provider": "Perplexity",
+                "citations": data.get("citations", [])
+            }
+        except ValueError as e:
+            return {
+                "success": False,
+                "error": f"Respuesta combinada no válida: {e}",
+                "raw_response": content,
+                "provider": "Perplexity"
+            }
+
     def explain_seasonality(self, seasonality_data: dict, brand: str) -> str:
         """
         Genera una explicación del patrón de estacionalidad
@@ -257,7 +346,7 @@ Responde solo con la frase explicativa, sin introducción ni fuentes."""
                     "max_tokens": 200
                 }
 
-                response = requests.post(
+                response = self.session.post(
                     self.BASE_URL,
                     headers=headers,
                     json=payload,
@@ -265,7 +354,7 @@ Responde solo con la frase explicativa, sin introducción ni fuentes."""
                 )
                 response.raise_for_status()
 
-                data = response.json()
+                data = parse_json_response(response)
                 return self._extract_content(data)
             except Exception:
                 return f"El interés en {brand} muestra un patrón estacional con picos en {month_names.get(peak_month, 'ciertos meses')}."
@@ -298,7 +387,7 @@ Sé breve y directo (máximo 200 palabras)."""
                 "max_tokens": 500
             }
 
-            response = requests.post(
+            response = self.session.post(
                 self.BASE_URL,
                 headers=headers,
                 json=payload,
@@ -306,7 +395,7 @@ Sé breve y directo (máximo 200 palabras)."""
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -11,6 +11,8 @@ import requests
 from typing import Optional
 import streamlit as st
 
+from utils.http_client import get_http_session, parse_json_response
+
 
 class RelatedQueriesModule:
     """Módulo para obtener queries y topics relacionados"""
@@ -19,6 +21,7 @@ class RelatedQueriesModule:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def get_related_queries(
         self,
@@ -53,9 +56,9 @@ class RelatedQueriesModule:
             max_retries = 2
             for attempt in range(max_retries + 1):
                 try:
-                    response = requests.get(self.BASE_URL, params=params, timeout=45)
+                    response = self.session.get(self.BASE_URL, params=params, timeout=45)
                     response.raise_for_status()
-                    data = response.json()
+                    data = parse_json_response(response)
 
                     related = data.get("related_queries", {})
 
@@ -114,9 +117,9 @@ class RelatedQueriesModule:
             max_retries = 2
             for attempt in range(max_retries + 1):
                 try:
-                    response = requests.get(self.BASE_URL, params=params, timeout=45)
+                    response = self.session.get(self.BASE_URL, params=params, timeout=45)
                     response.raise_for_status()
-                    data = response.json()
+                    data = parse_json_response(response)
 
                     related = data.get("related_topics", {})
 
@@ -268,12 +268,11 @@ class ScoringEngine:
 
     def _extract_values(self, timeline_data: list) -> list:
         """Extrae los valores numéricos del timeline"""
-        values = []
-        for point in timeline_data:
-            if "values" in point and len(point["values"]) > 0:
-                val = point["values"][0].get("extracted_value", 0)
-                values.append(float(val) if val else 0)
-        return values
+        return [
+            float(point["values"][0].get("extracted_value", 0) or 0)
+            for point in timeline_data
+            if point.get("values")
+        ]
 
     def _calculate_metrics(self, values: list) -> TrendMetrics:
         """Calcula métricas básicas de la serie temporal"""
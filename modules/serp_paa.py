@@ -11,6 +11,8 @@ import requests
 from typing import Optional, List
 import streamlit as st
 
+from utils.http_client import get_http_session, parse_json_response
+
 
 class PeopleAlsoAskModule:
     """Módulo para obtener PAA, autocomplete y related searches"""
@@ -37,6 +39,7 @@ class PeopleAlsoAskModule:
 
     def __init__(self, api_key: str):
         self.api_key = api_key
+        self.session = get_http_session()
 
     def get_serp_data(
         self,
@@ -63,9 +66,9 @@ class PeopleAlsoAskModule:
             max_retries = 2
             for attempt in range(max_retries + 1):
                 try:
-                    response = requests.get(self.BASE_URL, params=params, timeout=45)
+                    response = self.session.get(self.BASE_URL, params=params, timeout=45)
                     response.raise_for_status()
-                    data = response.json()
+                    data = parse_json_response(response)
 
                     return {
                         "success": True,
@@ -109,9 +112,9 @@ class PeopleAlsoAskModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             suggestions = data.get("suggestions", [])
 
@@ -154,9 +157,9 @@ class PeopleAlsoAskModule:
         }
 
         try:
-            response = requests.get(self.BASE_URL, params=params, timeout=45)
+            response = self.session.get(self.BASE_URL, params=params, timeout=45)
             response.raise_for_status()
-            data = response.json()
+            data = parse_json_response(response)
 
             return {
                 "success": True,
@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 from collections import Counter
 import time
 
+from utils.http_client import get_http_session
+
 # Import patterns module
 try:
     from patterns import (
@@ -257,6 +259,9 @@ class YouTubeModule:
             print(f"[YouTube] Advertencia: API key no tiene formato típico de Google (AIza...)")
 
         self.api_key = api_key
+        # Sesión keep-alive compartida: el deep dive hace varias búsquedas
+        # seguidas a googleapis.com y así no repite el handshake TLS
+        self.session = get_http_session()
         self._cache: Dict[str, Any] = {}
         self._last_error: str = ""
         self._is_valid: Optional[bool] = None  # Se verificará en primera llamada
@@ -281,7 +286,7 @@ class YouTubeModule:
                 "maxResults": 1
             }
             
-            response = requests.get(
+            response = self.session.get(
                 self.SEARCH_URL,
                 params=params,
                 timeout=10
@@ -738,7 +743,7 @@ class YouTubeModule:
         if published_after:
             params["publishedAfter"] = published_after.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        response = requests.get(self.SEARCH_URL, params=params, timeout=10)
+        response = self.session.get(self.SEARCH_URL, params=params, timeout=10)
 
         if response.status_code == 403:
             error_data = response.json().get("error", {})
@@ -802,7 +807,7 @@ class YouTubeModule:
         }
 
         try:
-            response = requests.get(self.VIDEOS_URL, params=params, timeout=10)
+            response = self.session.get(self.VIDEOS_URL, params=params, timeout=10)
 
             if response.status_code != 200:
                 return {}
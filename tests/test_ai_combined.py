@@ -0,0 +1,108 @@
+"""
+Tests del análisis IA combinado (una sola llamada al LLM)
+Verifica el parseo de la respuesta JSON y el fallback a llamadas separadas
+"""
+
+import os
+import sys
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.ai_analysis import AIAnalyzer
+from modules.providers.base_provider import build_combined_prompt, parse_combined_response
+
+
+class _FakeProvider:
+    """Proveedor que registra las llamadas recibidas"""
+
+    def __init__(self, combined_result):
+        self.combined_result = combined_result
+        self.calls = []
+
+    def analyze_combined(self, trend_data, seasonality_data, brand):
+        self.calls.append("analyze_combined")
+        return self.combined_result
+
+    def analyze_trend(self, trend_data):
+        self.calls.append("analyze_trend")
+        return {"success": True, "analysis": "separado"}
+
+    def generate_blog_ideas(self, trend_data, brand):
+        self.calls.append("generate_blog_ideas")
+        return {"success": True, "ideas": []}
+
+    def explain_seasonality(self, seasonality_data, brand):
+        self.calls.append("explain_seasonality")
+        return "explicación separada"
+
+
+def _analyzer(provider):
+    analyzer = AIAnalyzer.__new__(AIAnalyzer)
+    analyzer.providers = {"claude": provider}
+    return analyzer
+
+
+SEASONAL = {"is_seasonal": True, "peak_month": "Diciembre", "low_month": "Julio"}
+
+
+def test_combined_prompt_only_asks_seasonality_when_seasonal():
+    """La frase de estacionalidad solo se pide si hay patrón estacional"""
+    assert '"estacionalidad"' in build_combined_prompt("P", SEASONAL, "beelink", [])
+    assert '"estacionalidad"' not in build_combined_prompt("P", {"is_seasonal": False}, "beelink", [])
+
+
+def test_parse_combined_response_strips_code_fences():
+    """Acepta el JSON envuelto en un bloque de código"""
+    content = '```json\n{"analisis": "A", "estacionalidad": "E", "ideas": [{"titulo": "T"}]}\n```'
+    assert parse_combined_response(content) == {
+        "analysis": "A",
+        "seasonality_explanation": "E",
+        "blog_ideas": [{"titulo": "T"}]
+    }
+
+
+def test_analyze_combined_single_call():
+    """Una respuesta válida resuelve todo con una sola llamada"""
+    provider = _FakeProvider({
+        "success": True, "analysis": "A", "seasonality_explanation": "E", "blog_ideas": []
+    })
+    result = _analyzer(provider).analyze_combined({"keyword": "beelink"}, SEASONAL, "beelink")
+
+    assert provider.calls == ["analyze_combined"]
+    assert result["success"] is True
+    assert result["analysis"] == "A"
+    assert result["seasonality_explanation"] == "E"
+
+
+def test_analyze_combined_falls_back_to_separate_calls():
+    """Si la respuesta combinada falla se usan las llamadas separadas"""
+    provider = _FakeProvider({"success": False, "error": "JSON inválido"})
+    result = _analyzer(provider).analyze_combined({"keyword": "beelink"}, SEASONAL, "beelink")
+
+    assert provider.calls == [
+        "analyze_combined", "analyze_trend", "generate_blog_ideas", "explain_seasonality"
+    ]
+    assert result["analysis"] == "separado"
+    assert result["seasonality_explanation"] == "explicación separada"
+
+
+def test_analyze_combined_fallback_uses_given_explainer():
+    """El fallback delega la estacionalidad en el explainer recibido (cacheado)"""
+    provider = _FakeProvider({"success": False, "error": "JSON inválido"})
+    result = _analyzer(provider).analyze_combined(
+        {"keyword": "beelink"}, SEASONAL, "beelink",
+        seasonality_explainer=lambda data, brand, prov: f"cache:{brand}:{prov}"
+    )
+
+    assert "explain_seasonality" not in provider.calls
+    assert result["seasonality_explanation"] == "cache:beelink:claude"
+
+
+if __name__ == "__main__":
+    test_combined_prompt_only_asks_seasonality_when_seasonal()
+    test_parse_combined_response_strips_code_fences()
+    test_analyze_combined_single_call()
+    test_analyze_combined_falls_back_to_separate_calls()
+    test_analyze_combined_fallback_uses_given_explainer()
+    print("✅ All AI combined tests passed")
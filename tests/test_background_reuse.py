@@ -0,0 +1,88 @@
+"""
+Tests de tareas en segundo plano de la app
+Verifica la reutilización de resultados entre reruns y las esperas a tareas en vuelo
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import (
+    completed_future, fetch_after_prefetch, resolved_results, reusable_futures,
+    settle_future, wait_for_result
+)
+
+
+def test_pair_is_reused_when_both_resolved():
+    """Con ambos resultados guardados se devuelven como futures ya resueltos"""
+    last_background = {"product_intel": {"success": True}, "market": {"success": True, "x": 1}}
+    product_intel_future, market_future = reusable_futures(
+        last_background, "product_intel", "market"
+    )
+
+    assert product_intel_future.result() == {"success": True}
+    assert market_future.result()["x"] == 1
+
+
+def test_rerun_with_only_market_resolved_relaunches():
+    """Si product_intel falló (success=False) el par no se reutiliza"""
+    last_background = resolved_results({
+        "product_intel": completed_future({"success": False, "result": None}),
+        "market": completed_future({"success": True, "result": "analysis"})
+    })
+
+    assert "market" in last_background
+    assert reusable_futures(last_background, "product_intel", "market") is None
+
+
+def test_queued_prefetch_is_cancelled_and_fetched_directly():
+    """Una precarga que no ha empezado no bloquea la consulta principal"""
+    calls = []
+    queued = Future()
+
+    result = fetch_after_prefetch(
+        queued, cached_func=lambda **kw: calls.append(kw) or "data", keyword="mini pc"
+    )
+
+    assert result == "data"
+    assert calls == [{"keyword": "mini pc"}]
+    assert queued.cancelled()
+
+
+def test_timed_out_future_is_waited_on_once():
+    """Tras un timeout, el segundo panel recibe el error sin volver a esperar"""
+    never_done = Future()
+    never_done.set_running_or_notify_cancel()
+    start = time.perf_counter()
+    settled = settle_future(never_done, "Esperando...", timeout=0.3)
+
+    try:
+        wait_for_result(settled, "Esperando...", timeout=0.3)
+        assert False, "Se esperaba el timeout"
+    except FutureTimeoutError:
+        pass
+
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.5, f"Se esperó dos veces: {elapsed:.2f}s"
+
+
+def test_queue_time_does_not_count_against_timeout():
+    """Con el pool ocupado, el plazo empieza cuando la tarea arranca"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(time.sleep, 0.4)
+        queued = pool.submit(lambda: "ok")
+
+        assert wait_for_result(queued, "Esperando...", timeout=0.2) == "ok"
+
+
+if __name__ == "__main__":
+    test_pair_is_reused_when_both_resolved()
+    test_rerun_with_only_market_resolved_relaunches()
+    test_queued_prefetch_is_cancelled_and_fetched_directly()
+    test_timed_out_future_is_waited_on_once()
+    test_queue_time_does_not_count_against_timeout()
+    print("✅ All background reuse tests passed")
@@ -0,0 +1,51 @@
+"""
+Tests de la caché persistente (modules.cache)
+Verifica que los resultados con dataclasses anidados se serializan a JSON
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.cache import TrendCache
+from modules.youtube import YouTubeDeepDive, YouTubeVideo
+
+
+def _cache():
+    """TrendCache sin cliente de Supabase: solo se usa la serialización"""
+    return TrendCache.__new__(TrendCache)
+
+
+def test_nested_dataclasses_are_serialized():
+    """YouTubeDeepDive con vídeos y fechas se convierte a JSON válido"""
+    video = YouTubeVideo(
+        video_id="1", title="Review", channel="c", channel_id="x",
+        views=10, likes=1, comments=0, published="",
+        published_date=datetime(2025, 1, 1), duration="", thumbnail="", description=""
+    )
+    deep_dive = YouTubeDeepDive(keyword="beelink", videos_by_type={"review": [video]})
+
+    data = json.loads(json.dumps(_cache()._serialize({"youtube": deep_dive})))
+
+    saved_video = data["youtube"]["videos_by_type"]["review"][0]
+    assert saved_video["title"] == "Review"
+    assert saved_video["published_date"] == "2025-01-01T00:00:00"
+
+
+def test_private_attributes_are_skipped():
+    """Los atributos privados de objetos normales no se guardan"""
+    obj = type("Result", (), {})()
+    obj.score = 80
+    obj._client = object()
+
+    assert _cache()._serialize(obj) == {"score": 80}
+
+
+if __name__ == "__main__":
+    test_nested_dataclasses_are_serialized()
+    test_private_attributes_are_skipped()
+    print("✅ All cache tests passed")
@@ -0,0 +1,76 @@
+"""
+Tests del enriquecimiento por lotes con Google Ads
+Verifica que rising y top comparten una sola consulta de volúmenes
+"""
+
+import os
+import sys
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.google_ads import GoogleAdsKeywordPlanner, KeywordMetrics, MAX_SEED_KEYWORDS
+
+
+def _planner(calls):
+    """Planner sin cliente real que registra cada consulta de volúmenes"""
+    planner = GoogleAdsKeywordPlanner.__new__(GoogleAdsKeywordPlanner)
+    planner._client = object()
+    planner._initialized = True
+    planner._last_error = ""
+
+    def fake_volumes(keywords, geo="ES", language=None):
+        calls.append(list(keywords))
+        return {k.upper(): KeywordMetrics(keyword=k, avg_monthly_searches=100) for k in keywords}
+
+    planner.get_keyword_volumes = fake_volumes
+    return planner
+
+
+def test_batch_uses_single_request_for_all_groups():
+    """Las keywords de todos los grupos van en una consulta, sin duplicados"""
+    calls = []
+    enriched = _planner(calls).enrich_related_queries_batch({
+        "rising": [{"query": "beelink ser8"}, {"query": "beelink gtr7"}],
+        "top": [{"query": "beelink ser8"}, {"query": "mini pc"}]
+    }, geo="ES")
+
+    assert calls == [["beelink ser8", "beelink gtr7", "mini pc"]]
+    assert [q["real_volume"] for q in enriched["rising"]] == [100, 100]
+    assert [q["query"] for q in enriched["top"]] == ["beelink ser8", "mini pc"]
+
+
+def test_single_list_wrapper_keeps_behaviour():
+    """enrich_related_queries sigue devolviendo una lista enriquecida"""
+    calls = []
+    enriched = _planner(calls).enrich_related_queries([{"query": "mini pc"}, {"value": 5}])
+
+    assert len(calls) == 1
+    assert enriched[0]["real_volume"] == 100
+    assert enriched[1]["real_volume"] is None
+
+
+def test_volumes_are_requested_in_api_sized_batches():
+    """Más de MAX_SEED_KEYWORDS keywords se reparten en varias peticiones"""
+    requests = []
+    planner = _planner([])
+    del planner.get_keyword_volumes
+
+    def fake_request(keywords, geo, language):
+        requests.append(list(keywords))
+        return {k: KeywordMetrics(keyword=k, avg_monthly_searches=1) for k in keywords}
+
+    planner._request_keyword_volumes = fake_request
+    keywords = [f"kw {i}" for i in range(2 * MAX_SEED_KEYWORDS + 5)]
+    volumes = planner.get_keyword_volumes(keywords)
+
+    assert len(requests) == 3
+    assert all(len(batch) <= MAX_SEED_KEYWORDS for batch in requests)
+    assert list(volumes) == keywords
+
+
+if __name__ == "__main__":
+    test_batch_uses_single_request_for_all_groups()
+    test_single_list_wrapper_keeps_behaviour()
+    test_volumes_are_requested_in_api_sized_batches()
+    print("✅ All Google Ads batch tests passed")
@@ -0,0 +1,119 @@
+"""
+Tests de ejecución en paralelo (utils.parallel)
+Verifica que las tareas se ejecutan a la vez y que los fallos quedan aislados
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parallel import BACKGROUND_WORKERS, run_parallel, run_in_background, session_executor
+
+
+def _slow_echo(value, delay=0.2):
+    time.sleep(delay)
+    return value
+
+
+def _boom():
+    raise ValueError("fallo simulado")
+
+
+def test_run_parallel_results_by_name():
+    """Cada resultado se devuelve bajo el nombre de su tarea"""
+    results = run_parallel({
+        "a": (_slow_echo, {"value": 1, "delay": 0}),
+        "b": (_slow_echo, {"value": 2, "delay": 0}),
+    })
+    assert results == {"a": 1, "b": 2}
+
+
+def test_run_parallel_is_concurrent():
+    """La latencia total es la de la tarea más lenta, no la suma"""
+    start = time.perf_counter()
+    run_parallel({name: (_slow_echo, {"value": name}) for name in "abcd"})
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.6, f"Demasiado lento para ser paralelo: {elapsed:.2f}s"
+
+
+def test_run_parallel_isolates_exceptions():
+    """Una tarea que falla devuelve su excepción sin afectar al resto"""
+    done = []
+    results = run_parallel(
+        {"ok": (_slow_echo, {"value": "x", "delay": 0}), "ko": (_boom, {})},
+        on_done=done.append
+    )
+    assert results["ok"] == "x"
+    assert isinstance(results["ko"], ValueError)
+    assert sorted(done) == ["ko", "ok"]
+
+
+def test_run_parallel_empty():
+    """Sin tareas no se crea pool y se devuelve dict vacío"""
+    assert run_parallel({}) == {}
+
+
+def test_run_in_background_overlaps_work():
+    """Las tareas en segundo plano avanzan mientras el hilo principal trabaja"""
+    start = time.perf_counter()
+    first = run_in_background(_slow_echo, value="a")
+    second = run_in_background(_slow_echo, value="b")
+    time.sleep(0.2)
+    assert (first.result(timeout=1), second.result(timeout=1)) == ("a", "b")
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.4, f"Tareas no solapadas: {elapsed:.2f}s"
+
+
+def test_saturated_session_pool_does_not_block_other_sessions():
+    """Cada sesión tiene su pool: llenar uno no deja en cola las tareas de otra"""
+    busy_state, other_state = {}, {}
+    release = threading.Event()
+    busy_pool = session_executor(busy_state)
+    for _ in range(BACKGROUND_WORKERS + 2):
+        busy_pool.submit(release.wait, 2)
+
+    try:
+        assert session_executor(busy_state) is busy_pool
+        other_pool = session_executor(other_state)
+        assert other_pool is not busy_pool
+        assert other_pool.submit(_slow_echo, "x", 0).result(timeout=0.5) == "x"
+    finally:
+        release.set()
+
+
+def test_multi_country_data_isolates_failures():
+    """Un país que falla no afecta al resto y se mantiene el orden"""
+    from modules.google_trends import GoogleTrendsModule
+
+    def fake_interest(keyword, geo="ES", timeframe="today 12-m", **kwargs):
+        time.sleep(0.2)
+        if geo == "FR":
+            raise ConnectionError("timeout")
+        return {"success": True, "geo": geo}
+
+    module = GoogleTrendsModule("test-key")
+    module.get_interest_over_time = fake_interest
+
+    start = time.perf_counter()
+    data = module.get_multi_country_data("beelink", countries=["ES", "FR", "DE"])
+    elapsed = time.perf_counter() - start
+
+    assert list(data["countries"]) == ["ES", "FR", "DE"]
+    assert data["countries"]["ES"]["geo"] == "ES"
+    assert data["countries"]["FR"]["success"] is False
+    assert elapsed < 0.5, f"Países consultados en serie: {elapsed:.2f}s"
+
+
+if __name__ == "__main__":
+    test_run_parallel_results_by_name()
+    test_run_parallel_is_concurrent()
+    test_run_parallel_isolates_exceptions()
+    test_run_parallel_empty()
+    test_run_in_background_overlaps_work()
+    test_saturated_session_pool_does_not_block_other_sessions()
+    test_multi_country_data_isolates_failures()
+    print("✅ All parallel tests passed")
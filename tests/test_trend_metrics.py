@@ -0,0 +1,102 @@
+"""
+Tests de métricas de tendencia (growth rate y estacionalidad)
+Verifica los cálculos vectorizados sobre timelines con formato SerpAPI
+"""
+
+import calendar
+import os
+import sys
+from datetime import date, timedelta
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.google_trends import calculate_growth_rate, calculate_seasonality, extract_timeline_series
+
+
+def _weekly_timeline(values, start=date(2023, 1, 1), with_timestamp=True):
+    """Timeline semanal con el formato de SerpAPI"""
+    timeline = []
+    for i, value in enumerate(values):
+        day = start + timedelta(weeks=i)
+        point = {
+            "date": day.strftime("%b %d, %Y"),
+            "values": [{"query": "test", "extracted_value": value}]
+        }
+        if with_timestamp:
+            point["timestamp"] = str(calendar.timegm(day.timetuple()))
+        timeline.append(point)
+    return timeline
+
+
+def test_growth_rate_recent_vs_previous():
+    """Compara la media de los 3 últimos puntos con la del resto"""
+    result = calculate_growth_rate(_weekly_timeline([10, 10, 10, 20, 20, 20]))
+    assert result == {
+        "current_value": 20.0,
+        "avg_value": 15.0,
+        "growth_rate": 100.0,
+        "peak_value": 20.0
+    }
+
+
+def test_growth_rate_ignores_points_without_values():
+    """Los puntos sin 'values' no cuentan como cero"""
+    timeline = _weekly_timeline([40, 60])
+    timeline.insert(1, {"date": "Jan 08, 2023", "values": []})
+    result = calculate_growth_rate(timeline)
+    assert result["avg_value"] == 50.0
+    assert result["growth_rate"] == 0
+
+
+def test_seasonality_detects_december_peak():
+    """Un pico navideño marcado se detecta como estacional"""
+    start = date(2023, 1, 1)
+    values = [
+        100 if (start + timedelta(weeks=i)).month == 12 else 20
+        for i in range(104)
+    ]
+    result = calculate_seasonality(_weekly_timeline(values, start))
+
+    assert result["is_seasonal"] is True
+    assert result["peak_month"] == "Diciembre"
+    assert result["peak_month_num"] == 12
+    assert set(result["monthly_pattern"]) == set(range(1, 13))
+    assert all(type(month) is int for month in result["monthly_pattern"])
+
+
+def test_seasonality_same_result_without_timestamps():
+    """El fallback por texto de fecha da el mismo resultado que el timestamp"""
+    values = [(i * 7) % 100 for i in range(60)]
+    with_ts = calculate_seasonality(_weekly_timeline(values))
+    without_ts = calculate_seasonality(_weekly_timeline(values, with_timestamp=False))
+    assert with_ts == without_ts
+
+
+def test_seasonality_insufficient_data():
+    """Menos de 12 puntos no permite análisis estacional"""
+    result = calculate_seasonality(_weekly_timeline([50] * 8))
+    assert result["is_seasonal"] is False
+    assert result["monthly_pattern"] == {}
+
+
+def test_extract_timeline_series_defaults_missing_values_to_zero():
+    """Fechas y valores enteros alineados; puntos sin valores cuentan como 0"""
+    timeline = _weekly_timeline([42, 3.7])
+    timeline.append({"date": "Mar 1, 2023", "values": []})
+
+    dates, values = extract_timeline_series(timeline)
+
+    assert dates == [p["date"] for p in timeline]
+    assert values == [42, 3, 0]
+    assert extract_timeline_series(None) == ([], [])
+
+
+if __name__ == "__main__":
+    test_growth_rate_recent_vs_previous()
+    test_growth_rate_ignores_points_without_values()
+    test_seasonality_detects_december_peak()
+    test_seasonality_same_result_without_timestamps()
+    test_seasonality_insufficient_data()
+    test_extract_timeline_series_defaults_missing_values_to_zero()
+    print("✅ All trend metrics tests passed")
@@ -0,0 +1,34 @@
+"""
+Tests de utilidades de validación (utils.validation)
+Verifica los helpers añadidos para exportación y render
+"""
+
+import os
+import sys
+
+# Añadir path del proyecto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.validation import keyword_slug, sanitize_html_many
+
+
+def test_keyword_slug():
+    """Los caracteres no válidos en nombres de archivo se sustituyen"""
+    assert keyword_slug("RTX 4090 / Ti") == "RTX_4090_Ti"
+
+
+def test_keyword_slug_empty_fallback():
+    """Un keyword sin caracteres válidos usa 'export'"""
+    assert keyword_slug("???") == "export"
+
+
+def test_sanitize_html_many():
+    """Escapa cada valor como sanitize_html, convirtiendo no-strings con str()"""
+    assert sanitize_html_many(["<b>", 5, None]) == ["&lt;b&gt;", "5", "None"]
+
+
+if __name__ == "__main__":
+    test_keyword_slug()
+    test_keyword_slug_empty_fallback()
+    test_sanitize_html_many()
+    print("✅ All validation tests passed")
@@ -4,12 +4,15 @@ Funciones auxiliares y helpers
 """
 
 import streamlit as st
+from collections import deque
 from datetime import datetime
 import html as html_module
 
 # Import de validaciones
 from .validation import (
-    sanitize_html, sanitize_for_query, sanitize_filename,
+    sanitize_html, sanitize_html_many, sanitize_for_query, sanitize_filename,
+    clear_sanitize_cache,
+    keyword_slug,
     safe_float, safe_int, safe_divide, safe_percentage_change,
     safe_list, safe_dict, safe_get, safe_average,
     validate_hex_color, hex_to_rgba
@@ -18,18 +21,28 @@ from .validation import (
 # Import de funciones de formateo centralizadas
 from .formatting import format_number, format_volume, format_change
 
+# Ejecución en paralelo de llamadas de red independientes
+from .parallel import run_parallel, run_in_background
 
-def load_css():
-    """Carga los estilos CSS personalizados"""
+
+@st.cache_resource(show_spinner=False)
+def _read_custom_css() -> str:
+    """Lee assets/custom.css una sola vez por proceso"""
     try:
         with open("assets/custom.css", "r", encoding="utf-8") as f:
-            css_content = f.read()
-            # No escapamos el CSS ya que es nuestro archivo estático
-            st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
-    except FileNotFoundError:
-        pass
+            return f.read()
     except Exception:
-        pass  # Silenciar otros errores de lectura
+        return ""  # Archivo ausente o ilegible: sin estilos propios
+
+
+def load_css():
+    """Carga los estilos CSS personalizados"""
+    css_content = _read_custom_css()
+    if css_content:
+        # Se emite en cada rerun: Streamlit descarta los elementos que un
+        # rerun no vuelve a dibujar. Solo la lectura del disco se cachea.
+        # No escapamos el CSS ya que es nuestro archivo estático
+        st.markdown(f"<style>{css_content}</style>", unsafe_allow_html=True)
 
 
 def render_logo():
@@ -386,10 +399,14 @@ def get_time_greeting() -> str:
         return "Hola"
 
 
+# Entradas que guarda el historial de búsquedas de la sesión
+SEARCH_HISTORY_SIZE = 20
+
+
 def init_session_state():
     """Inicializa el estado de la sesión"""
     defaults = {
-        "search_history": [],
+        "search_history": deque(maxlen=SEARCH_HISTORY_SIZE),
         "current_keyword": "",
         "selected_country": "ES",
         "selected_timeframe": "today 5-y",
@@ -406,6 +423,20 @@ def init_session_state():
             st.session_state[key] = value
 
 
+def get_search_history() -> deque:
+    """
+    Historial de búsquedas de la sesión (la más reciente al final)
+
+    Es un deque acotado: añadir es O(1) y las entradas antiguas se
+    descartan solas. Convierte historiales en formato lista si los hay.
+    """
+    history = st.session_state.get("search_history")
+    if not isinstance(history, deque):
+        history = deque(history or [], maxlen=SEARCH_HISTORY_SIZE)
+        st.session_state["search_history"] = history
+    return history
+
+
 def add_to_history(keyword: str):
     """
     Añade un término al historial de búsquedas
@@ -422,15 +453,21 @@ def add_to_history(keyword: str):
     if not keyword_clean:
         return
 
-    # Verificar que existe el historial
-    if "search_history" not in st.session_state:
-        st.session_state.search_history = []
+    history = get_search_history()
+
+    # Caso habitual en cada rerun: ya es la última búsqueda
+    if history:
+        last = history[-1]
+        last_keyword = last.get("keyword") if isinstance(last, dict) else last
+        if last_keyword == keyword_clean:
+            return
 
     # Evitar duplicados
-    if keyword_clean not in st.session_state.search_history:
-        st.session_state.search_history.insert(0, keyword_clean)
-        # Mantener solo los últimos 10
-        st.session_state.search_history = st.session_state.search_history[:10]
+    try:
+        history.remove(keyword_clean)
+    except ValueError:
+        pass
+    history.append(keyword_clean)
 
 
 # NOTA: render_search_history se usa desde modules.auth_email (versión mejorada con avatares)
@@ -542,9 +579,12 @@ def render_empty_state():
 __all__ = [
     'load_css', 'render_logo', 'check_api_keys', 'render_api_status',
     'format_number', 'format_growth', 'get_time_greeting',
-    'init_session_state', 'add_to_history',
+    'init_session_state', 'add_to_history', 'get_search_history',
     'render_loading_state', 'render_error_state', 'render_empty_state',
-    'sanitize_html', 'sanitize_for_query', 'safe_float', 'safe_int',
-    'safe_divide', 'safe_get', 'safe_list', 'safe_dict'
+    'sanitize_html', 'sanitize_html_many', 'sanitize_for_query',
+    'clear_sanitize_cache', 'keyword_slug',
+    'safe_float', 'safe_int',
+    'safe_divide', 'safe_get', 'safe_list', 'safe_dict',
+    'run_parallel', 'run_in_background'
 ]
 
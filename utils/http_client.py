@@ -3,12 +3,69 @@ HTTP Client con reintentos y timeout mejorado
 """
 
 import requests
+import threading
 import time
 from typing import Optional, Dict, Any
 import logging
 
+from requests.adapters import HTTPAdapter
+
+# orjson es opcional: decodifica bytes directamente y es varias veces más
+# rápido que json en payloads grandes de SerpAPI
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Sesión compartida por todos los módulos de SerpAPI (ver get_http_session)
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Sesión HTTP compartida entre módulos y reruns.
+
+    Mantiene un pool de conexiones keep-alive, así las llamadas a un mismo
+    host (SerpAPI) no repiten el handshake TCP/TLS. El pool admite las
+    peticiones concurrentes de run_parallel.
+
+    Returns:
+        requests.Session reutilizable
+    """
+    global _http_session
+
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+
+    return _http_session
+
+
+def parse_json_response(response: requests.Response) -> Any:
+    """
+    Decodifica el cuerpo JSON de una respuesta HTTP.
+
+    Usa orjson sobre los bytes de la respuesta si está instalado y
+    response.json() en caso contrario. Ambos lanzan ValueError si el
+    cuerpo no es JSON válido.
+
+    Args:
+        response: Respuesta de requests
+
+    Returns:
+        Objeto JSON decodificado (dicts y listas nativos)
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 def request_with_retry(
     url: str,
@@ -34,9 +91,9 @@ def request_with_retry(
     
     for attempt in range(max_retries + 1):
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = get_http_session().get(url, params=params, timeout=timeout)
             response.raise_for_status()
-            return response.json()
+            return parse_json_response(response)
             
         except requests.exceptions.Timeout as e:
             last_error = e
@@ -0,0 +1,131 @@
+"""
+Parallel Execution Helpers
+Ejecuta llamadas de red independientes en paralelo
+
+Las APIs que consulta la app (SerpAPI, YouTube, LLMs...) son llamadas
+bloqueantes de I/O: lanzarlas a la vez en un pool de threads reduce la
+latencia total de la suma de todas a la de la más lenta.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, MutableMapping, Optional, Tuple
+
+# Contexto de Streamlit para threads auxiliares (session_state, secrets, caché)
+try:
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    st = None
+    add_script_run_ctx = None
+    get_script_run_ctx = None
+
+
+# Una tarea es (función, kwargs)
+Task = Tuple[Callable, Dict[str, Any]]
+
+# Threads en segundo plano por sesión: cubren las tareas largas de una
+# búsqueda Deep Dive (IA, YouTube, AliExpress, precarga y las dos de
+# Perplexity) sin que queden en cola
+BACKGROUND_WORKERS = 6
+
+# Cada sesión de Streamlit tiene su propio pool en session_state: un pool
+# del proceso lo compartirían todos los usuarios y las búsquedas de unos
+# dejarían en cola (y agotarían los timeouts de) las de otros
+_SESSION_POOL_KEY = "_background_pool"
+
+# Pool de respaldo fuera de una sesión de Streamlit (tests, scripts)
+_process_pool = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="abra-bg")
+
+
+def _run_with_ctx(ctx: Any, func: Callable, kwargs: Dict[str, Any]) -> Any:
+    """Ejecuta func en el thread actual con el contexto de Streamlit adjunto"""
+    if ctx is not None and add_script_run_ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+    return func(**kwargs)
+
+
+def run_parallel(
+    tasks: Dict[str, Task],
+    max_workers: Optional[int] = None,
+    on_done: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Ejecuta tareas independientes en paralelo y devuelve sus resultados por nombre.
+
+    Equivale a asyncio.gather(..., return_exceptions=True): si una tarea
+    lanza una excepción, su resultado ES la excepción y el resto de tareas
+    no se ven afectadas.
+
+    Args:
+        tasks: Dict nombre -> (función, kwargs)
+        max_workers: Threads del pool (por defecto, uno por tarea)
+        on_done: Callback opcional llamado con el nombre de cada tarea al
+            terminar (se ejecuta en el thread principal, puede usar st.*)
+
+    Returns:
+        Dict nombre -> resultado (o excepción)
+    """
+    if not tasks:
+        return {}
+
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as executor:
+        futures = {
+            executor.submit(_run_with_ctx, ctx, func, kwargs): name
+            for name, (func, kwargs) in tasks.items()
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = e
+
+            if on_done:
+                on_done(name)
+
+    return results
+
+
+def session_executor(state: MutableMapping) -> ThreadPoolExecutor:
+    """
+    Pool de tareas en segundo plano de una sesión (se crea la primera vez)
+
+    Sus threads terminan cuando la sesión se descarta y el pool deja de
+    estar referenciado.
+
+    Args:
+        state: session_state de la sesión (o cualquier dict equivalente)
+
+    Returns:
+        ThreadPoolExecutor con BACKGROUND_WORKERS threads
+    """
+    executor = state.get(_SESSION_POOL_KEY)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="abra-bg")
+        state[_SESSION_POOL_KEY] = executor
+    return executor
+
+
+def run_in_background(func: Callable, **kwargs: Any) -> Future:
+    """
+    Lanza func(**kwargs) en segundo plano y devuelve su Future.
+
+    Permite seguir renderizando la página mientras la llamada está en
+    vuelo y recoger el resultado con future.result(timeout=...) justo
+    cuando hace falta. Se ejecuta en el pool de la sesión actual.
+
+    Args:
+        func: Función a ejecutar
+        **kwargs: Argumentos de la función
+
+    Returns:
+        Future con el resultado (o la excepción) de la llamada
+    """
+    ctx = get_script_run_ctx() if get_script_run_ctx is not None else None
+    executor = session_executor(st.session_state) if ctx is not None else _process_pool
+    return executor.submit(_run_with_ctx, ctx, func, kwargs)
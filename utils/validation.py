@@ -7,9 +7,10 @@ Previene XSS, inyección, SSRF y maneja valores nulos/cero
 import re
 import html
 import socket
+from functools import lru_cache
 import ipaddress
 from urllib.parse import urlparse
-from typing import Any, List, Dict, Optional, Union, Tuple
+from typing import Any, Iterable, List, Dict, Optional, Union, Tuple
 from numbers import Number
 
 
@@ -190,6 +191,14 @@ def sanitize_url(url: str) -> str:
 # SANITIZACIÓN DE STRINGS (Prevención XSS)
 # ============================================================================
 
+@lru_cache(maxsize=2048)
+def _escape_html(text_str: str) -> str:
+    """html.escape memoizado: los mismos textos se sanitizan en cada rerun"""
+    # html.escape encadena str.replace (en C) y es ~3x más rápido que
+    # str.translate con tabla de entidades, también en textos cortos
+    return html.escape(text_str, quote=True)
+
+
 def sanitize_html(text: Any) -> str:
     """
     Sanitiza texto para uso seguro en HTML
@@ -204,11 +213,34 @@ def sanitize_html(text: Any) -> str:
     if text is None:
         return ""
 
-    # Convertir a string si no lo es
-    text_str = str(text)
+    # Convertir a string si no lo es (la caché solo admite strings)
+    text_str = text if type(text) is str else str(text)
 
     # Escapar caracteres HTML
-    return html.escape(text_str, quote=True)
+    return _escape_html(text_str)
+
+
+def sanitize_html_many(values: Iterable[Any]) -> List[str]:
+    """
+    Sanitiza una secuencia de valores para HTML en una sola pasada
+
+    Args:
+        values: Valores a sanitizar (se convierten a string, como str(v))
+
+    Returns:
+        Lista de strings escapados, en el mismo orden
+    """
+    escape = _escape_html
+    return [escape(v if type(v) is str else str(v)) for v in values]
+
+
+def clear_sanitize_cache() -> None:
+    """Vacía la caché de textos escapados (p.ej. al cerrar sesión)"""
+    _escape_html.cache_clear()
+
+
+# Caracteres no permitidos en queries de API (se compila una sola vez)
+_QUERY_DISALLOWED_RE = re.compile(r'[^\w\s\-.,áéíóúñüÁÉÍÓÚÑÜ]', re.UNICODE)
 
 
 def sanitize_for_query(text: Any) -> str:
@@ -225,21 +257,26 @@ def sanitize_for_query(text: Any) -> str:
     if text is None:
         return ""
 
-    text_str = str(text).strip()
+    text_str = (text if type(text) is str else str(text)).strip()
 
-    # Remover caracteres de control y no imprimibles
-    text_str = ''.join(char for char in text_str if char.isprintable())
+    # Remover caracteres de control y no imprimibles (isprintable recorre
+    # el texto en C; el filtrado carácter a carácter solo si hace falta)
+    if not text_str.isprintable():
+        text_str = ''.join(char for char in text_str if char.isprintable())
 
     # Limitar longitud
     text_str = text_str[:500]
 
     # Remover caracteres que podrían causar problemas en URLs
     # Mantener letras, números, espacios, guiones y algunos caracteres comunes
-    text_str = re.sub(r'[^\w\s\-.,áéíóúñüÁÉÍÓÚÑÜ]', '', text_str, flags=re.UNICODE)
+    text_str = _QUERY_DISALLOWED_RE.sub('', text_str)
 
     return text_str.strip()
 
 
+# Caracteres no válidos en nombres de archivo
+_FILENAME_DISALLOWED_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
 def sanitize_filename(filename: Any) -> str:
     """
     Sanitiza un nombre de archivo
@@ -256,7 +293,7 @@ def sanitize_filename(filename: Any) -> str:
     filename_str = str(filename).strip()
 
     # Remover caracteres peligrosos para nombres de archivo
-    filename_str = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', filename_str)
+    filename_str = _FILENAME_DISALLOWED_RE.sub('', filename_str)
 
     # Limitar longitud
     filename_str = filename_str[:100]
@@ -268,10 +305,31 @@ def sanitize_filename(filename: Any) -> str:
     return filename_str
 
 
+# Todo lo que no sea letra, número, guion o guion bajo
+_SLUG_DISALLOWED_RE = re.compile(r'[^\w-]+')
+
+
+@lru_cache(maxsize=256)
+def keyword_slug(keyword: str) -> str:
+    """
+    Convierte un keyword en fragmento seguro para nombres de archivo
+
+    Args:
+        keyword: Keyword analizado (p.ej. "RTX 4090 / Ti")
+
+    Returns:
+        Slug con guiones bajos (p.ej. "RTX_4090_Ti"), "export" si queda vacío
+    """
+    return _SLUG_DISALLOWED_RE.sub('_', keyword.strip()).strip('_') or "export"
+
+
 # ============================================================================
 # VALIDACIÓN Y COERCIÓN DE NÚMEROS
 # ============================================================================
 
+# Todo lo que no sea dígito, punto o signo
+_NON_NUMERIC_RE = re.compile(r'[^\d.\-+]')
+
 def safe_float(value: Any, default: float = 0.0) -> float:
     """
     Convierte valor a float de forma segura
@@ -301,7 +359,7 @@ def safe_float(value: Any, default: float = 0.0) -> float:
         # Intentar extraer número
         try:
             # Remover caracteres no numéricos excepto punto y signo
-            cleaned = re.sub(r'[^\d.\-+]', '', value)
+            cleaned = _NON_NUMERIC_RE.sub('', value)
             if cleaned:
                 return float(cleaned)
         except (ValueError, TypeError):
@@ -325,6 +383,9 @@ def safe_int(value: Any, default: int = 0) -> int:
     return int(float_val)
 
 
+# Primer número (con signo y decimales) de strings como "+500%"
+_PERCENTAGE_RE = re.compile(r'([+-]?\d+(?:\.\d+)?)')
+
 def safe_percentage(value: Any, default: float = 0.0) -> float:
     """
     Convierte valor a porcentaje de forma segura
@@ -342,7 +403,7 @@ def safe_percentage(value: Any, default: float = 0.0) -> float:
             return 5000.0
 
         # Extraer número de strings como "+500%"
-        match = re.search(r'([+-]?\d+(?:\.\d+)?)', value)
+        match = _PERCENTAGE_RE.search(value)
         if match:
             return float(match.group(1))
 
@@ -675,6 +736,10 @@ def validate_related_queries(queries: Any) -> List[Dict]:
 # VALIDACIÓN DE COLORES
 # ============================================================================
 
+# Colores #RRGGBB y #RGB
+_HEX_COLOR_RE = re.compile(r'^#[0-9A-Fa-f]{6}$')
+_SHORT_HEX_COLOR_RE = re.compile(r'^#[0-9A-Fa-f]{3}$')
+
 def validate_hex_color(color: Any, default: str = "#7C3AED") -> str:
     """
     Valida que un color sea un código hexadecimal válido
@@ -693,10 +758,10 @@ def validate_hex_color(color: Any, default: str = "#7C3AED") -> str:
     color = color.strip()
 
     # Validar formato
-    if re.match(r'^#[0-9A-Fa-f]{6}$', color):
+    if _HEX_COLOR_RE.match(color):
         return color
 
-    if re.match(r'^#[0-9A-Fa-f]{3}$', color):
+    if _SHORT_HEX_COLOR_RE.match(color):
         # Expandir formato corto #RGB a #RRGGBB
         return '#' + ''.join(c*2 for c in color[1:])
 